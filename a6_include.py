@@ -5,6 +5,8 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+from bisect import bisect_left, bisect_right
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -103,11 +105,20 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # slots drop the per-instance __dict__, one node exists per key
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        The full (unreduced) hash of the key may be stored so the node
+        can be moved to another table without hashing the key again.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +130,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -144,6 +157,9 @@ class LinkedList:
     Supported methods are: insert, remove, contains, length, iterator
     """
 
+    # slots drop the per-instance __dict__, one list exists per bucket
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,20 +184,28 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
         Return True if removal was successful, False otherwise.
+        With hash given, nodes storing a different hash are skipped
+        without comparing keys.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash == None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -192,13 +216,31 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
-        node = self._head
-        while node:
-            if node.key == key:
-                return node
-            node = node.next
+    def contains(self, key: str, hash: int = None,
+                 move_to_front: bool = False) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        With hash given, only nodes storing the same hash have their key
+        compared, so every node must store its hash.
+        With move_to_front, a matching node is relinked at the head so
+        frequently found keys stay near the front of the list.
+        """
+        previous, node = None, self._head
+        if hash == None:
+            while node:
+                if node.key == key:
+                    break
+                previous, node = node, node.next
+        else:
+            # comparing ints first skips most key comparisons
+            while node:
+                if node.hash == hash and node.key == key:
+                    break
+                previous, node = node, node.next
+        if move_to_front and previous and node:
+            previous.next = node.next
+            node.next = self._head
+            self._head = node
         return node
 
     def length(self) -> int:
@@ -206,14 +248,109 @@ class LinkedList:
         return self._size
 
 
+class SortedChain:
+    """
+    Bucket chain kept sorted by (hash, key) and searched with bisect.
+    Stands in for a LinkedList once a bucket holds many keys, so that
+    contains and remove compare O(log n) keys instead of all of them.
+    Every node must store its hash, and keys with equal hashes must be
+    orderable against each other. A key that cannot be ordered against
+    the stored keys is reported as absent.
+    Supported methods are: insert, insert_node, remove, contains, thread, length, iterator
+    """
+
+    __slots__ = ('_order', '_nodes')
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize new sorted chain holding the given nodes."""
+        self._nodes = sorted(nodes, key=lambda node: (node.hash, node.key))
+        # (hash, key) of every node, in the same order, for bisect
+        self._order = [(node.hash, node.key) for node in self._nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SortedChain [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes in (hash, key) order."""
+        return iter(self._nodes)
+
+    def insert(self, key: str, value: object, hash: int) -> None:
+        """Insert new node at its sorted position."""
+        self.insert_node(SLNode(key, value, None, hash))
+
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node at its sorted position."""
+        entry = (node.hash, node.key)
+        index = bisect_right(self._order, entry)
+        self._order.insert(index, entry)
+        self._nodes.insert(index, node)
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove node with matching key and hash.
+        Return True if removal was successful, False otherwise.
+        """
+        index = self._index(key, hash)
+        if index != -1:
+            del self._order[index]
+            del self._nodes[index]
+            return True
+        return False
+
+    def contains(self, key: str, hash: int,
+                 move_to_front: bool = False) -> SLNode:
+        """
+        Return node with matching key and hash, or None if no match.
+        move_to_front is accepted so every chain type is called the same
+        way; the nodes always stay in (hash, key) order.
+        """
+        index = self._index(key, hash)
+        return None if index == -1 else self._nodes[index]
+
+    def _index(self, key: str, hash: int) -> int:
+        """Return the position of the matching node, or -1 if no match."""
+        entry = (hash, key)
+        try:
+            index = bisect_left(self._order, entry)
+        except TypeError:
+            return -1
+        if index < len(self._order) and self._order[index] == entry:
+            return index
+        return -1
+
+    def thread(self) -> SLNode:
+        """
+        Link the nodes through their next fields in (hash, key) order.
+        Return the first node, or None if the chain is empty.
+        """
+        following = None
+        for node in reversed(self._nodes):
+            node.next = following
+            following = node
+        return following
+
+    def length(self) -> int:
+        """Return the length of the chain."""
+        return len(self._nodes)
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    # slots drop the per-instance __dict__, one entry exists per key
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        The full (unreduced) hash of the key may be stored so the entry
+        can be moved to another table without hashing the key again.
+        """
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -0,0 +1,2 @@
+# Benchmark scripts for the hash maps. Run them from the repository root,
+# e.g. python -m benchmarks.memory
@@ -0,0 +1,74 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Compares looping over single put / get / contains_key /
+#              remove calls with the batch methods put_many, get_many,
+#              contains_many and remove_many, in ns per key.
+#
+#              python -m benchmarks.batch [keys]
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_oa_flat
+import hash_map_sc
+from hash_functions import builtin_hash
+
+MAPS = {
+    "sc": hash_map_sc.HashMap,
+    "oa": hash_map_oa.HashMap,
+    "oa flat": hash_map_oa_flat.HashMap,
+}
+
+
+def _ns_per_key(work, count: int) -> float:
+    """Run work once and return the elapsed nanoseconds per key."""
+    start = time.perf_counter()
+    work()
+    return (time.perf_counter() - start) * 1e9 / count
+
+
+def run(map_class, keys: list) -> dict:
+    """
+    Time every single-key loop and the matching batch call on fresh maps.
+
+    :param map_class: HashMap class to build
+    :param keys:      keys to load, look up and remove
+
+    :return:          dictionary of operation to (single ns, batch ns)
+    """
+    pairs = [(key, key) for key in keys]
+    count = len(keys)
+    single = map_class(11, builtin_hash)
+    batch = map_class(11, builtin_hash)
+    results = {}
+
+    def put_loop():
+        for key, value in pairs:
+            single.put(key, value)
+
+    results["put"] = (_ns_per_key(put_loop, count),
+                      _ns_per_key(lambda: batch.put_many(pairs), count))
+    results["get"] = (_ns_per_key(lambda: [single.get(key) for key in keys], count),
+                      _ns_per_key(lambda: batch.get_many(keys), count))
+    results["contains"] = (
+        _ns_per_key(lambda: [single.contains_key(key) for key in keys], count),
+        _ns_per_key(lambda: batch.contains_many(keys), count))
+
+    def remove_loop():
+        for key in keys:
+            single.remove(key)
+
+    results["remove"] = (_ns_per_key(remove_loop, count),
+                         _ns_per_key(lambda: batch.remove_many(keys), count))
+    return results
+
+
+if __name__ == "__main__":
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100000
+    keys = ['key' + str(i) for i in range(count)]
+    print(f"{'map':<8} {'operation':<9} {'single ns':>10} {'batch ns':>10} {'speedup':>8}")
+    for name, map_class in MAPS.items():
+        for operation, (single, batch) in run(map_class, keys).items():
+            print(f"{name:<8} {operation:<9} {single:10.0f} {batch:10.0f} "
+                  f"{single / batch:8.2f}")
@@ -0,0 +1,62 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Hit ratio and throughput of the bounded caches on a Zipf
+#              distributed trace of 100000 keys. Every request is a get,
+#              followed by a put of the key on a miss, as a read-through
+#              cache in front of a slow backend would do. The scan trace
+#              makes every fourth request a key that is never seen again,
+#              which pushes popular keys out of an LRU cache. The shift
+#              trace draws its second half from a new ranking of the keys,
+#              which LFU frequencies that never decay are slow to follow.
+#              Caches hold 1% and 10% of the keys.
+#
+#              python -m benchmarks.cache [exponent ...]   (default 0.8 1.1)
+
+import sys
+import time
+
+from benchmarks.move_to_front import zipf_stream
+from hash_functions import builtin_hash
+from hash_map_sc_cache import LFUCache, LRUCache, TinyLFUCache
+
+KEYS = 100000
+REQUESTS = 500000
+
+POLICIES = {"lru": LRUCache, "lfu": LFUCache, "tinylfu": TinyLFUCache}
+
+
+def with_scan(trace: list) -> list:
+    """Return the trace with every fourth request replaced by a new key."""
+    return [('scan' + str(i) if i % 4 == 3 else key)
+            for i, key in enumerate(trace)]
+
+
+def replay(cache, trace: list) -> float:
+    """Run a trace through a read-through cache, returning the seconds taken."""
+    get, put = cache.get, cache.put
+    start = time.perf_counter()
+    for key in trace:
+        if get(key) == None:
+            put(key, key)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    exponents = [float(arg) for arg in sys.argv[1:]] or [0.8, 1.1]
+    keys = ['key' + str(i) for i in range(KEYS)]
+    print(f"{REQUESTS} requests over {KEYS} keys")
+    print(f"{'trace':<10} {'exponent':>8} {'entries':>8} {'policy':<8} "
+          f"{'hit ratio':>9} {'ops/s':>8} {'evictions':>9}")
+    for exponent in exponents:
+        zipf = zipf_stream(keys, REQUESTS, exponent)
+        shift = zipf[:REQUESTS // 2] + zipf_stream(keys, REQUESTS // 2, exponent, 1)
+        traces = {"zipf": zipf, "zipf+scan": with_scan(zipf), "shift": shift}
+        for trace_name, trace in traces.items():
+            for entries in (KEYS // 100, KEYS // 10):
+                for name, cls in POLICIES.items():
+                    cache = cls(entries, function=builtin_hash)
+                    seconds = replay(cache, trace)
+                    stats = cache.stats()
+                    print(f"{trace_name:<10} {exponent:8.1f} {entries:>8} {name:<8} "
+                          f"{stats['hit_ratio']:9.3f} {REQUESTS / seconds:8.0f} "
+                          f"{stats['evictions']:>9}")
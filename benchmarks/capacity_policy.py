@@ -0,0 +1,68 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Compares the prime capacity policy with the power of two
+#              policy (mask indexing, triangular probing, finalized hash)
+#              for a put-heavy load from an empty map and a get-heavy
+#              workload with half hits and half misses.
+#
+#              python -m benchmarks.capacity_policy [keys]
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_2
+
+MAPS = {
+    "oa": hash_map_oa.HashMap,
+    "sc": hash_map_sc.HashMap,
+}
+
+FUNCTIONS = {
+    "hash_function_2": hash_function_2,
+    "hash": hash,
+}
+
+
+def run(map_class, function, power_of_two: bool, keys: list,
+        misses: list) -> tuple:
+    """
+    Time a put-heavy and a get-heavy workload on one map configuration.
+
+    :param map_class:    HashMap class to build
+    :param function:     hash function handed to the map
+    :param power_of_two: capacity policy handed to the map
+    :param keys:         keys to insert and look up
+    :param misses:       keys that are never inserted
+
+    :return:             ns per put and ns per get
+    """
+    m = map_class(11, function, power_of_two)
+    start = time.perf_counter()
+    for key in keys:
+        m.put(key, key)
+    put_ns = (time.perf_counter() - start) * 1e9 / len(keys)
+
+    start = time.perf_counter()
+    for _ in range(3):
+        for key in keys:
+            m.get(key)
+        for key in misses:
+            m.get(key)
+    get_ns = (time.perf_counter() - start) * 1e9 / (3 * (len(keys) + len(misses)))
+    return put_ns, get_ns
+
+
+if __name__ == "__main__":
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else 20000
+    keys = ['key' + str(i) for i in range(count)]
+    misses = ['miss' + str(i) for i in range(count)]
+    print(f"{'map':<4} {'function':<16} {'policy':<13} {'ns/put':>9} {'ns/get':>9}")
+    for map_name, map_class in MAPS.items():
+        for function_name, function in FUNCTIONS.items():
+            for power_of_two in (False, True):
+                put_ns, get_ns = run(map_class, function, power_of_two, keys, misses)
+                policy = "power of two" if power_of_two else "prime"
+                print(f"{map_name:<4} {function_name:<16} {policy:<13} "
+                      f"{put_ns:9.0f} {get_ns:9.0f}")
@@ -0,0 +1,41 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Measures the separate chaining HashMap when many keys share
+#              one hash. hash_function_1 only sums the characters, so every
+#              permutation of a word collides; each run puts, gets and
+#              removes such keys with chains treeified past
+#              TREEIFY_THRESHOLD and with treeification turned off.
+#
+#              python -m benchmarks.collisions [keys ...]   (default 100 1000 5000)
+
+import sys
+import time
+from itertools import islice, permutations
+
+import hash_map_sc
+from a6_include import hash_function_1
+
+
+def us_per_op(keys: list) -> tuple[float, float, float]:
+    """Return the microseconds per put, get and remove over every key."""
+    m = hash_map_sc.HashMap(11, hash_function_1)
+    times = []
+    for operation in (lambda key: m.put(key, key), m.get, m.remove):
+        start = time.perf_counter()
+        for key in keys:
+            operation(key)
+        times.append((time.perf_counter() - start) * 1e6 / len(keys))
+    return tuple(times)
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [100, 1000, 5000]
+    threshold = hash_map_sc.TREEIFY_THRESHOLD
+    print(f"{'chains':<10} {'keys':>6} {'put us':>8} {'get us':>8} {'remove us':>10}")
+    for n in sizes:
+        keys = [''.join(p) for p in islice(permutations('abcdefgh'), n)]
+        for name, limit in (("treeified", threshold), ("linked", float('inf'))):
+            hash_map_sc.TREEIFY_THRESHOLD = limit
+            put, get, remove = us_per_op(keys)
+            print(f"{name:<10} {n:>6} {put:8.2f} {get:8.2f} {remove:10.2f}")
+    hash_map_sc.TREEIFY_THRESHOLD = threshold
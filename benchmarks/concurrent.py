@@ -0,0 +1,107 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Stress test and throughput benchmark for the thread-safe
+#              hash map in hash_map_concurrent. The stress test has every
+#              thread put, overwrite and remove its own keys while reading
+#              everyone else's, then checks the exact final contents. The
+#              benchmark runs a 80% get / 15% put / 5% remove mix with 1 to
+#              16 threads. Run it on a free-threaded build (python3.13t or
+#              later) to see scaling without the GIL.
+#
+#              python -m benchmarks.concurrent [operations per thread]
+
+import random
+import sys
+import threading
+import time
+
+import hash_map_concurrent
+from hash_functions import builtin_hash
+
+
+def _run_threads(count: int, target) -> float:
+    """Start count threads running target(index) and return the wall time."""
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def stress(threads: int = 16, keys_per_thread: int = 3000) -> bool:
+    """
+    Hammer one map from many threads and verify every key afterwards.
+
+    :param threads:         number of threads
+    :param keys_per_thread: number of keys each thread owns
+
+    :return:                True if the final contents are exactly right
+    """
+    m = hash_map_concurrent.HashMap(11, builtin_hash)
+    errors = []
+
+    def worker(index: int) -> None:
+        rnd = random.Random(index)
+        own = ['t' + str(index) + '-' + str(i) for i in range(keys_per_thread)]
+        for i, key in enumerate(own):
+            m.put(key, i)
+            # reads of keys owned by other threads must never raise
+            m.get('t' + str(rnd.randrange(threads)) + '-' + str(rnd.randrange(keys_per_thread)))
+        for i, key in enumerate(own):
+            if i % 3 == 0:
+                m.remove(key)
+            elif i % 3 == 1:
+                m.put(key, -i)
+        for i, key in enumerate(own):
+            expected = None if i % 3 == 0 else (-i if i % 3 == 1 else i)
+            if m.get(key) != expected:
+                errors.append(key)
+
+    _run_threads(threads, worker)
+    expected_size = threads * (keys_per_thread - (keys_per_thread + 2) // 3)
+    pairs = m.get_keys_and_values()
+    return not errors and m.get_size() == expected_size == pairs.length()
+
+
+def throughput(threads: int, operations: int, keys: list) -> float:
+    """
+    Run a read-mostly mix on one shared map and return operations per second.
+
+    :param threads:    number of threads
+    :param operations: operations run by each thread
+    :param keys:       shared key space, half of it loaded up front
+
+    :return:           total operations per second
+    """
+    m = hash_map_concurrent.HashMap(11, builtin_hash)
+    for key in keys[::2]:
+        m.put(key, key)
+
+    def worker(index: int) -> None:
+        rnd = random.Random(index)
+        for _ in range(operations):
+            key = keys[rnd.randrange(len(keys))]
+            roll = rnd.random()
+            if roll < 0.80:
+                m.get(key)
+            elif roll < 0.95:
+                m.put(key, index)
+            else:
+                m.remove(key)
+
+    return threads * operations / _run_threads(threads, worker)
+
+
+if __name__ == "__main__":
+    operations = int(float(sys.argv[1])) if len(sys.argv) > 1 else 50000
+    gil = hash_map_concurrent._gil_enabled()
+    print(f"GIL enabled: {gil}")
+    print(f"stress test passed: {stress()}")
+    keys = ['key' + str(i) for i in range(100000)]
+    base = None
+    for threads in (1, 2, 4, 8, 16):
+        ops = throughput(threads, operations, keys)
+        base = base or ops
+        print(f"{threads:>2} threads {ops:12.0f} ops/s  scaling {ops / base:5.2f}")
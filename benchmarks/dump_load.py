@@ -0,0 +1,60 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Compares dump / load snapshots with pickling the whole map:
+#              seconds to write and read each format, its size, and the
+#              time to rebuild the same map with put for reference. Values
+#              are strings, written with both the pickle and the str codec.
+#              builtin_hash is randomized per process, so these snapshots
+#              would only load in the process that wrote them; it is used
+#              because the hash_function_* sums cluster badly in the OA maps.
+#
+#              python -m benchmarks.dump_load [entries ...]   (default 1e5 1e6)
+
+import io
+import pickle
+import sys
+import time
+
+import hash_map_oa
+import hash_map_oa_flat
+import hash_map_sc
+import snapshot
+from hash_functions import builtin_hash
+
+ENGINES = {
+    "sc": hash_map_sc.HashMap,
+    "oa (HashEntry)": hash_map_oa.HashMap,
+    "oa (flat)": hash_map_oa_flat.HashMap,
+}
+
+
+def timed(function, *args) -> tuple[float, object]:
+    """Return the seconds a call took and its result."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [10 ** 5, 10 ** 6]
+    print(f"{'engine':<15} {'entries':>8} {'format':<13} {'write s':>8} "
+          f"{'read s':>7} {'MB':>6}")
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+        for name, cls in ENGINES.items():
+            m = cls(11, builtin_hash)
+            build, _ = timed(lambda: [m.put(key, key) for key in keys])
+            print(f"{name:<15} {n:>8} {'put':<13} {build:8.2f}")
+
+            written, data = timed(pickle.dumps, m, pickle.HIGHEST_PROTOCOL)
+            read, _ = timed(pickle.loads, data)
+            print(f"{name:<15} {n:>8} {'pickle':<13} {written:8.2f} {read:7.2f} "
+                  f"{len(data) / 2 ** 20:6.1f}")
+
+            for codec in (snapshot.PICKLE, snapshot.STR):
+                buffer = io.BytesIO()
+                written, _ = timed(m.dump, buffer, codec)
+                data = buffer.getvalue()
+                read, _ = timed(cls.load, io.BytesIO(data), builtin_hash, codec)
+                print(f"{name:<15} {n:>8} {'dump ' + codec.name:<13} {written:8.2f} "
+                      f"{read:7.2f} {len(data) / 2 ** 20:6.1f}")
@@ -0,0 +1,117 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Compares the sample hash functions from a6_include with the
+#              ones in hash_functions: nanoseconds per key, chi-square of
+#              the bucket counts, the longest separate chaining chain and
+#              the longest quadratic probe sequence at a load of 0.5.
+#              fnv1a is timed last as a reference only; its per-byte
+#              Python loop makes it the slowest function here.
+#
+#              python -m benchmarks.hash_quality [keys per corpus]
+
+import random
+import sys
+import time
+
+import hash_functions
+from a6_include import hash_function_1, hash_function_2
+
+FUNCTIONS = {
+    "hash_function_1": hash_function_1,
+    "hash_function_2": hash_function_2,
+    "bulk_hash": hash_functions.bulk_hash,
+    "keyed_hash": hash_functions.keyed_hash,
+    "builtin_hash": hash_functions.builtin_hash,
+}
+
+# timed for comparison with other implementations, not recommended for use
+REFERENCE = {
+    "fnv1a (ref)": hash_functions.fnv1a,
+}
+
+
+def _next_prime(number: int) -> int:
+    """Return the smallest prime that is at least number."""
+    number = max(number, 2)
+    while any(number % factor == 0 for factor in range(2, int(number ** 0.5) + 1)):
+        number += 1
+    return number
+
+
+def corpora(count: int, seed: int = 261) -> dict:
+    """
+    Build deterministic key corpora that look like production keys.
+
+    :param count: number of keys in each corpus
+    :param seed:  seed for the random generator
+
+    :return:      dictionary of corpus name to list of distinct keys
+    """
+    rnd = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    sku = set()
+    while len(sku) < count:
+        # SKUs built from a few shuffled parts collide under ordinal sums
+        parts = rnd.sample(['AB', 'CD', 'EF', 'GH', '12', '34', '56', '78'], 4)
+        sku.add('-'.join(parts) + str(rnd.randrange(100)))
+    return {
+        "sequential": ['key' + str(i) for i in range(count)],
+        "hex ids": ['%032x' % rnd.getrandbits(128) for _ in range(count)],
+        "sku anagrams": sorted(sku),
+        "urls": ['https://example.com/' + '/'.join(
+                    ''.join(rnd.choice(letters) for _ in range(rnd.randint(3, 9)))
+                    for _ in range(rnd.randint(1, 4))) + '?id=' + str(i)
+                 for i in range(count)],
+    }
+
+
+def quality(function, keys: list) -> tuple:
+    """
+    Measure speed and distribution of one hash function over keys.
+
+    :param function: hash function to measure
+    :param keys:     distinct keys to hash
+
+    :return:         ns per key, chi-square per bucket, longest chain in a
+                     table with one bucket per key, and longest probe
+                     sequence for quadratic probing at a load of 0.5
+    """
+    start = time.perf_counter()
+    hashes = [function(key) for key in keys]
+    ns_per_key = (time.perf_counter() - start) * 1e9 / len(keys)
+
+    # separate chaining with as many buckets as keys (load factor 1.0)
+    buckets = _next_prime(len(keys))
+    counts = [0] * buckets
+    for hash in hashes:
+        counts[hash % buckets] += 1
+    expected = len(keys) / buckets
+    chi_square = sum((count - expected) ** 2 for count in counts) / expected
+
+    # quadratic probing into a table twice as large as the key count
+    capacity = _next_prime(2 * len(keys))
+    used = bytearray(capacity)
+    longest_probe = 0
+    for hash in hashes:
+        initial = hash % capacity
+        probe = 0
+        bucket = initial
+        while used[bucket]:
+            probe += 1
+            bucket = (initial + probe * probe) % capacity
+        used[bucket] = 1
+        longest_probe = max(longest_probe, probe + 1)
+
+    # a uniform hash gives a chi-square close to the number of buckets
+    return ns_per_key, chi_square / buckets, max(counts), longest_probe
+
+
+if __name__ == "__main__":
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else 20000
+    for corpus, keys in corpora(count).items():
+        print(f"\n{corpus} ({len(keys)} keys)")
+        print(f"{'function':<16} {'ns/key':>8} {'chi2/bucket':>12} "
+              f"{'max chain':>10} {'max probe':>10}")
+        for name, function in {**FUNCTIONS, **REFERENCE}.items():
+            ns, chi, chain, probe = quality(function, keys)
+            print(f"{name:<16} {ns:8.0f} {chi:12.2f} {chain:10d} {probe:10d}")
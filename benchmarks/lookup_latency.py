@@ -0,0 +1,85 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Times every single get on a filled map and reports latency
+#              percentiles, for keys that are present and keys that are
+#              missing. The weak hash_function_1 run shows how long chains
+#              and probe sequences get when many keys share a hash, which
+#              is where the bounded lookups of the cuckoo map matter.
+#
+#              python -m benchmarks.lookup_latency [keys]
+
+import gc
+import sys
+import time
+
+import hash_map_cuckoo
+import hash_map_oa
+import hash_map_oa_robin_hood
+import hash_map_oa_swiss
+import hash_map_sc
+from a6_include import hash_function_1
+
+MAPS = {
+    "sc": hash_map_sc.HashMap,
+    "oa": hash_map_oa.HashMap,
+    "robin hood": hash_map_oa_robin_hood.HashMap,
+    "swiss table": hash_map_oa_swiss.HashMap,
+    "cuckoo": hash_map_cuckoo.HashMap,
+}
+
+FUNCTIONS = {
+    "hash": hash,
+    "hash_function_1": hash_function_1,
+}
+
+
+def get_latencies(m, keys: list) -> list:
+    """
+    Get every key from a map and return each get's latency in ns.
+
+    :param m:    the filled hash map
+    :param keys: keys to look up
+
+    :return:     sorted list of latencies in nanoseconds
+    """
+    clock = time.perf_counter_ns
+    get = m.get
+    latencies = []
+    append = latencies.append
+    # a cyclic collection pause would hide the lookups being measured
+    gc.disable()
+    try:
+        for key in keys:
+            start = clock()
+            get(key)
+            append(clock() - start)
+    finally:
+        gc.enable()
+    latencies.sort()
+    return latencies
+
+
+def percentile(latencies: list, fraction: float) -> int:
+    """Return the latency below which the given fraction of gets fall."""
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+if __name__ == "__main__":
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else 20000
+    keys = ['key' + str(i) for i in range(count)]
+    missing = ['miss' + str(i) for i in range(count)]
+    print(f"{count} keys, latencies in microseconds")
+    print(f"{'function':<16} {'map':<12} {'lookup':<7} {'p50':>7} {'p99':>7} "
+          f"{'p99.9':>8} {'max':>8}")
+    for function_name, function in FUNCTIONS.items():
+        for name, map_class in MAPS.items():
+            m = map_class(11, function)
+            for key in keys:
+                m.put(key, key)
+            for lookup, lookup_keys in (("hit", keys), ("miss", missing)):
+                latencies = get_latencies(m, lookup_keys)
+                print(f"{function_name:<16} {name:<12} {lookup:<7} "
+                      f"{percentile(latencies, 0.5) / 1000:7.1f} "
+                      f"{percentile(latencies, 0.99) / 1000:7.1f} "
+                      f"{percentile(latencies, 0.999) / 1000:8.1f} "
+                      f"{latencies[-1] / 1000:8.1f}")
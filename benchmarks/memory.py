@@ -0,0 +1,56 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Measures how many bytes each hash map layout needs per
+#              stored entry. Keys and values are allocated before the
+#              measurement starts, so only the map's own structures count.
+#              The built-in hash is used so that clustering from the
+#              sample hash functions does not dominate the run time.
+#
+#              python -m benchmarks.memory [entries ...]   (default 1e5 1e6 1e7)
+
+import sys
+import tracemalloc
+
+import hash_map_oa
+import hash_map_oa_flat
+import hash_map_oa_robin_hood
+import hash_map_oa_swiss
+import hash_map_sc
+
+
+def bytes_per_entry(factory, keys: list) -> float:
+    """
+    Builds a map holding every key and returns its bytes per entry.
+
+    :param factory: callable returning a new, empty hash map
+    :param keys:    keys to insert; each key is also used as its value
+
+    :return:        traced bytes held by the map divided by len(keys)
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    m = factory()
+    for key in keys:
+        m.put(key, key)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del m
+    return (after - before) / len(keys)
+
+
+LAYOUTS = {
+    "sc (LinkedList)": lambda: hash_map_sc.HashMap(11, hash),
+    "oa (HashEntry)": lambda: hash_map_oa.HashMap(11, hash),
+    "oa (flat arrays)": lambda: hash_map_oa_flat.HashMap(11, hash),
+    "oa (robin hood)": lambda: hash_map_oa_robin_hood.HashMap(11, hash),
+    "oa (swiss table)": lambda: hash_map_oa_swiss.HashMap(11, hash),
+}
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [10 ** 5, 10 ** 6, 10 ** 7]
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+        for name, factory in LAYOUTS.items():
+            print(f"{name:<20} {n:>10} entries: "
+                  f"{bytes_per_entry(factory, keys):8.1f} bytes/entry")
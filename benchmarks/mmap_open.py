@@ -0,0 +1,59 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Compares starting up with a map rebuilt in memory against
+#              reopening a committed memory mapped map: the time to build a
+#              flat storage map with put, the time to build and commit the
+#              file, the time to open the file again, and ns per get for
+#              both maps right after startup.
+#
+#              python -m benchmarks.mmap_open [entries ...]   (default 1e5 1e6)
+
+import os
+import sys
+import tempfile
+import time
+
+import hash_map_oa_flat
+import hash_map_oa_mmap
+from hash_functions import bulk_hash
+
+
+def ns_per_get(m, keys: list) -> float:
+    """Return the nanoseconds per get over every key."""
+    get = m.get
+    start = time.perf_counter()
+    for key in keys:
+        get(key)
+    return (time.perf_counter() - start) * 1e9 / len(keys)
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [10 ** 5, 10 ** 6]
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'benchmark.map')
+    print(f"{'entries':>9} {'flat build s':>13} {'mmap build s':>13} "
+          f"{'open ms':>8} {'flat get ns':>12} {'mmap get ns':>12} {'file MB':>8}")
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+        probes = keys[::max(1, n // 10000)]
+
+        start = time.perf_counter()
+        flat = hash_map_oa_flat.HashMap(11, bulk_hash)
+        for key in keys:
+            flat.put(key, key)
+        flat_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with hash_map_oa_mmap.HashMap(path, bulk_hash) as m:
+            m.put_many((key, key) for key in keys)
+        mmap_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        m = hash_map_oa_mmap.HashMap(path, bulk_hash)
+        opened = time.perf_counter() - start
+        print(f"{n:>9} {flat_build:13.2f} {mmap_build:13.2f} {opened * 1e3:8.2f} "
+              f"{ns_per_get(flat, probes):12.0f} {ns_per_get(m, probes):12.0f} "
+              f"{os.path.getsize(path) / 2 ** 20:8.1f}")
+        m.close()
+        os.remove(path)
+    os.rmdir(directory)
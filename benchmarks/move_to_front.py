@@ -0,0 +1,97 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Measures lookups in separate chaining chains on a Zipf
+#              distributed stream of keys. The first table times
+#              LinkedList.contains on one chain with and without the stored
+#              hash compare; the second times HashMap.get with move to front
+#              off and on, at loads 1, 4 and 8. Long keys share a 64
+#              character prefix and huge keys a 4096 character prefix, so
+#              every key comparison is a full compare.
+#              Lookup keys are copies, never the stored key objects, so
+#              no comparison is shortcut by identity.
+#
+#              python -m benchmarks.move_to_front [exponent]   (default 1.1)
+
+import random
+import sys
+import time
+from itertools import accumulate
+
+import hash_map_sc
+from a6_include import LinkedList
+from load_policy import LoadPolicy
+
+KEYS = 20000
+LOOKUPS = 200000
+CHAIN = 8
+
+
+def make_keys(n: int, prefix: str) -> list:
+    """Return n distinct keys with the given prefix."""
+    return [prefix + str(i).zfill(7) for i in range(n)]
+
+
+def copies(keys: list) -> list:
+    """Return equal keys that are different objects."""
+    return [''.join(list(key)) for key in keys]
+
+
+def zipf_stream(keys: list, count: int, exponent: float, seed: int = 0) -> list:
+    """Return count keys drawn with the k-th key weighted 1 / k ** exponent."""
+    weights = accumulate(1 / k ** exponent for k in range(1, len(keys) + 1))
+    rng = random.Random(seed)
+    # the popular keys get shuffled ids so they are spread over the table
+    ranked = keys[:]
+    rng.shuffle(ranked)
+    return rng.choices(ranked, cum_weights=list(weights), k=count)
+
+
+def ns_per_call(function, args: list) -> float:
+    """Return the best nanoseconds per call of three runs over args."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for arg in args:
+            function(*arg)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e9 / len(args)
+
+
+if __name__ == "__main__":
+    exponent = float(sys.argv[1]) if len(sys.argv) > 1 else 1.1
+    kinds = {"short": "k", "long": "sku-" + "x" * 60}
+
+    print(f"one chain of {CHAIN} nodes, {LOOKUPS} zipf({exponent}) lookups")
+    print(f"{'keys':<6} {'key compare ns':>15} {'hash compare ns':>16} "
+          f"{'+ move to front ns':>19}")
+    for kind, prefix in dict(kinds, huge="sku-" + "x" * 4096).items():
+        keys = make_keys(CHAIN, prefix)
+        chain = LinkedList()
+        for key in keys:
+            chain.insert(key, key, hash(key))
+        stream = copies(zipf_stream(keys, LOOKUPS, exponent))
+        plain = ns_per_call(chain.contains, [(key,) for key in stream])
+        hashed = [(key, hash(key)) for key in stream]
+        compared = ns_per_call(chain.contains, hashed)
+        moved = ns_per_call(chain.contains, [args + (True,) for args in hashed])
+        print(f"{kind:<6} {plain:15.0f} {compared:16.0f} {moved:19.0f}")
+
+    print(f"\nHashMap.get, {KEYS} keys, {LOOKUPS} zipf({exponent}) lookups")
+    print(f"{'keys':<6} {'load':>5} {'get ns':>7} {'move to front ns':>17}")
+    for kind, prefix in kinds.items():
+        keys = make_keys(KEYS, prefix)
+        stream = [(key,) for key in copies(zipf_stream(keys, LOOKUPS, exponent))]
+        for load in (1.0, 4.0, 8.0):
+            maps = []
+            for move_to_front in (False, True):
+                m = hash_map_sc.HashMap(11, hash, policy=LoadPolicy(load),
+                                        move_to_front=move_to_front)
+                for key in keys:
+                    m.put(key, key)
+                maps.append(m)
+            results = [float('inf')] * len(maps)
+            # alternate the maps so a drifting clock speed hits both
+            for _ in range(3):
+                for i, m in enumerate(maps):
+                    results[i] = min(results[i], ns_per_call(m.get, stream))
+            print(f"{kind:<6} {load:5.1f} {results[0]:7.0f} {results[1]:17.0f}")
@@ -0,0 +1,56 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Times find_mode against find_mode_parallel with 1, 2, 4 and
+#              8 worker processes on a Zipf-like token stream, and checks
+#              that every run finds the same modes and frequency.
+#
+#              python -m benchmarks.parallel_mode [tokens]
+
+import os
+import random
+import sys
+import time
+
+from a6_include import DynamicArray
+from hash_map_sc import find_mode, find_mode_parallel
+
+
+def tokens(count: int, vocabulary: int = 50000, seed: int = 261) -> list:
+    """
+    Build a deterministic token stream with a Zipf-like distribution.
+
+    :param count:      number of tokens
+    :param vocabulary: number of distinct tokens
+    :param seed:       seed for the random generator
+
+    :return:           list of token strings
+    """
+    rnd = random.Random(seed)
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    words = ['tok' + str(rank) for rank in range(vocabulary)]
+    return rnd.choices(words, weights, k=count)
+
+
+def _sorted_mode(result: tuple) -> tuple:
+    """Return a mode result with its modes sorted, for comparison."""
+    modes, frequency = result
+    return sorted(modes[i] for i in range(modes.length())), frequency
+
+
+if __name__ == "__main__":
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000
+    stream = tokens(count)
+    print(f"{count} tokens, {os.cpu_count()} CPUs available")
+
+    start = time.perf_counter()
+    expected = _sorted_mode(find_mode(DynamicArray(stream)))
+    serial = time.perf_counter() - start
+    print(f"{'serial':<12} {serial:8.2f} s")
+
+    for workers in (1, 2, 4, 8):
+        start = time.perf_counter()
+        result = _sorted_mode(find_mode_parallel(iter(stream), workers))
+        elapsed = time.perf_counter() - start
+        print(f"{str(workers) + ' workers':<12} {elapsed:8.2f} s  "
+              f"speedup {serial / elapsed:5.2f}  "
+              f"{'same' if result == expected else 'DIFFERENT'}")
@@ -0,0 +1,69 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Times every single put while a map grows from empty and
+#              reports latency percentiles, comparing the stop-the-world
+#              resize of hash_map_sc with the incremental rehash of
+#              hash_map_sc_incremental.
+#
+#              python -m benchmarks.put_latency [keys]
+
+import gc
+import sys
+import time
+
+import hash_map_sc
+import hash_map_sc_incremental
+from hash_functions import builtin_hash
+
+MAPS = {
+    "stop-the-world": hash_map_sc.HashMap,
+    "incremental": hash_map_sc_incremental.HashMap,
+}
+
+
+def put_latencies(map_class, keys: list) -> list:
+    """
+    Put every key into a new map and return each put's latency in ns.
+
+    :param map_class: HashMap class to build
+    :param keys:      keys to insert
+
+    :return:          sorted list of latencies in nanoseconds
+    """
+    m = map_class(11, builtin_hash)
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    # a cyclic collection pause would hide the resize pauses being measured
+    gc.disable()
+    try:
+        for key in keys:
+            start = clock()
+            m.put(key, key)
+            append(clock() - start)
+    finally:
+        gc.enable()
+    latencies.sort()
+    return latencies
+
+
+def percentile(latencies: list, fraction: float) -> int:
+    """Return the latency below which the given fraction of puts fall."""
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+if __name__ == "__main__":
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000
+    keys = ['key' + str(i) for i in range(count)]
+    print(f"{count} puts, latencies in microseconds")
+    print(f"{'resize':<16} {'p50':>8} {'p99':>8} {'p99.9':>8} {'p99.99':>9} "
+          f"{'max':>10} {'total s':>8}")
+    for name, map_class in MAPS.items():
+        latencies = put_latencies(map_class, keys)
+        print(f"{name:<16} "
+              f"{percentile(latencies, 0.5) / 1000:8.1f} "
+              f"{percentile(latencies, 0.99) / 1000:8.1f} "
+              f"{percentile(latencies, 0.999) / 1000:8.1f} "
+              f"{percentile(latencies, 0.9999) / 1000:9.1f} "
+              f"{latencies[-1] / 1000:10.1f} "
+              f"{sum(latencies) / 1e9:8.2f}")
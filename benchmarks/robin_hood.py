@@ -0,0 +1,72 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Compares the Robin Hood engine with the quadratic probing
+#              engines: bytes per entry, and ns per get for keys that are
+#              present and keys that are missing. Robin Hood runs at its
+#              default load limit of 0.9 and, to separate the effect of
+#              the load from the effect of the probing, at 0.5. Besides
+#              the built-in hash, every engine runs with hash_function_1
+#              and hash_function_2, whose many equal and neighbouring
+#              hashes are what long linear probing clusters come from;
+#              they are only run up to WEAK_LIMIT entries, as every
+#              engine slows down on their equal hashes.
+#
+#              python -m benchmarks.robin_hood [entries ...]   (default 5e3 1e5 1e6)
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_oa_flat
+import hash_map_oa_robin_hood
+from a6_include import hash_function_1, hash_function_2
+from benchmarks.memory import bytes_per_entry
+from load_policy import LoadPolicy
+
+ENGINES = {
+    "quadratic (HashEntry)": lambda function: hash_map_oa.HashMap(11, function),
+    "quadratic (flat)": lambda function: hash_map_oa_flat.HashMap(11, function),
+    "robin hood 0.9": lambda function: hash_map_oa_robin_hood.HashMap(
+        11, function),
+    "robin hood 0.5": lambda function: hash_map_oa_robin_hood.HashMap(
+        11, function, policy=LoadPolicy(0.5)),
+}
+
+FUNCTIONS = {
+    "hash": hash,
+    "hash_function_1": hash_function_1,
+    "hash_function_2": hash_function_2,
+}
+
+# most entries the sample hash functions are run with
+WEAK_LIMIT = 5000
+
+
+def ns_per_get(m, keys: list) -> float:
+    """Return the nanoseconds per get over every key."""
+    get = m.get
+    start = time.perf_counter()
+    for key in keys:
+        get(key)
+    return (time.perf_counter() - start) * 1e9 / len(keys)
+
+
+if __name__ == "__main__":
+    sizes = ([int(float(arg)) for arg in sys.argv[1:]]
+             or [5000, 10 ** 5, 10 ** 6])
+    print(f"{'engine':<22} {'function':<16} {'entries':>9} {'load':>5} "
+          f"{'bytes/entry':>12} {'hit ns':>9} {'miss ns':>9}")
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+        missing = ['miss' + str(i) for i in range(n)]
+        for function_name, function in FUNCTIONS.items():
+            if function is not hash and n > WEAK_LIMIT:
+                continue
+            for name, factory in ENGINES.items():
+                memory = bytes_per_entry(lambda: factory(function), keys)
+                m = factory(function)
+                for key in keys:
+                    m.put(key, key)
+                print(f"{name:<22} {function_name:<16} {n:>9} "
+                      f"{m.table_load():5.2f} {memory:12.1f} "
+                      f"{ns_per_get(m, keys):9.0f} {ns_per_get(m, missing):9.0f}")
@@ -0,0 +1,115 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Shows how many full key comparisons each open addressing
+#              engine makes per get, and how long a get takes, for keys
+#              that are present and keys that are missing. Every engine
+#              is measured at load 0.5, the limit of quadratic probing,
+#              and the Robin Hood and Swiss table engines also close to
+#              their own load limits, where probe sequences are longest.
+#
+#              python -m benchmarks.swiss [entries]   (default 114000)
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_oa_flat
+import hash_map_oa_robin_hood
+import hash_map_oa_swiss
+from load_policy import LoadPolicy
+
+
+def _quadratic(policy):
+    return hash_map_oa.HashMap(11, hash, policy=policy)
+
+
+def _flat(policy):
+    return hash_map_oa_flat.HashMap(11, hash, policy=policy)
+
+
+def _robin_hood(policy):
+    return hash_map_oa_robin_hood.HashMap(11, hash, policy=policy)
+
+
+def _swiss(policy):
+    return hash_map_oa_swiss.HashMap(11, hash, policy=policy)
+
+
+# (name, factory taking a LoadPolicy, load to fill the map to)
+ENGINES = [
+    ("quadratic (HashEntry)", _quadratic, 0.5),
+    ("quadratic (flat)", _flat, 0.5),
+    ("robin hood", _robin_hood, 0.5),
+    ("swiss table", _swiss, 0.5),
+    ("robin hood", _robin_hood, 0.9),
+    ("swiss table", _swiss, 0.875),
+]
+
+
+class CountingKey(str):
+    """String key that counts how often it is compared for equality."""
+
+    comparisons = 0
+
+    def __eq__(self, other) -> bool:
+        CountingKey.comparisons += 1
+        return str.__eq__(self, other)
+
+    __hash__ = str.__hash__
+
+
+def filled(factory, load: float, keys: list):
+    """
+    Returns a map holding every key, sized so it ends close to a load.
+
+    :param factory: callable taking a LoadPolicy and returning an empty map
+    :param load:    the load limit of the policy the map is built with
+    :param keys:    keys to insert; each key is also used as its value
+
+    :return:        the filled map
+    """
+    m = factory(LoadPolicy(load))
+    m.resize_table(int(len(keys) / load) + 1)
+    for key in keys:
+        m.put(key, key)
+    return m
+
+
+def compares_per_get(m, keys: list) -> float:
+    """Return the key comparisons per get over every key."""
+    CountingKey.comparisons = 0
+    for key in keys:
+        m.get(key)
+    return CountingKey.comparisons / len(keys)
+
+
+def ns_per_get(m, keys: list, repeat: int = 3) -> float:
+    """Return the best nanoseconds per get over every key of a few passes."""
+    get = m.get
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            get(key)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e9 / len(keys)
+
+
+if __name__ == "__main__":
+    n = int(float(sys.argv[1])) if len(sys.argv) > 1 else 114000
+    keys = ['key' + str(i) for i in range(n)]
+    missing = ['miss' + str(i) for i in range(n)]
+    counting_keys = [CountingKey(key) for key in keys]
+    counting_missing = [CountingKey(key) for key in missing]
+    print(f"{n} entries")
+    print(f"{'engine':<22} {'load':>5} {'hit cmp':>8} {'miss cmp':>9} "
+          f"{'hit ns':>7} {'miss ns':>8}")
+    for name, factory, load in ENGINES:
+        counted = filled(factory, load, counting_keys)
+        hit_compares = compares_per_get(counted, counting_keys)
+        miss_compares = compares_per_get(counted, counting_missing)
+        del counted
+        m = filled(factory, load, keys)
+        print(f"{name:<22} {m.table_load():5.2f} {hit_compares:8.3f} "
+              f"{miss_compares:9.3f} {ns_per_get(m, keys):7.0f} "
+              f"{ns_per_get(m, missing):8.0f}")
@@ -0,0 +1,120 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Costs of per-key expiry in the open addressing map. The
+#              first table compares bytes per entry and put / get times of
+#              the plain map with the TTL map, with keys put without and
+#              with a ttl. The second table expires every key at the same
+#              moment and times the puts that follow, which reap the
+#              expired keys REAP_BATCH at a time, against a single reap()
+#              of all of them and the compact() that drops the tombstones
+#              the puts leave behind. Reaping puts must never rebuild the
+#              table, so their max stays bounded; the benchmark counts the
+#              rebuilds and exits with an error if there are any. The last
+#              row shows the rebuild remove() on the plain map pays once
+#              tombstones pass TOMBSTONE_LIMIT. The built-in hash is used
+#              so that clustering from the sample hash functions does not
+#              dominate.
+#
+#              python -m benchmarks.ttl [entries ...]   (default 1e5 1e6)
+
+import sys
+import time
+
+import hash_map_oa
+import hash_map_oa_ttl
+from benchmarks.memory import bytes_per_entry
+
+
+class Clock:
+    """Clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+LAYOUTS = {
+    "oa": lambda: hash_map_oa.HashMap(11, hash),
+    "ttl, no ttl": lambda: hash_map_oa_ttl.HashMap(11, hash),
+    "ttl, ttl set": lambda: hash_map_oa_ttl.HashMap(11, hash, default_ttl=3600),
+}
+
+
+def ns_per_call(function, args: list) -> float:
+    """Return the nanoseconds per call of function over args."""
+    start = time.perf_counter()
+    for arg in args:
+        function(*arg)
+    return (time.perf_counter() - start) * 1e9 / len(args)
+
+
+def summary(times: list) -> str:
+    """Return the count, mean, 99th percentile and max of call times."""
+    times = sorted(times)
+    return (f"{len(times):>8} {sum(times) / len(times) * 1e6:8.1f} "
+            f"{times[len(times) * 99 // 100] * 1e6:7.1f} {times[-1] * 1e6:10.1f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [10 ** 5, 10 ** 6]
+    print(f"{'layout':<13} {'entries':>8} {'bytes/entry':>11} {'put ns':>7} "
+          f"{'get ns':>7}")
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+        for name, factory in LAYOUTS.items():
+            memory = bytes_per_entry(factory, keys)
+            m = factory()
+            put = ns_per_call(m.put, [(key, key) for key in keys])
+            get = ns_per_call(m.get, [(key,) for key in keys])
+            print(f"{name:<13} {n:>8} {memory:11.1f} {put:7.0f} {get:7.0f}")
+
+    print(f"\nevery key expires at once, then {hash_map_oa_ttl.REAP_BATCH} "
+          f"are reaped per put")
+    print(f"{'entries':>8} {'reap() ms':>10} {'calls':>8} {'mean us':>8} "
+          f"{'p99 us':>7} {'max us':>10} {'rebuilds':>8} {'compact ms':>10}")
+    unbounded = False
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+        for batched in (False, True):
+            clock = Clock()
+            # room for the new keys, so no put has to grow the table
+            m = hash_map_oa_ttl.HashMap(4 * n, hash, default_ttl=1, clock=clock)
+            m.put_many((key, key) for key in keys)
+            clock.now = 2
+            if not batched:
+                start = time.perf_counter()
+                m.reap()
+                print(f"{n:>8} {(time.perf_counter() - start) * 1e3:10.1f}")
+                continue
+            # counts every rebuild, which would make a put's cost grow with n
+            rebuilds = []
+            rehash = m._rehash
+            m._rehash = lambda capacity: (rebuilds.append(capacity),
+                                          rehash(capacity))
+            # enough puts to reap every expired key
+            puts = n // hash_map_oa_ttl.REAP_BATCH + 1
+            times = []
+            for i in range(puts):
+                start = time.perf_counter()
+                m.put('new' + str(i), i)
+                times.append(time.perf_counter() - start)
+            unbounded = unbounded or bool(rebuilds)
+            count = len(rebuilds)
+            start = time.perf_counter()
+            m.compact()
+            print(f"{n:>8} {'':>10} {summary(times)} {count:>8} "
+                  f"{(time.perf_counter() - start) * 1e3:10.1f}")
+
+        m = hash_map_oa.HashMap(11, hash)
+        m.put_many((key, key) for key in keys)
+        times = []
+        for key in keys:
+            start = time.perf_counter()
+            m.remove(key)
+            times.append(time.perf_counter() - start)
+        print(f"{n:>8} {'oa remove':>10} {summary(times)}")
+
+    if unbounded:
+        sys.exit("a put that reaped expired keys rebuilt the table")
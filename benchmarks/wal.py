@@ -0,0 +1,72 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Write throughput of DurableHashMap under each group commit
+#              setting: puts per second with an fsync after every put,
+#              after every 10 / 100 / 1000 puts, and from the background
+#              thread every 1 / 10 / 100 ms, against the plain in-memory
+#              map. Also reports the time to reopen the map by replaying
+#              the log, and by loading a compacted snapshot.
+#
+#              python -m benchmarks.wal [puts ...]   (default 1e4 1e5)
+
+import shutil
+import sys
+import tempfile
+import time
+
+import hash_map_sc
+from a6_include import hash_function_1
+from write_ahead_log import DurableHashMap
+
+SETTINGS = [
+    ("sync every 1", {"sync_every": 1}),
+    ("sync every 10", {"sync_every": 10}),
+    ("sync every 100", {"sync_every": 100}),
+    ("sync every 1000", {"sync_every": 1000}),
+    ("sync 1 ms", {"sync_every": None, "sync_interval": 0.001}),
+    ("sync 10 ms", {"sync_every": None, "sync_interval": 0.01}),
+    ("sync 100 ms", {"sync_every": None, "sync_interval": 0.1}),
+]
+
+
+def timed(function, *args) -> tuple[float, object]:
+    """Return the seconds a call took and its result."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def fill(m, keys) -> None:
+    """Put every key into a map, with its index as the value."""
+    put = m.put
+    for i, key in enumerate(keys):
+        put(key, i)
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [10 ** 4, 10 ** 5]
+    print(f"{'setting':<16} {'puts':>7} {'seconds':>8} {'puts/s':>9}")
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+        seconds, _ = timed(fill, hash_map_sc.HashMap(11, hash_function_1), keys)
+        print(f"{'in memory':<16} {n:>7} {seconds:8.2f} {n / seconds:9.0f}")
+        for name, options in SETTINGS:
+            directory = tempfile.mkdtemp()
+            m = DurableHashMap(directory, compact_at=None, **options)
+            # close syncs whatever is still pending, so it counts too
+            seconds, _ = timed(lambda: (fill(m, keys), m.close()))
+            print(f"{name:<16} {n:>7} {seconds:8.2f} {n / seconds:9.0f}")
+            shutil.rmtree(directory)
+
+        directory = tempfile.mkdtemp()
+        m = DurableHashMap(directory, sync_every=1000, compact_at=None)
+        fill(m, keys)
+        m.close()
+        seconds, m = timed(DurableHashMap, directory)
+        print(f"{'replay log':<16} {n:>7} {seconds:8.2f}")
+        m.compact()
+        m.close()
+        seconds, m = timed(DurableHashMap, directory)
+        print(f"{'load snapshot':<16} {n:>7} {seconds:8.2f}")
+        m.close()
+        shutil.rmtree(directory)
@@ -0,0 +1,164 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Hash functions that can be passed as the function argument
+#              of either HashMap in place of hash_function_1 and
+#              hash_function_2. Every function returns a 64-bit unsigned
+#              integer and works on the UTF-8 encoded bytes of the key,
+#              so anagrams and short keys no longer pile up together.
+#              Each family is built by a make_* function taking a seed;
+#              the module level functions use seed 0.
+
+import hashlib
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+FNV_OFFSET_64 = 0xCBF29CE484222325
+FNV_PRIME_64 = 0x100000001B3
+
+# multipliers used by xxHash64
+PRIME_1 = 0x9E3779B185EBCA87
+PRIME_2 = 0xC2B2AE3D27D4EB4F
+PRIME_3 = 0x165667B19E3779F9
+
+MERSENNE_61 = (1 << 61) - 1
+
+
+def _to_bytes(key) -> bytes:
+    """Return the bytes a key is hashed over."""
+    if isinstance(key, str):
+        return key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return bytes(key)
+    return str(key).encode('utf-8', 'surrogatepass')
+
+
+def mix64(hash: int) -> int:
+    """
+    Scramble the bits of a hash with the xxHash64 avalanche step.
+
+    Every input bit affects every output bit, so hashes that only differ
+    in a few low bits (such as sums of ordinals) are spread over the whole
+    64-bit range.
+    """
+    hash &= MASK_64
+    hash ^= hash >> 33
+    hash = (hash * PRIME_2) & MASK_64
+    hash ^= hash >> 29
+    hash = (hash * PRIME_3) & MASK_64
+    return hash ^ (hash >> 32)
+
+
+def make_fnv1a(seed: int = 0):
+    """
+    Return a seeded 64-bit FNV-1a hash function.
+
+    This is a reference implementation, kept to check hashes against
+    other FNV-1a implementations. FNV-1a folds in one byte at a time and
+    there is no C primitive for it, so it runs a Python step per byte;
+    on keys of a few dozen bytes it is slower than hash_function_2 and
+    several times slower than bulk_hash. No HashMap uses it by default;
+    use bulk_hash for speed or keyed_hash against crafted keys.
+    """
+    start = (FNV_OFFSET_64 ^ mix64(seed)) if seed else FNV_OFFSET_64
+
+    def fnv1a(key) -> int:
+        hash = start
+        for byte in _to_bytes(key):
+            hash = ((hash ^ byte) * FNV_PRIME_64) & MASK_64
+        return hash
+
+    return fnv1a
+
+
+def make_bulk_hash(seed: int = 0):
+    """
+    Return a seeded hash that reads the whole key as one integer.
+
+    The encoded key is converted with int.from_bytes and reduced modulo
+    the Mersenne prime 2 ** 61 - 1, which both run in C, so the cost
+    barely grows with key length. The remainder, key length and seed are
+    then scrambled with mix64. The seed changes every hash value, but keys
+    whose integers differ by a multiple of the prime collide for every
+    seed, so use make_keyed_hash when keys may be crafted by an attacker.
+    """
+    salt = mix64(seed)
+
+    def bulk_hash(key) -> int:
+        data = _to_bytes(key)
+        residue = int.from_bytes(data, 'little') % MERSENNE_61
+        return mix64(residue ^ ((len(data) * PRIME_1) & MASK_64) ^ salt)
+
+    return bulk_hash
+
+
+def make_keyed_hash(seed: int = 0):
+    """
+    Return a seeded keyed hash (SipHash-style) backed by BLAKE2b.
+
+    BLAKE2b runs in C over the whole key and takes the seed as its secret
+    key, so like SipHash it resists inputs crafted to collide when the
+    seed is kept private.
+    """
+    secret = (seed & MASK_64).to_bytes(8, 'little')
+    blake2b = hashlib.blake2b
+
+    def keyed_hash(key) -> int:
+        digest = blake2b(_to_bytes(key), digest_size=8, key=secret).digest()
+        return int.from_bytes(digest, 'little')
+
+    return keyed_hash
+
+
+def builtin_hash(key) -> int:
+    """
+    Hash a key with the built-in hash, as an unsigned 64-bit integer.
+
+    Strings and bytes use the interpreter's SipHash, randomized per
+    process unless PYTHONHASHSEED is set, and any hashable key is
+    accepted. The result is passed through mix64, because the built-in
+    hash of a small int is the int itself.
+    """
+    return mix64(hash(key))
+
+
+def finalized(function):
+    """
+    Return a hash function that passes the results of function through mix64.
+
+    Masking a hash to a power of two keeps only its low bits, so weak
+    hashes such as hash_function_1 need this finalizer to avoid
+    clustering in power-of-two tables.
+    """
+    def finalized_hash(key) -> int:
+        return mix64(function(key))
+
+    return finalized_hash
+
+
+fnv1a = make_fnv1a()
+bulk_hash = make_bulk_hash()
+keyed_hash = make_keyed_hash()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import hash_map_oa
+    import hash_map_sc
+
+    print("\nAnagrams with each hash function")
+    print("--------------------------------")
+    for function in (fnv1a, bulk_hash, keyed_hash, builtin_hash):
+        print(function.__name__, [function(key) % 53 for key in ('stop', 'pots', 'tops', 'spot')])
+
+    print("\nHashMaps using the new functions")
+    print("--------------------------------")
+    for function in (bulk_hash, keyed_hash, builtin_hash):
+        sc = hash_map_sc.HashMap(53, function)
+        oa = hash_map_oa.HashMap(53, function)
+        for i in range(150):
+            sc.put('str' + str(i), i * 100)
+            oa.put('str' + str(i), i * 100)
+        print(function.__name__, sc.empty_buckets(), sc.get_capacity(),
+              oa.get('str42'), oa.get_capacity())
@@ -0,0 +1,439 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Separate chaining hash map that can be shared between
+#              threads. Writers lock one stripe of buckets, readers do not
+#              lock at all while the GIL is enabled, and a resize holds
+#              every stripe while it builds a new table.
+
+import sys
+import threading
+
+from a6_include import (DynamicArray, LinkedList,
+                        hash_function_1, hash_function_2)
+from load_policy import LoadPolicy
+
+
+def _gil_enabled() -> bool:
+    """Return False only on a free-threaded build running without the GIL."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled else True
+
+
+class HashMap:
+    """
+    Thread-safe separate chaining hash map with lock striping.
+
+    The table is one (buckets, capacity) tuple that is only ever
+    replaced as a whole, so a reader always sees a matching bucket list
+    and capacity. Bucket i is guarded by lock i % stripes. A writer
+    re-checks that the table it locked is still current and retries if a
+    resize replaced it in the meantime.
+
+    A resize copies every node into the new table instead of relinking
+    it, so readers still walking the old table see every key it held.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 stripes: int = 16,
+                 lock_free_reads: bool = None,
+                 policy: LoadPolicy = None) -> None:
+        """
+        Initialize new HashMap that uses
+        separate chaining for collision resolution
+
+        lock_free_reads defaults to True while the GIL is enabled and to
+        False on a free-threaded build, where readers then take the
+        stripe lock of the bucket they read. policy decides when the
+        table grows and shrinks; by default it grows at load 1.0 and
+        never shrinks.
+        """
+        self._hash_function = function
+        self._policy = LoadPolicy(1.0) if policy == None else policy
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # one size counter per stripe, each only changed under its lock
+        self._sizes = [0] * stripes
+        self._resize_lock = threading.Lock()
+        self._lock_free_reads = (_gil_enabled() if lock_free_reads is None
+                                 else lock_free_reads)
+        capacity = self._next_prime(capacity)
+        self._table = ([None] * capacity, capacity)
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        buckets = self._table[0]
+        out = ''
+        for i in range(len(buckets)):
+            out += str(i) + ': ' + str(buckets[i] or LinkedList()) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number and the find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(self._sizes)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table[1]
+
+    # ------------------------------------------------------------------ #
+
+    def _lock_bucket(self, hash: int) -> tuple:
+        """
+        Locks the stripe guarding the bucket of a hash in the current table.
+
+        :param self: the hash map being passed
+        :param hash: the full hash of a key
+
+        :return:     the locked table, the bucket index and the stripe index
+        """
+        while True:
+            table = self._table
+            bucket = hash % table[1]
+            stripe = bucket % len(self._locks)
+            self._locks[stripe].acquire()
+            # a resize may have replaced the table while we waited
+            if self._table is table:
+                return table, bucket, stripe
+            self._locks[stripe].release()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds an element to the hash map.
+
+        :param self:  the hash map being passed
+        :param key:   the key that determines the bucket
+        :param value: the value that should be added to the hash map
+
+        :return:      None
+        """
+        hash = self._hash_function(key)
+        table, bucket, stripe = self._lock_bucket(hash)
+        try:
+            buckets = table[0]
+            chain = buckets[bucket]
+            node = None if chain == None else chain.contains(key, hash)
+            # if key exists, simply update value
+            if node != None:
+                node.value = value
+                return
+            if chain == None:
+                chain = LinkedList()
+                buckets[bucket] = chain
+            chain.insert(key, value, hash)
+            self._sizes[stripe] += 1
+        finally:
+            self._locks[stripe].release()
+        # resize hash map if load deems necessary
+        if self._policy.should_grow(self.get_size(), table[1]):
+            self._grow(table)
+
+    def _grow(self, table: tuple) -> None:
+        """
+        Grows the table unless another thread already replaced it.
+
+        :param self:  the hash map being passed
+        :param table: the table that was found to be too full
+
+        :return:      None
+        """
+        policy = self._policy
+        with self._resize_lock:
+            if self._table is table and policy.should_grow(self.get_size(), table[1]):
+                self._rehash(self._next_prime(policy.grown(table[1])))
+
+    def _shrink(self, table: tuple) -> None:
+        """
+        Shrinks the table after a removal if the policy deems necessary,
+        unless another thread already replaced it.
+
+        :param self:  the hash map being passed
+        :param table: the table a key was removed from
+
+        :return:      None
+        """
+        with self._resize_lock:
+            capacity = table[1]
+            if self._table is not table:
+                return
+            new_capacity = self._policy.shrunk(self.get_size(), capacity)
+            if new_capacity < capacity:
+                new_capacity = self._next_prime(new_capacity)
+                # rounding up can land back on the current capacity
+                if new_capacity < capacity:
+                    self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Copies every node into a new table while holding every stripe.
+
+        The caller must hold the resize lock.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            new_buckets = [None] * new_capacity
+            for chain in self._table[0]:
+                if chain == None:
+                    continue
+                for node in chain:
+                    bucket = node.hash % new_capacity
+                    if new_buckets[bucket] == None:
+                        new_buckets[bucket] = LinkedList()
+                    new_buckets[bucket].insert(node.key, node.value, node.hash)
+            # publish the finished table with a single assignment
+            self._table = (new_buckets, new_capacity)
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def get(self, key: str):
+        """
+        Returns the value being held by the passed key.
+
+        :param self: the hash map being passed
+        :param key:  the key to get
+
+        :return:     the value held by the key
+        """
+        node = self._find_node(key)
+        return None if node == None else node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Determines whether the hashmap holds the passed key.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+
+        :return:     boolean representing if key was found
+        """
+        return self._find_node(key) != None
+
+    def _find_node(self, key: str):
+        """
+        Returns the node holding a key, locking only if reads must lock.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+
+        :return:     node with the key, or None if there is no match
+        """
+        hash = self._hash_function(key)
+        if self._lock_free_reads:
+            buckets, capacity = self._table
+            chain = buckets[hash % capacity]
+            return None if chain == None else chain.contains(key, hash)
+        table, bucket, stripe = self._lock_bucket(hash)
+        try:
+            chain = table[0][bucket]
+            return None if chain == None else chain.contains(key, hash)
+        finally:
+            self._locks[stripe].release()
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the passed key from the hash map.
+
+        :param self: the hash map being passed
+        :param key:  the key to remove
+
+        :return:     None
+        """
+        hash = self._hash_function(key)
+        table, bucket, stripe = self._lock_bucket(hash)
+        removed = False
+        try:
+            chain = table[0][bucket]
+            if chain != None and chain.remove(key, hash):
+                removed = True
+                self._sizes[stripe] -= 1
+                # free the list once its last node is gone
+                if chain.length() == 0:
+                    table[0][bucket] = None
+        finally:
+            self._locks[stripe].release()
+        if removed and self._policy.shrink_at != None:
+            self._shrink(table)
+
+    def table_load(self) -> float:
+        """
+        Calculates the table load.
+
+        :param self: the hash map being passed
+
+        :return:     the table load
+        """
+        return self.get_size() / self._table[1]
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the amount of empty buckets.
+
+        :param self: the hash map being passed
+
+        :return:     amount of empty buckets
+        """
+        return self._table[0].count(None)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes the hash map.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity to resize to
+
+        :return:             None
+        """
+        # only resize hash map if new capacity is at least 1
+        if new_capacity >= 1:
+            with self._resize_lock:
+                if not(self._is_prime(new_capacity)):
+                    new_capacity = self._next_prime(new_capacity)
+                size, policy = self.get_size(), self._policy
+                # keep growing while re-adding every node would exceed the load
+                while policy.needs_growth(size, new_capacity):
+                    new_capacity = self._next_prime(policy.grown(new_capacity))
+                self._rehash(new_capacity)
+
+    def clear(self) -> None:
+        """
+        Empties the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        with self._resize_lock:
+            for lock in self._locks:
+                lock.acquire()
+            try:
+                capacity = self._table[1]
+                self._table = ([None] * capacity, capacity)
+                self._sizes = [0] * len(self._locks)
+            finally:
+                for lock in self._locks:
+                    lock.release()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns list of key and value pairs in the hash map.
+
+        Every stripe is held while the list is built, so the result is a
+        consistent snapshot.
+
+        :param self: the hash map being passed
+
+        :return:     list of key and value pairs
+        """
+        da = DynamicArray()
+        with self._resize_lock:
+            for lock in self._locks:
+                lock.acquire()
+            try:
+                for pair in self.items():
+                    da.append(pair)
+            finally:
+                for lock in self._locks:
+                    lock.release()
+        return da
+
+    def items(self):
+        """
+        Generates every key/value pair without locking.
+
+        Pairs put or removed while the generator runs may or may not be
+        seen, but no pair is seen twice.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (key, value) tuples
+        """
+        for chain in self._table[0]:
+            if chain == None:
+                continue
+            for node in chain:
+                yield node.key, node.value
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nConcurrent - put / get / remove")
+    print("-------------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    m.remove('str0')
+    print(m.get('str1'), m.contains_key('str0'), m.get_size())
+
+    print("\nConcurrent - load policy")
+    print("------------------------")
+    m = HashMap(11, hash_function_2, policy=LoadPolicy(0.75, shrink_at=0.2))
+    for i in range(200):
+        m.put('key' + str(i), i)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    for i in range(190):
+        m.remove('key' + str(i))
+    print(m.get_size(), m.get_capacity(), m.get('key195'))
+
+    print("\nConcurrent - 8 threads")
+    print("----------------------")
+    m = HashMap(11, hash_function_2)
+
+    def worker(thread: int) -> None:
+        for i in range(2000):
+            m.put('t' + str(thread) + '-' + str(i), i)
+        for i in range(0, 2000, 2):
+            m.remove('t' + str(thread) + '-' + str(i))
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(m.get_size(), m.get_size() == 8000,
+          all(m.get('t' + str(t) + '-' + str(i)) == i for t in range(8) for i in range(1, 2000, 2)))
@@ -0,0 +1,423 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Open addressing hash map that uses bucketized cuckoo hashing.
+#              Every key may only live in one of two buckets of four slots
+#              or in a small stash, so a lookup never inspects more than a
+#              fixed number of slots no matter how full the table is or
+#              how badly the keys collide.
+
+import random
+from array import array
+
+import hash_map_oa_flat
+from a6_include import hash_function_1
+from hash_functions import MASK_64, make_bulk_hash, mix64
+from hash_map_oa_flat import EMPTY, LIVE
+from load_policy import LoadPolicy
+
+# slots in every bucket
+SLOTS = 4
+
+# slots at the end of the arrays for keys that found no bucket
+STASH_SIZE = 4
+
+# evictions an insert may cause before it falls back to the stash
+MAX_KICKS = 100
+
+# failed rebuilds with new seeds before the table is grown instead
+MAX_RESEEDS = 4
+
+
+class HashMap(hash_map_oa_flat.HashMap):
+    """
+    Cuckoo hash map with struct of arrays storage.
+
+    The arrays hold a number of buckets of SLOTS slots, a power of two,
+    followed by STASH_SIZE stash slots; get_capacity() counts both. A
+    key's first bucket comes from the stored hash by multiply-shift with
+    a seeded multiplier. Its second comes from a seeded bulk_hash of the
+    key itself, so keys the hash function cannot tell apart still get
+    different second buckets. bulk_hash is the same in every process,
+    so the layout of a given seed is too. A lookup inspects at most the
+    2 * SLOTS slots of both buckets plus the stash, and the stash only
+    while it holds a key.
+
+    An insert into two full buckets evicts a random entry from one of
+    them, moves it to its other bucket, and repeats up to MAX_KICKS
+    times. The entry left over then goes into the stash. When the stash
+    is full as well, the table is rebuilt with a new seed, and grown
+    after MAX_RESEEDS failed seeds.
+    """
+
+    def __init__(self, capacity: int, function,
+                 policy: LoadPolicy = None, seed: int = 0) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution
+
+        The default policy grows at load 0.9 and never shrinks. seed
+        picks the first pair of bucket functions; rebuilds move on to
+        the following seeds.
+        """
+        self._power_of_two = True
+        self._policy = LoadPolicy(0.9) if policy == None else policy
+        if self._policy.grow_at >= 1:
+            raise ValueError("open addressing needs grow_at below 1")
+        self._hash_function = function
+        self._seed = seed
+        # picks the entries to evict, so inserts are repeatable per seed
+        self._random = random.Random(seed)
+        self._capacity = self._round_capacity(capacity)
+        self._modifications = 0
+        self.clear()
+
+    @classmethod
+    def _for_snapshot(cls, capacity: int, function, power_of_two: bool,
+                      policy: LoadPolicy, seed: int) -> "HashMap":
+        """
+        Creates an empty hash map of exactly the given capacity for load.
+
+        :param cls:          the class of the hash map
+        :param capacity:     the capacity of the dumped map
+        :param function:     the hash function of the dumped map
+        :param power_of_two: always True for this map
+        :param policy:       the load policy of the new map
+        :param seed:         the seed of the dumped map's bucket functions
+
+        :return:             the empty hash map
+        """
+        return cls(capacity, function, policy, seed)
+
+    def _snapshot_seed(self) -> int:
+        """
+        Returns the seed the bucket functions were picked with.
+
+        :param self: the hash map being passed
+
+        :return:     the current seed
+        """
+        return self._seed
+
+    def _restore(self, bucket: int, key: str, value: object, hash: int) -> None:
+        """
+        Puts a live entry read by load into its slot.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the slot
+        :param key:    the key of the entry
+        :param value:  the value of the entry
+        :param hash:   the stored hash of the entry
+
+        :return:       None; raises ValueError if the slot is in neither
+                       of the key's buckets
+        """
+        if bucket >= self._stash_start:
+            self._stashed += 1
+        elif (bucket // SLOTS != self._first_bucket(hash) and bucket // SLOTS
+              != self._second_hash(key) & self._bucket_mask):
+            # a key outside its buckets could never be found again
+            raise ValueError("snapshot places " + repr(key)
+                             + " outside both of its buckets")
+        self._store(bucket, key, value, hash)
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Rounds a capacity to a power of two buckets plus the stash.
+
+        The stash slots count toward the requested capacity, so a
+        capacity returned by get_capacity() rounds to itself and twice
+        that capacity rounds to twice the buckets.
+
+        :param self:     the hash map being passed
+        :param capacity: the requested capacity
+
+        :return:         the capacity to use
+        """
+        buckets = -(-(capacity - STASH_SIZE) // SLOTS)
+        return self._next_power_of_two(buckets - 1) * SLOTS + STASH_SIZE
+
+    def _first_bucket(self, hash: int) -> int:
+        """
+        Returns the index of a key's first bucket.
+
+        :param self: the hash map being passed
+        :param hash: the signed 64-bit hash of the key
+
+        :return:     index of the bucket
+        """
+        return ((hash * self._multiplier) & MASK_64) >> self._shift
+
+    def _find_bucket(self, key: str, hash: int) -> tuple[int, int]:
+        """
+        Looks for a key in its two buckets and the stash.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the signed 64-bit hash of the key
+
+        :return:     index of the key's slot (-1 if absent) and index of
+                     the first empty slot in either bucket (-1 if none)
+        """
+        states, hashes, keys = self._states, self._hashes, self._keys
+        available = -1
+        start = self._first_bucket(hash) * SLOTS
+        for bucket in range(2):
+            if bucket:
+                # the second bucket is only hashed when the first misses
+                start = (self._second_hash(key) & self._bucket_mask) * SLOTS
+            for slot in range(start, start + SLOTS):
+                if states[slot] == LIVE:
+                    if hashes[slot] == hash and keys[slot] == key:
+                        return slot, available
+                elif available == -1:
+                    available = slot
+        if self._stashed:
+            for slot in range(self._stash_start, self._capacity):
+                if (states[slot] == LIVE and hashes[slot] == hash
+                        and keys[slot] == key):
+                    return slot, available
+        return -1, available
+
+    def _find_buckets(self, keys):
+        """
+        Yields the bucket of every key; see hash_map_oa.HashMap._find_buckets.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        if type(self)._find_bucket is HashMap._find_bucket:
+            return self._probe_buckets(keys)
+        return super()._find_buckets(keys)
+
+    def _probe_buckets(self, keys):
+        """
+        Yields the bucket of every key, looking in both buckets inline.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        hash_key, second_hash = self._hash_key, self._second_hash
+        states, hashes, stored = self._states, self._hashes, self._keys
+        multiplier, shift = self._multiplier, self._shift
+        bucket_mask, stash_start = self._bucket_mask, self._stash_start
+        for key in keys:
+            hash = hash_key(key)
+            start = (((hash * multiplier) & MASK_64) >> shift) * SLOTS
+            found = -1
+            for bucket in range(2):
+                if bucket:
+                    start = (second_hash(key) & bucket_mask) * SLOTS
+                for slot in range(start, start + SLOTS):
+                    if (states[slot] == LIVE and hashes[slot] == hash
+                            and stored[slot] == key):
+                        found = slot
+                        break
+                if found != -1:
+                    break
+            if found == -1 and self._stashed:
+                for slot in range(stash_start, self._capacity):
+                    if (states[slot] == LIVE and hashes[slot] == hash
+                            and stored[slot] == key):
+                        found = slot
+                        break
+            yield found
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:  the hash map being passed
+        :param key:   the key to add
+        :param value: the value that should be added to the hash map
+        :param hash:  the signed 64-bit hash of the key
+
+        :return:      None
+        """
+        bucket, available = self._find_bucket(key, hash)
+        # replaces existing value if the key is already in the hash map
+        if bucket != -1:
+            self._values[bucket] = value
+            return
+        self._modifications += 1
+        if available != -1:
+            self._store(available, key, value, hash)
+        else:
+            homeless = self._place(key, value, hash)
+            if homeless != None:
+                # the rebuild counts every entry, including the new key
+                self._rebuild(self._capacity, [homeless])
+                return
+        self._size += 1
+
+    def _place(self, key: str, value: object, hash: int):
+        """
+        Stores an absent key, evicting entries along the way if needed.
+
+        :param self:  the hash map being passed
+        :param key:   the key to store
+        :param value: the value to store
+        :param hash:  the signed 64-bit hash of the key
+
+        :return:      None once every entry has a slot, otherwise the
+                      (key, value, hash) of the entry left without one
+        """
+        states, hashes = self._states, self._hashes
+        keys, values = self._keys, self._values
+        bucket_mask, second_hash = self._bucket_mask, self._second_hash
+        bucket = self._first_bucket(hash)
+        for start in (bucket * SLOTS,
+                      (second_hash(key) & bucket_mask) * SLOTS):
+            slot = states.find(EMPTY, start, start + SLOTS)
+            if slot != -1:
+                self._store(slot, key, value, hash)
+                return None
+        for _ in range(MAX_KICKS):
+            # swap the carried entry with a random entry of its bucket
+            slot = bucket * SLOTS + self._random.randrange(SLOTS)
+            hashes[slot], hash = hash, hashes[slot]
+            keys[slot], key = key, keys[slot]
+            values[slot], value = value, values[slot]
+            # move the evicted entry to its other bucket
+            first = self._first_bucket(hash)
+            if first == bucket:
+                bucket = second_hash(key) & bucket_mask
+            else:
+                bucket = first
+            start = bucket * SLOTS
+            slot = states.find(EMPTY, start, start + SLOTS)
+            if slot != -1:
+                self._store(slot, key, value, hash)
+                return None
+        slot = states.find(EMPTY, self._stash_start, self._capacity)
+        if slot != -1:
+            self._store(slot, key, value, hash)
+            self._stashed += 1
+            return None
+        return key, value, hash
+
+    def _rebuild(self, new_capacity: int, pending: list) -> None:
+        """
+        Places every live entry and every pending entry into new arrays.
+
+        Each failed attempt moves on to the next seed, and every
+        MAX_RESEEDS failed attempts the capacity is grown as well.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new arrays
+        :param pending:      (key, value, hash) entries not yet stored
+
+        :return:             None
+        """
+        states, hashes = self._states, self._hashes
+        keys, values = self._keys, self._values
+        entries = [(keys[i], values[i], hashes[i])
+                   for i in range(self._capacity) if states[i] == LIVE]
+        entries.extend(pending)
+        failures = 0
+        while True:
+            self._capacity = new_capacity
+            self.clear()
+            place = self._place
+            if all(place(key, value, hash) == None
+                   for key, value, hash in entries):
+                break
+            failures += 1
+            self._seed += 1
+            if failures % MAX_RESEEDS == 0:
+                new_capacity = self._round_capacity(
+                    self._policy.grown(new_capacity))
+        self._size = len(entries)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every live entry into new arrays of the given capacity.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new arrays
+
+        :return:             None
+        """
+        self._rebuild(new_capacity, [])
+
+    def _remove_at(self, bucket: int) -> None:
+        """
+        Empties a live slot; cuckoo hashing needs no tombstones.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the slot
+
+        :return:       None
+        """
+        if bucket >= self._stash_start:
+            self._stashed -= 1
+        self._states[bucket] = EMPTY
+        self._keys[bucket] = None
+        self._values[bucket] = None
+        self._size -= 1
+        self._modifications += 1
+        self._check_shrink()
+
+    def clear(self) -> None:
+        """
+        Empties the hash map, keeping its capacity and seed.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        capacity = self._capacity
+        buckets = (capacity - STASH_SIZE) // SLOTS
+        self._states = bytearray(capacity)
+        self._hashes = array('q', bytes(8 * capacity))
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._size = 0
+        self._tombstones = 0
+        self._stashed = 0
+        self._stash_start = buckets * SLOTS
+        self._bucket_mask = buckets - 1
+        # multiply-shift keeps the top bits of the product as the bucket
+        self._shift = 64 - self._bucket_mask.bit_length()
+        self._multiplier = mix64(self._seed) | 1
+        self._second_hash = make_bulk_hash(self._seed)
+        self._modifications += 1
+
+    def stash_size(self) -> int:
+        """
+        Returns the number of keys currently held in the stash.
+
+        :param self: the hash map being passed
+
+        :return:     number of stashed keys
+        """
+        return self._stashed
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nCuckoo - put / get / remove")
+    print("---------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get('str1'), m.get('str2'), m.contains_key('str3'))
+
+    print("\nCuckoo - keys with equal hashes")
+    print("-------------------------------")
+    m = HashMap(11, hash_function_1)
+    # every permutation of the same letters has the same hash_function_1
+    words = ['abcdef'[i:] + 'abcdef'[:i] for i in range(6)]
+    words += [word[::-1] for word in words]
+    for i, word in enumerate(words):
+        m.put(word, i)
+    print(m.get_size(), all(m.get(word) == i for i, word in enumerate(words)))
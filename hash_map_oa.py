@@ -7,25 +7,48 @@
 #              operations, which demonstrate my ability to implement
 #              hash maps with open addressing in my Python programs.
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
+from a6_include import (DynamicArray, HashEntry,
                         hash_function_1, hash_function_2)
+import snapshot
+from hash_functions import finalized
+from load_policy import LoadPolicy
+
+# share of buckets holding tombstones that triggers an in-place rebuild
+TOMBSTONE_LIMIT = 0.25
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # set while remove_many runs, so the table shrinks once per batch
+    _shrink_deferred = False
+
+    def __init__(self, capacity: int, function,
+                 power_of_two: bool = False,
+                 policy: LoadPolicy = None) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        self._buckets = DynamicArray()
-
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
 
-        self._hash_function = function
-        self._size = 0
+        With power_of_two the capacity is a power of two, buckets are
+        found by masking, probing follows the triangular numbers and
+        every hash is passed through a finalizer. policy decides when
+        the table grows and shrinks; by default it grows at load 0.5 and
+        never shrinks. Quadratic probing only promises a free bucket
+        below load 0.5, so a higher grow_at relies on the resize that
+        put falls back to when a probe sequence finds no free bucket.
+        """
+        self._power_of_two = power_of_two
+        self._policy = LoadPolicy(0.5) if policy == None else policy
+        if self._policy.grow_at >= 1:
+            raise ValueError("open addressing needs grow_at below 1")
+        if power_of_two:
+            self._capacity = self._next_power_of_two(capacity)
+            self._hash_function = finalized(function)
+        else:
+            # capacity must be a prime number
+            self._capacity = self._next_prime(capacity)
+            self._hash_function = function
+        # counts inserts, removals and rebuilds so iterators notice them
+        self._modifications = 0
+        self.clear()
 
     def __str__(self) -> str:
         """
@@ -70,6 +93,33 @@ class HashMap:
 
         return True
 
+    @staticmethod
+    def _next_power_of_two(capacity: int) -> int:
+        """
+        Find the smallest power of two greater than or equal to capacity.
+
+        :param capacity: the requested capacity
+
+        :return:         the power of two capacity, at least 2
+        """
+        return 1 << max(capacity - 1, 1).bit_length()
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Rounds a requested capacity up to one the capacity policy allows.
+
+        :param self:     the hash map being passed
+        :param capacity: the requested capacity
+
+        :return:         a power of two or a prime capacity
+        """
+        if self._power_of_two:
+            return self._next_power_of_two(capacity)
+        # find next prime if new capacity isn't a prime number
+        if not(self._is_prime(capacity)):
+            return self._next_prime(capacity)
+        return capacity
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -97,32 +147,92 @@ class HashMap:
         :return:      None
         """
         # resizes the hash map if necessary
-        if self.table_load() >= 0.5:
-            self.resize_table(self.get_capacity() * 2)
-        # calculates initial bucket to look in
-        bucket = self._hash_function(key) % self._capacity
-        initialBucket = bucket
-        probe = 0
-        added = False
-        while not(added):
-            # inserts new hash entry if bucket empty
-            if self._buckets[bucket] == None:
-                self._buckets[bucket] = HashEntry(key, value)
-                self._size += 1
-                added = True
-            # inserts new hash entry if bucket has tombstone
-            elif self._buckets[bucket].is_tombstone == True:
-                self._buckets[bucket] = HashEntry(key, value)
-                self._size += 1
-                added = True
-            # replaces existing value if bucket has same key
-            elif self._buckets[bucket].key == key:
-                self._buckets[bucket].value = value
-                added = True
-            # quadratically probe to the next bucket          
+        policy = self._policy
+        if policy.should_grow(self._size, self._capacity):
+            self.resize_table(policy.grown(self._capacity))
+        self._put_hashed(key, value, self._hash_key(key))
+
+    def _hash_key(self, key: str) -> int:
+        """
+        Returns the full hash that is stored and probed for a key.
+
+        :param self: the hash map being passed
+        :param key:  the key to hash
+
+        :return:     the hash of the key
+        """
+        return self._hash_function(key)
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:  the hash map being passed
+        :param key:   the key to add
+        :param value: the value that should be added to the hash map
+        :param hash:  the full hash of the key
+
+        :return:      None
+        """
+        bucket, available = self._find_bucket(key, hash)
+        # replaces existing value if the key is already in the hash map
+        if bucket != -1:
+            self._buckets[bucket].value = value
+            return
+        # grow until the probe sequence reaches a free bucket
+        while available == -1:
+            self.resize_table(self._policy.grown(self._capacity))
+            bucket, available = self._find_bucket(key, hash)
+        # inserts new hash entry into the first empty or tombstone bucket
+        if self._buckets[available] != None:
+            self._tombstones -= 1
+        self._buckets[available] = HashEntry(key, value, hash)
+        self._size += 1
+        self._modifications += 1
+
+    def _find_bucket(self, key: str, hash: int) -> tuple[int, int]:
+        """
+        Quadratically probes for a key, shared by every lookup method.
+
+        The probe stops at the first bucket that has never been used,
+        since the key would have been placed there or earlier. With a
+        prime capacity the offsets i ** 2 for i in 0 .. capacity // 2 are
+        all distinct and every later offset repeats one of them, so no
+        more than capacity // 2 + 1 buckets are ever inspected. With a
+        power of two capacity the triangular offsets i * (i + 1) / 2 visit
+        every bucket exactly once in capacity probes.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the full hash of the key
+
+        :return:     index of the key's bucket (-1 if absent) and index
+                     of the first empty or tombstone bucket on the probe
+                     sequence (-1 if none was seen)
+        """
+        capacity = self._capacity
+        mask = self._mask
+        initialBucket = hash & mask if mask else hash % capacity
+        bucket = initialBucket
+        available = -1
+        for probe in range(1, capacity + 1 if mask else capacity // 2 + 2):
+            entry = self._buckets[bucket]
+            # a never used bucket ends the probe sequence
+            if entry == None:
+                if available == -1:
+                    available = bucket
+                return -1, available
+            # remember the first tombstone so put can reuse it
+            if entry.is_tombstone:
+                if available == -1:
+                    available = bucket
+            elif entry.key == key:
+                return bucket, available
+            if mask:
+                bucket = (bucket + probe) & mask
             else:
-                probe += 1
-                bucket = (initialBucket + (probe ** 2)) % self._capacity
+                bucket = (initialBucket + probe * probe) % capacity
+        return -1, available
 
     def table_load(self) -> float:
         """
@@ -134,6 +244,16 @@ class HashMap:
         """
         return self._size / self._capacity # return the hash map table load
 
+    def tombstone_load(self) -> float:
+        """
+        Calculates the share of buckets holding tombstones.
+
+        :param self: the hash map being passed
+
+        :return:     the tombstone load
+        """
+        return self._tombstones / self._capacity
+
     def empty_buckets(self) -> int:
         """
         Returns the amount of empty buckets.
@@ -160,16 +280,46 @@ class HashMap:
         """
         # only resize hash map if new capacity is greater than or equal to size
         if new_capacity >= self._size:
-            # find next prime if new capacity isn't a prime number
-            if not(self._is_prime(new_capacity)):
-                new_capacity = self._next_prime(new_capacity)
-            # get list of key/value pairs, update capacity, and clear hash map
-            data = self.get_keys_and_values()
-            self._capacity = new_capacity
-            self.clear()
-            # using list of key/value pairs, rehash them into hash map
-            for i in range(data.length()):
-                self.put(data[i][0], data[i][1])
+            new_capacity = self._round_capacity(new_capacity)
+            # keep growing while re-adding every entry would exceed the load
+            policy = self._policy
+            while policy.needs_growth(self._size, new_capacity):
+                new_capacity = self._round_capacity(policy.grown(new_capacity))
+            self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every live entry into a new table of the given capacity.
+
+        Entries are placed using the hash stored on them, so the hash
+        function is never called and tombstones are dropped.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        old_buckets = self._buckets
+        old_capacity = self._capacity
+        self._capacity = new_capacity
+        self.clear()
+        mask = self._mask
+        # keys are already unique, so only an empty bucket has to be found
+        for i in range(old_capacity):
+            entry = old_buckets[i]
+            if entry == None or entry.is_tombstone == True:
+                continue
+            initialBucket = entry.hash & mask if mask else entry.hash % new_capacity
+            bucket = initialBucket
+            probe = 0
+            while self._buckets[bucket] != None:
+                probe += 1
+                if mask:
+                    bucket = (bucket + probe) & mask
+                else:
+                    bucket = (initialBucket + (probe ** 2)) % new_capacity
+            self._buckets[bucket] = entry
+            self._size += 1
 
     def get(self, key: str) -> object:
         """
@@ -182,22 +332,22 @@ class HashMap:
         """
         # only look for key if hash map is not empty
         if self._size > 0:
-            # determine initial bucket to look in
-            bucket = self._hash_function(key) % self._capacity
-            initialBucket = bucket
-            probe = 0
-            # quadratically probe through hash map 
-            for i in range(self._capacity):
-                # if the key is found in hash map, return the associated value
-                if self._buckets[bucket]:
-                    if self._buckets[bucket].key == key and self._buckets[bucket].is_tombstone == False:
-                        return self._buckets[bucket].value
-                # if key not found, quadratically probe to the next bucket
-                probe += 1
-                bucket = (initialBucket + (probe ** 2)) % self._capacity
-            return None
+            bucket, _ = self._find_bucket(key, self._hash_key(key))
+            if bucket != -1:
+                return self._value_at(bucket)
         return None
 
+    def _value_at(self, bucket: int) -> object:
+        """
+        Returns the value stored in a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the value held in the bucket
+        """
+        return self._buckets[bucket].value
+
     def contains_key(self, key: str) -> bool:
         """
         Determines whether the hashmap holds the passed key.
@@ -209,20 +359,8 @@ class HashMap:
         """
         # only look for key if hash map is not empty
         if self._size > 0:
-            # determine initial bucket to look in
-            bucket = self._hash_function(key) % self._capacity
-            initialBucket = bucket
-            probe = 0
-            # iterate through hash map
-            for i in range(self._capacity):
-                # if the key is found in hash map, return true
-                if self._buckets[bucket]:
-                    if self._buckets[bucket].key == key and self._buckets[bucket].is_tombstone == False:
-                        return True
-                # if key not found, quadratically probe to the next bucket
-                probe += 1
-                bucket = (initialBucket + (probe ** 2)) % self._capacity
-            return False
+            bucket, _ = self._find_bucket(key, self._hash_key(key))
+            return bucket != -1
         return False
 
     def remove(self, key: str) -> None:
@@ -234,21 +372,196 @@ class HashMap:
 
         :return:     None
         """
-        # determine bucket to remove from
-        bucket = self._hash_function(key) % self._capacity
-        initialBucket = bucket
-        probe = 0
-        # iterate through hash map
-        for i in range(self._capacity):
-            # if the key is found in hash map, set tombstone to true
-            if self._buckets[bucket]:
-                if self._buckets[bucket].key == key and self._buckets[bucket].is_tombstone == False:
-                    self._buckets[bucket].is_tombstone = True
-                    self._size -= 1
+        # only look for key if hash map is not empty
+        if self._size > 0:
+            bucket, _ = self._find_bucket(key, self._hash_key(key))
+            if bucket != -1:
+                self._remove_at(bucket)
+
+    def _remove_at(self, bucket: int) -> None:
+        """
+        Turns a live bucket into a tombstone.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       None
+        """
+        self._buckets[bucket].is_tombstone = True
+        self._size -= 1
+        self._tombstones += 1
+        self._modifications += 1
+        self._check_shrink()
+
+    def _check_shrink(self) -> None:
+        """
+        Shrinks the hash map after a removal if the policy deems necessary,
+        otherwise rebuilds it in place once tombstones pile up.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        if self._shrink_deferred:
+            return
+        new_capacity = self._policy.shrunk(self._size, self._capacity)
+        if new_capacity < self._capacity:
+            new_capacity = self._round_capacity(new_capacity)
+        # rounding up can land back on the current capacity
+        if new_capacity < self._capacity:
+            # the smaller table is built without tombstones as well
+            self._rehash(new_capacity)
+        # rebuild once tombstones start to lengthen probe sequences
+        elif self.tombstone_load() >= TOMBSTONE_LIMIT:
+            self.compact()
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds every key/value pair from an iterable to the hash map.
+
+        The table is grown once for the final count and all keys are
+        hashed before any of them is inserted, so no resize happens part
+        way through the batch.
+
+        :param self:  the hash map being passed
+        :param pairs: iterable of (key, value) tuples
+
+        :return:      None
+        """
+        pairs = list(pairs)
+        hash_key = self._hash_key
+        hashes = [hash_key(key) for key, _ in pairs]
+        self._reserve(self._size + len(pairs))
+        put_hashed = self._put_hashed
+        for (key, value), hash in zip(pairs, hashes):
+            put_hashed(key, value, hash)
+
+    def get_many(self, keys) -> list:
+        """
+        Returns the values held by every key from an iterable.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to get
+
+        :return:     list of values, None for every missing key
+        """
+        value_at = self._value_at
+        return [None if bucket == -1 else value_at(bucket)
+                for bucket in self._find_buckets(keys)]
+
+    def contains_many(self, keys) -> list:
+        """
+        Determines for every key from an iterable whether it is held.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     list of booleans, one per key
+        """
+        return [bucket != -1 for bucket in self._find_buckets(keys)]
+
+    def _find_buckets(self, keys):
+        """
+        Yields the bucket of every key, with the probe loop inlined.
+
+        Subclasses that probe differently without overriding this method
+        fall back to one _find_bucket call per key.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        if type(self)._find_bucket is HashMap._find_bucket:
+            return self._probe_buckets(keys)
+        keys = list(keys)
+        # map keeps the per key calls out of the interpreter loop
+        return (bucket for bucket, _ in
+                map(self._find_bucket, keys, map(self._hash_key, keys)))
+
+    def _probe_buckets(self, keys):
+        """
+        Yields the bucket of every key, probing quadratically inline.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        hash_key = self._hash_key
+        capacity, mask, buckets = self._capacity, self._mask, self._buckets
+        limit = capacity + 1 if mask else capacity // 2 + 2
+        for key in keys:
+            hash = hash_key(key)
+            initialBucket = hash & mask if mask else hash % capacity
+            bucket = initialBucket
+            found = -1
+            for probe in range(1, limit):
+                entry = buckets[bucket]
+                # a never used bucket ends the probe sequence
+                if entry == None:
                     break
-            # if key not found, quadratically probe to the next bucket
-            probe += 1
-            bucket = (initialBucket + (probe ** 2)) % self._capacity
+                if not entry.is_tombstone and entry.key == key:
+                    found = bucket
+                    break
+                if mask:
+                    bucket = (bucket + probe) & mask
+                else:
+                    bucket = (initialBucket + probe * probe) % capacity
+            yield found
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key from an iterable from the hash map.
+
+        The table is shrunk or compacted once for the whole batch rather
+        than checked after every removal.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to remove
+
+        :return:     None
+        """
+        hash_key, find_bucket = self._hash_key, self._find_bucket
+        remove_at = self._remove_at
+        self._shrink_deferred = True
+        try:
+            for key in keys:
+                bucket = find_bucket(key, hash_key(key))[0]
+                if bucket != -1:
+                    remove_at(bucket)
+        finally:
+            self._shrink_deferred = False
+        self._check_shrink()
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grows the table once so that count entries fit under the load limit.
+
+        :param self:  the hash map being passed
+        :param count: the number of entries the table must hold
+
+        :return:      None
+        """
+        capacity, policy = self._capacity, self._policy
+        while policy.needs_growth(count, capacity):
+            capacity = self._round_capacity(policy.grown(capacity))
+        if capacity != self._capacity:
+            self._rehash(capacity)
+
+    def compact(self) -> None:
+        """
+        Rebuilds the hash map in place to drop every tombstone.
+
+        The capacity is kept, so this only shortens probe sequences that
+        run through removed entries.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        if self._tombstones > 0:
+            self._rehash(self._capacity)
 
     def clear(self) -> None:
         """
@@ -264,6 +577,10 @@ class HashMap:
             self._buckets.append(None)
         # update the size of hash map
         self._size = 0
+        self._tombstones = 0
+        # power of two tables find buckets with this mask, others use 0
+        self._mask = self._capacity - 1 if self._power_of_two else 0
+        self._modifications += 1
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -279,37 +596,267 @@ class HashMap:
             da.append((bucket.key, bucket.value))
         return da
 
-    def __iter__(self):
+    def dump(self, fileobj, codec: snapshot.Codec = snapshot.PICKLE) -> None:
+        """
+        Writes a binary snapshot of the hash map to a file object.
+
+        Every live and tombstone bucket is written with its index and
+        stored hash, one chunk at a time, so load can rebuild the exact
+        same layout; see snapshot.write for the format.
+
+        :param self:    the hash map being passed
+        :param fileobj: binary file object to write to
+        :param codec:   codec that turns values into bytes
+
+        :return:        None
+        """
+        snapshot.write(fileobj, self, self._hash_key(snapshot.CHECK_KEY),
+                       self._snapshot_records(), self._size + self._tombstones,
+                       codec, self._snapshot_seed())
+
+    @classmethod
+    def load(cls, fileobj, function, codec: snapshot.Codec = snapshot.PICKLE,
+             policy: LoadPolicy = None) -> "HashMap":
+        """
+        Reads a hash map written by dump from a file object.
+
+        Every entry goes back into the bucket it was dumped from with
+        its stored hash, so no key is hashed and no probing is done.
+
+        :param cls:      the class of the dumped hash map
+        :param fileobj:  binary file object to read from
+        :param function: the hash function the dumped map was built with
+        :param codec:    the codec the values were dumped with
+        :param policy:   the load policy of the new map
+
+        :return:         the loaded hash map; raises ValueError if the
+                         snapshot does not match cls, codec or function
+        """
+        power_of_two, check, seed, capacity, size, count = \
+            snapshot.read_header(fileobj, cls, codec)
+        hash_map = cls._for_snapshot(capacity, function, power_of_two,
+                                     policy, seed)
+        snapshot.check_hash(check, hash_map._hash_key(snapshot.CHECK_KEY))
+        restore, restore_tombstone = hash_map._restore, hash_map._restore_tombstone
+        for bucket, hash, key, value in snapshot.read_records(fileobj, count, codec):
+            if value is snapshot.TOMBSTONE:
+                restore_tombstone(bucket, hash)
+            else:
+                restore(bucket, key, value, hash)
+        hash_map._size = size
+        hash_map._tombstones = count - size
+        return hash_map
+
+    @classmethod
+    def _for_snapshot(cls, capacity: int, function, power_of_two: bool,
+                      policy: LoadPolicy, seed: int) -> "HashMap":
+        """
+        Creates an empty hash map of exactly the given capacity for load.
+
+        :param cls:          the class of the hash map
+        :param capacity:     the capacity of the dumped map
+        :param function:     the hash function of the dumped map
+        :param power_of_two: whether the dumped map masked its hashes
+        :param policy:       the load policy of the new map
+        :param seed:         the seed returned by _snapshot_seed
+
+        :return:             the empty hash map
+        """
+        hash_map = cls(capacity, function, power_of_two, policy)
+        # the constructor rounds a capacity of 2 up to the next odd prime
+        if hash_map._capacity != capacity:
+            hash_map._capacity = capacity
+            hash_map.clear()
+        return hash_map
+
+    def _snapshot_seed(self) -> int:
+        """
+        Returns the seed a layout depends on besides the hash function.
+
+        :param self: the hash map being passed
+
+        :return:     the seed, 0 for tables without one
+        """
+        return 0
+
+    def _snapshot_records(self):
+        """
+        Generates the contents of every used bucket for dump.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (bucket, hash, key, value) tuples, with
+                     snapshot.TOMBSTONE as the value of a tombstone
+        """
+        buckets = self._buckets
+        for bucket in range(self._capacity):
+            entry = buckets[bucket]
+            if entry == None:
+                continue
+            if entry.is_tombstone:
+                yield bucket, entry.hash, None, snapshot.TOMBSTONE
+            else:
+                yield bucket, entry.hash, entry.key, entry.value
+
+    def _restore(self, bucket: int, key: str, value: object, hash: int) -> None:
+        """
+        Puts a live entry read by load into its bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param key:    the key of the entry
+        :param value:  the value of the entry
+        :param hash:   the stored hash of the entry
+
+        :return:       None
+        """
+        self._buckets[bucket] = HashEntry(key, value, hash)
+
+    def _restore_tombstone(self, bucket: int, hash: int) -> None:
+        """
+        Puts a tombstone read by load into its bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param hash:   the stored hash of the removed entry
+
+        :return:       None
+        """
+        entry = HashEntry(None, None, hash)
+        entry.is_tombstone = True
+        self._buckets[bucket] = entry
+
+    def __iter__(self) -> "HashMapIterator":
         """
         Create iterator for hash map loop.
 
+        Each call returns a new iterator, so loops over the same hash map
+        can be nested.
+
         :param self: the hash map being passed
 
-        :return:     instance of self
+        :return:     iterator over the live hash entries
         """
-        self._index = 0 # start iterating at index 0
-        return self     # return instance of self
+        return HashMapIterator(self)
 
-    def __next__(self):
+    def keys(self):
         """
-        Obtain next value and advance iterator.
+        Generates every key in the hash map without copying the table.
 
         :param self: the hash map being passed
 
-        :return:     value held in hash map index
+        :return:     generator of keys
         """
-        try:
-            # initialize value to see if it is empty
-            value = self._buckets[self._index]
-            # keep iterating through hashmap until hash entry is not empty
-            while value == None or value.is_tombstone == True:
-                self._index += 1
-                value = self._buckets[self._index]
-        except DynamicArrayException:
+        key_at = self._key_at
+        for bucket in self._live_buckets():
+            yield key_at(bucket)
+
+    def values(self):
+        """
+        Generates every value in the hash map without copying the table.
+
+        :param self: the hash map being passed
+
+        :return:     generator of values
+        """
+        value_at = self._value_at
+        for bucket in self._live_buckets():
+            yield value_at(bucket)
+
+    def items(self):
+        """
+        Generates every key/value pair in the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (key, value) tuples
+        """
+        key_at, value_at = self._key_at, self._value_at
+        for bucket in self._live_buckets():
+            yield key_at(bucket), value_at(bucket)
+
+    def _live_buckets(self):
+        """
+        Generates the index of every live bucket.
+
+        :param self: the hash map being passed
+
+        :return:     generator of bucket indices; raises RuntimeError if
+                     the hash map is changed while it is suspended
+        """
+        modifications = self._modifications
+        bucket = self._next_live(0)
+        while bucket < self._capacity:
+            yield bucket
+            if self._modifications != modifications:
+                raise RuntimeError("hash map changed during iteration")
+            bucket = self._next_live(bucket + 1)
+
+    def _next_live(self, bucket: int) -> int:
+        """
+        Finds the first live bucket at or after the given index.
+
+        :param self:   the hash map being passed
+        :param bucket: the index to start looking from
+
+        :return:       index of the live bucket, or the capacity if none
+        """
+        buckets = self._buckets
+        while bucket < self._capacity:
+            entry = buckets[bucket]
+            if entry != None and not entry.is_tombstone:
+                return bucket
+            bucket += 1
+        return bucket
+
+    def _key_at(self, bucket: int) -> str:
+        """
+        Returns the key stored in a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the key held in the bucket
+        """
+        return self._buckets[bucket].key
+
+    def _entry_at(self, bucket: int) -> HashEntry:
+        """
+        Returns the hash entry stored in a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the entry held in the bucket
+        """
+        return self._buckets[bucket]
+
+
+class HashMapIterator:
+    """
+    Separate iterator class for HashMap
+    """
+
+    def __init__(self, hash_map: HashMap) -> None:
+        """Initialize the iterator at the first bucket of a hash map."""
+        self._map = hash_map
+        self._bucket = 0
+        self._modifications = hash_map._modifications
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> HashEntry:
+        """Obtain next live hash entry and advance iterator."""
+        hash_map = self._map
+        if hash_map._modifications != self._modifications:
+            raise RuntimeError("hash map changed during iteration")
+        bucket = hash_map._next_live(self._bucket)
+        if bucket >= hash_map._capacity:
             raise StopIteration
-        # update index and return the value       
-        self._index += 1
-        return value
+        self._bucket = bucket + 1
+        return hash_map._entry_at(bucket)
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -518,4 +1065,13 @@ if __name__ == "__main__":
     m.remove('4')
     print(m)
     for item in m:
-        print('K:', item.key, 'V:', item.value)
\ No newline at end of file
+        print('K:', item.key, 'V:', item.value)
+    print("\nLoadPolicy - shrink on remove example 1")
+    print("---------------------")
+    m = HashMap(11, hash_function_1, policy=LoadPolicy(0.5, 0.125))
+    for i in range(400):
+        m.put('str' + str(i), i)
+    print(m.get_size(), m.get_capacity())
+    for i in range(390):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
@@ -0,0 +1,406 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Open addressing hash map that keeps its buckets in parallel
+#              flat arrays (struct of arrays) instead of one HashEntry
+#              object per bucket, which removes the per-entry object
+#              overhead for very large maps.
+
+from array import array
+
+import hash_map_oa
+import snapshot
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+
+# states kept in the state byte array for every bucket
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+
+def _to_int64(hash: int) -> int:
+    """Fold any integer hash into the signed 64-bit range of array('q')."""
+    return ((hash + 0x8000000000000000) & 0xFFFFFFFFFFFFFFFF) - 0x8000000000000000
+
+
+class HashMap(hash_map_oa.HashMap):
+    """
+    Quadratic probing hash map with struct of arrays storage.
+
+    Every bucket i is described by _states[i] (EMPTY, LIVE or TOMBSTONE),
+    _hashes[i], _keys[i] and _values[i]. It behaves exactly like
+    hash_map_oa.HashMap; iteration yields a HashEntry built for each
+    live bucket, so changes made to a yielded entry are not written back.
+    """
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        out = ''
+        for i in range(self._capacity):
+            out += str(i) + ': ' + str(self._entry(i)) + '\n'
+        return out
+
+    def _entry(self, bucket: int) -> HashEntry:
+        """
+        Builds a HashEntry describing a bucket, or None if it is empty.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       entry holding the bucket's contents
+        """
+        state = self._states[bucket]
+        if state == EMPTY:
+            return None
+        entry = HashEntry(self._keys[bucket], self._values[bucket],
+                          self._hashes[bucket])
+        entry.is_tombstone = state == TOMBSTONE
+        return entry
+
+    def _hash_key(self, key: str) -> int:
+        """
+        Returns the hash of a key folded into the range of array('q').
+
+        :param self: the hash map being passed
+        :param key:  the key to hash
+
+        :return:     the signed 64-bit hash of the key
+        """
+        return _to_int64(self._hash_function(key))
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:  the hash map being passed
+        :param key:   the key to add
+        :param value: the value that should be added to the hash map
+        :param hash:  the signed 64-bit hash of the key
+
+        :return:      None
+        """
+        bucket, available = self._find_bucket(key, hash)
+        # replaces existing value if the key is already in the hash map
+        if bucket != -1:
+            self._values[bucket] = value
+            return
+        # grow until the probe sequence reaches a free bucket
+        while available == -1:
+            self.resize_table(self._policy.grown(self._capacity))
+            bucket, available = self._find_bucket(key, hash)
+        if self._states[available] == TOMBSTONE:
+            self._tombstones -= 1
+        self._store(available, key, value, hash)
+        self._size += 1
+        self._modifications += 1
+
+    def _store(self, bucket: int, key: str, value: object, hash: int) -> None:
+        """
+        Writes a live entry into every array for the given bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param key:    the key to store
+        :param value:  the value to store
+        :param hash:   the full hash of the key
+
+        :return:       None
+        """
+        self._states[bucket] = LIVE
+        self._hashes[bucket] = hash
+        self._keys[bucket] = key
+        self._values[bucket] = value
+
+    def _snapshot_records(self):
+        """
+        Generates the contents of every used bucket for dump.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (bucket, hash, key, value) tuples, with
+                     snapshot.TOMBSTONE as the value of a tombstone
+        """
+        states, hashes = self._states, self._hashes
+        keys, values = self._keys, self._values
+        for bucket in range(self._capacity):
+            state = states[bucket]
+            if state == LIVE:
+                yield bucket, hashes[bucket], keys[bucket], values[bucket]
+            elif state == TOMBSTONE:
+                yield bucket, hashes[bucket], None, snapshot.TOMBSTONE
+
+    def _restore(self, bucket: int, key: str, value: object, hash: int) -> None:
+        """
+        Puts a live entry read by load into its bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param key:    the key of the entry
+        :param value:  the value of the entry
+        :param hash:   the stored hash of the entry
+
+        :return:       None
+        """
+        self._store(bucket, key, value, hash)
+
+    def _restore_tombstone(self, bucket: int, hash: int) -> None:
+        """
+        Puts a tombstone read by load into its bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param hash:   the stored hash of the removed entry
+
+        :return:       None
+        """
+        self._states[bucket] = TOMBSTONE
+        self._hashes[bucket] = hash
+
+    def _find_bucket(self, key: str, hash: int) -> tuple[int, int]:
+        """
+        Quadratically probes for a key; see hash_map_oa.HashMap._find_bucket.
+
+        The stored hash is compared before the key, so full key
+        comparisons only happen for buckets whose hash matches.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the full hash of the key
+
+        :return:     index of the key's bucket (-1 if absent) and index
+                     of the first empty or tombstone bucket on the probe
+                     sequence (-1 if none was seen)
+        """
+        capacity = self._capacity
+        mask = self._mask
+        states, hashes, keys = self._states, self._hashes, self._keys
+        initialBucket = hash & mask if mask else hash % capacity
+        bucket = initialBucket
+        available = -1
+        for probe in range(1, capacity + 1 if mask else capacity // 2 + 2):
+            state = states[bucket]
+            # a never used bucket ends the probe sequence
+            if state == EMPTY:
+                if available == -1:
+                    available = bucket
+                return -1, available
+            # remember the first tombstone so put can reuse it
+            if state == TOMBSTONE:
+                if available == -1:
+                    available = bucket
+            elif hashes[bucket] == hash and keys[bucket] == key:
+                return bucket, available
+            if mask:
+                bucket = (bucket + probe) & mask
+            else:
+                bucket = (initialBucket + probe * probe) % capacity
+        return -1, available
+
+    def _find_buckets(self, keys):
+        """
+        Yields the bucket of every key; see hash_map_oa.HashMap._find_buckets.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        if type(self)._find_bucket is HashMap._find_bucket:
+            return self._probe_buckets(keys)
+        return super()._find_buckets(keys)
+
+    def _probe_buckets(self, keys):
+        """
+        Yields the bucket of every key, probing quadratically inline.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        hash_key = self._hash_key
+        capacity, mask = self._capacity, self._mask
+        states, hashes, stored = self._states, self._hashes, self._keys
+        limit = capacity + 1 if mask else capacity // 2 + 2
+        for key in keys:
+            hash = hash_key(key)
+            initialBucket = hash & mask if mask else hash % capacity
+            bucket = initialBucket
+            found = -1
+            for probe in range(1, limit):
+                state = states[bucket]
+                # a never used bucket ends the probe sequence
+                if state == EMPTY:
+                    break
+                if (state == LIVE and hashes[bucket] == hash
+                        and stored[bucket] == key):
+                    found = bucket
+                    break
+                if mask:
+                    bucket = (bucket + probe) & mask
+                else:
+                    bucket = (initialBucket + probe * probe) % capacity
+            yield found
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every live entry into new arrays of the given capacity.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new arrays
+
+        :return:             None
+        """
+        old_states, old_hashes = self._states, self._hashes
+        old_keys, old_values = self._keys, self._values
+        self._capacity = new_capacity
+        self.clear()
+        states = self._states
+        mask = self._mask
+        # keys are already unique, so only an empty bucket has to be found
+        for i in range(len(old_states)):
+            if old_states[i] != LIVE:
+                continue
+            hash = old_hashes[i]
+            initialBucket = hash & mask if mask else hash % new_capacity
+            bucket = initialBucket
+            probe = 0
+            while states[bucket] != EMPTY:
+                probe += 1
+                if mask:
+                    bucket = (bucket + probe) & mask
+                else:
+                    bucket = (initialBucket + probe * probe) % new_capacity
+            self._store(bucket, old_keys[i], old_values[i], hash)
+            self._size += 1
+
+    def _value_at(self, bucket: int) -> object:
+        """
+        Returns the value stored in a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the value held in the bucket
+        """
+        return self._values[bucket]
+
+    def _remove_at(self, bucket: int) -> None:
+        """
+        Turns a live bucket into a tombstone.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       None
+        """
+        # drop the references so the key and value can be freed
+        self._states[bucket] = TOMBSTONE
+        self._keys[bucket] = None
+        self._values[bucket] = None
+        self._size -= 1
+        self._tombstones += 1
+        self._modifications += 1
+        self._check_shrink()
+
+    def clear(self) -> None:
+        """
+        Empties the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        capacity = self._capacity
+        self._states = bytearray(capacity)
+        self._hashes = array('q', bytes(8 * capacity))
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._size = 0
+        self._tombstones = 0
+        self._mask = capacity - 1 if self._power_of_two else 0
+        self._modifications += 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns list of key and value pairs in the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     list of key and value pairs
+        """
+        da = DynamicArray()
+        for pair in self.items():
+            da.append(pair)
+        return da
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the amount of empty buckets.
+
+        :param self: the hash map being passed
+
+        :return:     amount of empty buckets
+        """
+        return self._capacity - self._size
+
+    def _next_live(self, bucket: int) -> int:
+        """
+        Finds the first live bucket at or after the given index.
+
+        :param self:   the hash map being passed
+        :param bucket: the index to start looking from
+
+        :return:       index of the live bucket, or the capacity if none
+        """
+        found = self._states.find(LIVE, bucket)
+        return self._capacity if found == -1 else found
+
+    def _key_at(self, bucket: int) -> str:
+        """
+        Returns the key stored in a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the key held in the bucket
+        """
+        return self._keys[bucket]
+
+    def _entry_at(self, bucket: int) -> HashEntry:
+        """
+        Builds a HashEntry describing a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       entry holding the bucket's contents
+        """
+        return self._entry(bucket)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nFlat storage - put / get / remove")
+    print("---------------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get('str1'), m.get('str2'), m.contains_key('str3'))
+
+    print("\nFlat storage - iteration")
+    print("------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -0,0 +1,827 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Open addressing hash map kept in a memory mapped file. The
+#              bucket table holds fixed width slots that point into a heap
+#              of key/value records in the same file, so a map written by
+#              one process can be reopened by the next without inserting
+#              its keys again; pages are only read from disk once touched.
+
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from array import array
+
+import hash_map_oa
+import snapshot
+from a6_include import HashEntry, hash_function_1, hash_function_2
+from hash_functions import finalized
+from hash_map_oa_flat import _to_int64
+from load_policy import LoadPolicy
+
+# magic bytes, format version, flags, hash check, capacity, size,
+# tombstones, end of the heap and bytes of dead records
+HEADER = struct.Struct('<8sIIqQQQQQ')
+MAGIC = b'A6HMMAP\x00'
+VERSION = 1
+
+# header flags
+POWER_OF_TWO = 1
+DIRTY = 2
+
+# a slot is the signed 64-bit hash and the file offset of its record;
+# 0 marks an empty slot and a negated offset a tombstone
+SLOT_WIDTH = 16
+
+# a record is the key and value lengths, the UTF-8 key and the pickled value
+RECORD = struct.Struct('<II')
+
+# the signed 64-bit hash and the file offset held by a slot
+SLOT = struct.Struct('<qq')
+
+# suffix of the journal that holds, while a commit is being written, the
+# committed header followed by the index and committed bytes of every slot
+# the commit changes
+UNDO = '.undo'
+UNDO_RECORD = struct.Struct('<Q16s')
+
+# hashed once at creation and again on every open, so a map is never read
+# with a hash function that places keys differently
+CHECK_KEY = 'hash_map_oa_mmap'
+
+
+class HashMap(hash_map_oa.HashMap):
+    """
+    Quadratic probing hash map stored in a file.
+
+    The file starts with a HEADER, followed by the bucket table of
+    SLOT_WIDTH byte slots and then the heap. The table is read through a
+    memoryview of the mapping, so probing never copies it into Python
+    objects; a key is only read from the heap when the stored hash
+    matches. Overwriting or removing a key appends nothing but leaves its
+    old record dead in the heap until the next rehash or compact().
+
+    Keys must be strings. Values are pickled, so get returns a copy and
+    changing it does not change the map.
+
+    The file is mapped copy-on-write, so changes to the table stay in
+    memory until commit() writes the changed slots to the file. New
+    records go to the file at once, but only ever past the committed end
+    of the heap, where the last commit never looks. Before commit()
+    overwrites any slot it journals the committed bytes of every slot it
+    changes, and the committed header, to a file with the UNDO suffix,
+    and marks the header DIRTY. A commit therefore costs time in the
+    number of slots changed, not the capacity. Opening a file that is
+    still marked DIRTY, such as one left behind by a crash part way
+    through a commit, writes the journal back over it and so returns to
+    the last commit. A rehash, which also runs on clear(), compact() and
+    every resize, writes a new file and swaps it in with os.replace, so
+    it commits as well.
+
+    dump() writes the same snapshot format as hash_map_oa.HashMap.dump,
+    with any of its codecs; load() also needs the path of the file to
+    create.
+    """
+
+    def __init__(self, path: str, function, capacity: int = 11,
+                 power_of_two: bool = False,
+                 policy: LoadPolicy = None) -> None:
+        """
+        Initialize new HashMap stored in the file at path, that uses
+        quadratic probing for collision resolution
+
+        An existing file is opened, and capacity is then ignored; a
+        missing or empty file is created as an empty map. function must
+        give the same hashes in every process, which the built-in hash of
+        str does not. The default policy grows at load 0.5 and never
+        shrinks.
+        """
+        self._path = path
+        self._power_of_two = power_of_two
+        self._policy = LoadPolicy(0.5) if policy == None else policy
+        if self._policy.grow_at >= 1:
+            raise ValueError("open addressing needs grow_at below 1")
+        self._hash_function = finalized(function) if power_of_two else function
+        self._check = self._hash_key(CHECK_KEY)
+        self._modifications = 0
+        self._mm = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._map()
+        else:
+            self._capacity = self._round_capacity(capacity)
+            self.clear()
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        out = ''
+        for i in range(self._capacity):
+            out += str(i) + ': ' + str(self._entry(i)) + '\n'
+        return out
+
+    def __enter__(self) -> "HashMap":
+        """Return the hash map for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Commit and close the hash map at the end of a with statement."""
+        self.close()
+
+    # ------------------------------------------------------------------ #
+
+    def _map(self) -> None:
+        """
+        Maps the file at the hash map's path and reads its header.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        file = os.open(self._path, os.O_RDWR)
+        try:
+            header = os.pread(file, HEADER.size, 0)
+            if len(header) == HEADER.size:
+                (magic, version, flags, check, capacity, size,
+                 tombstones, heap_end, dead) = HEADER.unpack(header)
+            if len(header) != HEADER.size or magic != MAGIC or version != VERSION:
+                raise ValueError(self._path + " is not a version "
+                                 + str(VERSION) + " hash map file")
+            if flags & DIRTY:
+                self._roll_back(file)
+                os.close(file)
+                return self._map()
+            if bool(flags & POWER_OF_TWO) != self._power_of_two or check != self._check:
+                raise ValueError(self._path + " was built with another hash function")
+            mm = mmap.mmap(file, 0, access=mmap.ACCESS_COPY)
+        except BaseException:
+            os.close(file)
+            raise
+        self._file = file
+        self._mm = mm
+        self._capacity = capacity
+        self._size = size
+        self._tombstones = tombstones
+        self._heap_end = heap_end
+        self._dead = dead
+        # slots changed since the last commit
+        self._touched = set()
+        self._mask = capacity - 1 if self._power_of_two else 0
+        self._slots = memoryview(mm)[HEADER.size:self._heap_start()].cast('q')
+        self._modifications += 1
+        # a journal left by a crash after the last commit, or one never
+        # finished, is out of date
+        for stale in (self._path + UNDO, self._path + UNDO + '.tmp'):
+            if os.path.exists(stale):
+                os.remove(stale)
+                self._sync_directory()
+
+    def _roll_back(self, file: int) -> None:
+        """
+        Writes the journal of an unfinished commit back over the file.
+
+        :param self: the hash map being passed
+        :param file: descriptor of the file, open for writing
+
+        :return:     None; raises ValueError if there is no usable journal
+        """
+        undo = self._path + UNDO
+        if not os.path.exists(undo):
+            raise ValueError(self._path + " has uncommitted changes"
+                             " and no journal of the last commit")
+        with open(undo, 'rb') as journal:
+            header = journal.read(HEADER.size)
+            records = journal.read()
+        if (len(header) != HEADER.size or header[:len(MAGIC)] != MAGIC
+                or len(records) % UNDO_RECORD.size):
+            raise ValueError(undo + " is not a journal of a hash map")
+        for bucket, saved in UNDO_RECORD.iter_unpack(records):
+            os.pwrite(file, saved, HEADER.size + SLOT_WIDTH * bucket)
+        os.pwrite(file, header, 0)
+        os.fsync(file)
+        os.remove(undo)
+        self._sync_directory()
+
+    def _sync_directory(self) -> None:
+        """
+        Makes renames and removals in the directory of the file durable.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        directory = os.open(os.path.dirname(os.path.abspath(self._path)), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def _unmap(self) -> None:
+        """
+        Releases the table view, closes the mapping and closes the file,
+        if there is one.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        if self._mm != None:
+            self._slots.release()
+            self._mm.close()
+            self._mm = None
+            os.close(self._file)
+
+    def _grow_mapping(self, length: int) -> None:
+        """
+        Extends the file and maps it again, keeping uncommitted slots.
+
+        :param self:   the hash map being passed
+        :param length: the new length of the file in bytes
+
+        :return:       None
+        """
+        slots = self._slots
+        kept = [(bucket, slots[2 * bucket], slots[2 * bucket + 1])
+                for bucket in self._touched]
+        slots.release()
+        self._mm.close()
+        os.ftruncate(self._file, length)
+        self._mm = mmap.mmap(self._file, 0, access=mmap.ACCESS_COPY)
+        slots = memoryview(self._mm)[HEADER.size:self._heap_start()].cast('q')
+        # the new mapping only holds what the file holds
+        for bucket, hash, offset in kept:
+            slots[2 * bucket] = hash
+            slots[2 * bucket + 1] = offset
+        self._slots = slots
+
+    def _heap_start(self) -> int:
+        """
+        Returns the file offset just past the bucket table.
+
+        :param self: the hash map being passed
+
+        :return:     offset of the first heap byte
+        """
+        return HEADER.size + SLOT_WIDTH * self._capacity
+
+    def _write_header(self, flags: int) -> None:
+        """
+        Writes the current counts and the given flags into the file header.
+
+        :param self:  the hash map being passed
+        :param flags: the flags besides POWER_OF_TWO
+
+        :return:      None
+        """
+        if self._power_of_two:
+            flags |= POWER_OF_TWO
+        os.pwrite(self._file, HEADER.pack(MAGIC, VERSION, flags, self._check,
+                                          self._capacity, self._size,
+                                          self._tombstones, self._heap_end,
+                                          self._dead), 0)
+
+    def commit(self) -> None:
+        """
+        Makes every change so far durable.
+
+        The journal is synced before the header is marked DIRTY, the
+        slots are only written after that, and the journal is removed
+        once the header is clean again, so a crash at any point leaves
+        either the new commit or a DIRTY file that rolls back to the one
+        before.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        touched = self._touched
+        if not touched:
+            return
+        file, slots = self._file, self._slots
+        buckets = sorted(touched)
+        undo = self._path + UNDO
+        temporary = undo + '.tmp'
+        with open(temporary, 'wb') as journal:
+            journal.write(os.pread(file, HEADER.size, 0))
+            for bucket in buckets:
+                journal.write(UNDO_RECORD.pack(bucket, os.pread(
+                    file, SLOT_WIDTH, HEADER.size + SLOT_WIDTH * bucket)))
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temporary, undo)
+        self._sync_directory()
+        self._write_header(DIRTY)
+        os.fsync(file)
+        for bucket in buckets:
+            os.pwrite(file, SLOT.pack(slots[2 * bucket], slots[2 * bucket + 1]),
+                      HEADER.size + SLOT_WIDTH * bucket)
+        os.fsync(file)
+        self._write_header(0)
+        os.fsync(file)
+        touched.clear()
+        os.remove(undo)
+        self._sync_directory()
+
+    def close(self) -> None:
+        """
+        Commits the hash map and closes its file.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        if self._mm != None:
+            self.commit()
+            self._unmap()
+
+    @classmethod
+    def load(cls, fileobj, function, codec: snapshot.Codec = snapshot.PICKLE,
+             policy: LoadPolicy = None, path: str = None) -> "HashMap":
+        """
+        Reads a hash map written by dump into a new file at path.
+
+        Like hash_map_oa.HashMap.load, every entry goes back into the
+        bucket it was dumped from with its stored hash; the records are
+        appended to the heap of the new file as they are read, and the
+        map is committed once all of them are in.
+
+        :param cls:      the class of the dumped hash map
+        :param fileobj:  binary file object to read from
+        :param function: the hash function the dumped map was built with
+        :param codec:    the codec the values were dumped with
+        :param policy:   the load policy of the new map
+        :param path:     where to create the file of the new map
+
+        :return:         the loaded hash map; raises ValueError if the
+                         snapshot does not match cls, codec or function,
+                         and FileExistsError if path is already a map
+        """
+        if path == None:
+            raise TypeError("load needs the path of the file to create")
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            raise FileExistsError(path)
+        power_of_two, check, seed, capacity, size, count = \
+            snapshot.read_header(fileobj, cls, codec)
+        # checked before anything is written to path
+        snapshot.check_hash(check, _to_int64(
+            (finalized(function) if power_of_two else function)(snapshot.CHECK_KEY)))
+        hash_map = cls(path, function, capacity, power_of_two, policy)
+        try:
+            # the constructor rounds a capacity of 2 up to the next odd prime
+            if hash_map._capacity != capacity:
+                hash_map._rehash(capacity)
+            restore, restore_tombstone = hash_map._restore, hash_map._restore_tombstone
+            for bucket, hash, key, value in snapshot.read_records(fileobj, count, codec):
+                if value is snapshot.TOMBSTONE:
+                    restore_tombstone(bucket, hash)
+                else:
+                    restore(bucket, key, value, hash)
+            hash_map._size = size
+            hash_map._tombstones = count - size
+            hash_map.commit()
+        except BaseException:
+            hash_map._unmap()
+            os.remove(path)
+            raise
+        return hash_map
+
+    def _snapshot_records(self):
+        """
+        Generates the contents of every used bucket for dump.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (bucket, hash, key, value) tuples, with
+                     snapshot.TOMBSTONE as the value of a tombstone
+        """
+        slots = self._slots
+        for bucket in range(self._capacity):
+            offset = slots[2 * bucket + 1]
+            if offset < 0:
+                yield bucket, slots[2 * bucket], None, snapshot.TOMBSTONE
+            elif offset > 0:
+                yield bucket, slots[2 * bucket], self._key_at(bucket), self._value_at(bucket)
+
+    def _restore(self, bucket: int, key: str, value: object, hash: int) -> None:
+        """
+        Puts a live entry read by load into its bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param key:    the key of the entry
+        :param value:  the value of the entry
+        :param hash:   the stored hash of the entry
+
+        :return:       None
+        """
+        self._touched.add(bucket)
+        offset = self._append(key, value)
+        self._slots[2 * bucket] = hash
+        self._slots[2 * bucket + 1] = offset
+
+    def _restore_tombstone(self, bucket: int, hash: int) -> None:
+        """
+        Puts a tombstone read by load into its bucket.
+
+        A snapshot keeps no key for a tombstone, so it points at an
+        empty record, which is dead from the start.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param hash:   the stored hash of the removed entry
+
+        :return:       None
+        """
+        self._touched.add(bucket)
+        offset = self._append('', None)
+        self._dead += self._record_size(offset)
+        self._slots[2 * bucket] = hash
+        self._slots[2 * bucket + 1] = -offset
+
+    # ------------------------------------------------------------------ #
+
+    def _hash_key(self, key: str) -> int:
+        """
+        Returns the hash of a key folded into the range of a slot.
+
+        :param self: the hash map being passed
+        :param key:  the key to hash
+
+        :return:     the signed 64-bit hash of the key
+        """
+        return _to_int64(self._hash_function(key))
+
+    def _record(self, offset: int) -> tuple[int, int]:
+        """
+        Reads the key and value lengths of a record.
+
+        :param self:   the hash map being passed
+        :param offset: the file offset of the record
+
+        :return:       length of the key and length of the value in bytes
+        """
+        return RECORD.unpack_from(self._mm, offset)
+
+    def _append(self, key: str, value: object) -> int:
+        """
+        Writes a record to the end of the heap, growing the file if needed.
+
+        :param self:  the hash map being passed
+        :param key:   the key to write
+        :param value: the value to write
+
+        :return:      the file offset of the record
+        """
+        encoded = key.encode()
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        record = RECORD.pack(len(encoded), len(pickled)) + encoded + pickled
+        offset = self._heap_end
+        end = offset + len(record)
+        if end > len(self._mm):
+            self._grow_mapping(max(end, 2 * len(self._mm)))
+        # past the committed heap, so the record may go to the file at once;
+        # the mapping gets it too, as its copy of the page may be private
+        os.pwrite(self._file, record, offset)
+        self._mm[offset:end] = record
+        self._heap_end = end
+        return offset
+
+    def _find_bucket(self, key: str, hash: int) -> tuple[int, int]:
+        """
+        Quadratically probes for a key; see hash_map_oa.HashMap._find_bucket.
+
+        A key is only read from the heap when the stored hash matches.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the signed 64-bit hash of the key
+
+        :return:     index of the key's bucket (-1 if absent) and index
+                     of the first empty or tombstone bucket on the probe
+                     sequence (-1 if none was seen)
+        """
+        capacity = self._capacity
+        mask = self._mask
+        slots, mm = self._slots, self._mm
+        encoded = key.encode()
+        length = len(encoded)
+        initialBucket = hash & mask if mask else hash % capacity
+        bucket = initialBucket
+        available = -1
+        for probe in range(1, capacity + 1 if mask else capacity // 2 + 2):
+            offset = slots[2 * bucket + 1]
+            # a never used bucket ends the probe sequence
+            if offset == 0:
+                if available == -1:
+                    available = bucket
+                return -1, available
+            # remember the first tombstone so put can reuse it
+            if offset < 0:
+                if available == -1:
+                    available = bucket
+            elif slots[2 * bucket] == hash:
+                start = offset + RECORD.size
+                if (RECORD.unpack_from(mm, offset)[0] == length
+                        and mm[start:start + length] == encoded):
+                    return bucket, available
+            if mask:
+                bucket = (bucket + probe) & mask
+            else:
+                bucket = (initialBucket + probe * probe) % capacity
+        return -1, available
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:  the hash map being passed
+        :param key:   the key to add
+        :param value: the value that should be added to the hash map
+        :param hash:  the signed 64-bit hash of the key
+
+        :return:      None
+        """
+        bucket, available = self._find_bucket(key, hash)
+        # replaces existing value if the key is already in the hash map
+        if bucket != -1:
+            self._touched.add(bucket)
+            self._dead += self._record_size(self._slots[2 * bucket + 1])
+            offset = self._append(key, value)
+            self._slots[2 * bucket + 1] = offset
+            return
+        # grow until the probe sequence reaches a free bucket
+        while available == -1:
+            self.resize_table(self._policy.grown(self._capacity))
+            bucket, available = self._find_bucket(key, hash)
+        self._touched.add(available)
+        offset = self._append(key, value)
+        slots = self._slots
+        if slots[2 * available + 1] < 0:
+            self._tombstones -= 1
+        slots[2 * available] = hash
+        slots[2 * available + 1] = offset
+        self._size += 1
+        self._modifications += 1
+
+    def _record_size(self, offset: int) -> int:
+        """
+        Returns the number of heap bytes a record takes up.
+
+        :param self:   the hash map being passed
+        :param offset: the file offset of the record
+
+        :return:       size of the record in bytes
+        """
+        key_length, value_length = self._record(offset)
+        return RECORD.size + key_length + value_length
+
+    def _key_at(self, bucket: int) -> str:
+        """
+        Returns the key of a live or tombstone bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the key held in the bucket
+        """
+        offset = abs(self._slots[2 * bucket + 1])
+        start = offset + RECORD.size
+        return self._mm[start:start + self._record(offset)[0]].decode()
+
+    def _value_at(self, bucket: int) -> object:
+        """
+        Returns a copy of the value stored in a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the value held in the bucket
+        """
+        offset = self._slots[2 * bucket + 1]
+        key_length, value_length = self._record(offset)
+        start = offset + RECORD.size + key_length
+        return pickle.loads(self._mm[start:start + value_length])
+
+    def _entry(self, bucket: int) -> HashEntry:
+        """
+        Builds a HashEntry describing a bucket, or None if it is empty.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       entry holding the bucket's contents
+        """
+        offset = self._slots[2 * bucket + 1]
+        if offset == 0:
+            return None
+        if offset < 0:
+            entry = HashEntry(self._key_at(bucket), None, self._slots[2 * bucket])
+            entry.is_tombstone = True
+            return entry
+        return self._entry_at(bucket)
+
+    def _entry_at(self, bucket: int) -> HashEntry:
+        """
+        Builds a HashEntry describing a live bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       entry holding the bucket's contents
+        """
+        return HashEntry(self._key_at(bucket), self._value_at(bucket),
+                         self._slots[2 * bucket])
+
+    def _remove_at(self, bucket: int) -> None:
+        """
+        Turns a live bucket into a tombstone.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       None
+        """
+        self._touched.add(bucket)
+        offset = self._slots[2 * bucket + 1]
+        # the negated offset still finds the key for __str__
+        self._slots[2 * bucket + 1] = -offset
+        self._dead += self._record_size(offset)
+        self._size -= 1
+        self._tombstones += 1
+        self._modifications += 1
+        self._check_shrink()
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Writes every live entry into a new file of the given capacity and
+        swaps it in for the current one.
+
+        Records are copied as bytes, so no key is hashed again and no
+        value is unpickled, and each is written to the new file as soon
+        as it is placed; only the table is built in memory. Dead records
+        and tombstones are dropped.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        mask = new_capacity - 1 if self._power_of_two else 0
+        slots = array('q', bytes(SLOT_WIDTH * new_capacity))
+        heap_start = HEADER.size + SLOT_WIDTH * new_capacity
+        heap_end = heap_start
+        size = 0
+        # written beside the old file, then swapped in by a single rename
+        temporary = self._path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.seek(heap_start)
+            if self._mm != None:
+                old_slots, mm = self._slots, self._mm
+                for i in range(self._capacity):
+                    offset = old_slots[2 * i + 1]
+                    if offset <= 0:
+                        continue
+                    hash = old_slots[2 * i]
+                    initialBucket = hash & mask if mask else hash % new_capacity
+                    bucket = initialBucket
+                    probe = 0
+                    # keys are already unique, so only an empty bucket has to be found
+                    while slots[2 * bucket + 1] != 0:
+                        probe += 1
+                        if mask:
+                            bucket = (bucket + probe) & mask
+                        else:
+                            bucket = (initialBucket + probe * probe) % new_capacity
+                    slots[2 * bucket] = hash
+                    slots[2 * bucket + 1] = heap_end
+                    length = self._record_size(offset)
+                    file.write(mm[offset:offset + length])
+                    heap_end += length
+                    size += 1
+            flags = POWER_OF_TWO if self._power_of_two else 0
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, flags, self._check,
+                                   new_capacity, size, 0, heap_end, 0))
+            file.write(slots)
+            file.flush()
+            os.fsync(file.fileno())
+        self._unmap()
+        os.replace(temporary, self._path)
+        self._sync_directory()
+        self._map()
+
+    def clear(self) -> None:
+        """
+        Empties the hash map, replacing its file with an empty one.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        self._unmap()
+        self._rehash(self._capacity)
+
+    def compact(self) -> None:
+        """
+        Rewrites the file to drop every tombstone and dead record.
+
+        The capacity is kept, so this shortens probe sequences that run
+        through removed entries and gives back the heap space of removed
+        and overwritten values.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        if self._tombstones > 0 or self._dead > 0:
+            self._rehash(self._capacity)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the amount of empty buckets.
+
+        :param self: the hash map being passed
+
+        :return:     amount of empty buckets
+        """
+        return self._capacity - self._size
+
+    def _next_live(self, bucket: int) -> int:
+        """
+        Finds the first live bucket at or after the given index.
+
+        :param self:   the hash map being passed
+        :param bucket: the index to start looking from
+
+        :return:       index of the live bucket, or the capacity if none
+        """
+        slots = self._slots
+        while bucket < self._capacity:
+            if slots[2 * bucket + 1] > 0:
+                return bucket
+            bucket += 1
+        return bucket
+
+    def dead_bytes(self) -> int:
+        """
+        Returns the heap bytes held by removed and overwritten records.
+
+        :param self: the hash map being passed
+
+        :return:     bytes compact() would give back
+        """
+        return self._dead
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import io
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'example.map')
+
+    print("\nMemory mapped - put / get / remove")
+    print("----------------------------------")
+    m = HashMap(path, hash_function_1, 53)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get('str1'), m.get('str2'), m.contains_key('str3'))
+
+    print("\nMemory mapped - reopen after commit")
+    print("-----------------------------------")
+    m.put('list', [1, 2, 3])
+    m.commit()
+    m.close()
+    with HashMap(path, hash_function_1) as m:
+        print(m.get_size(), m.get_capacity(), m.get('str1'), m.get('list'))
+        m.put('str1', 'changed')
+    with HashMap(path, hash_function_1) as m:
+        print(m.get('str1'), m.dead_bytes() > 0)
+        m.compact()
+        print(m.dead_bytes(), m.tombstone_load())
+
+    print("\nMemory mapped - wrong hash function")
+    print("-----------------------------------")
+    try:
+        HashMap(path, hash_function_2)
+    except ValueError as error:
+        print(type(error).__name__)
+
+    print("\nMemory mapped - dump and load")
+    print("-----------------------------")
+    copy = os.path.join(directory, 'copy.map')
+    with HashMap(path, hash_function_1) as m:
+        buffer = io.BytesIO()
+        m.dump(buffer)
+    buffer.seek(0)
+    with HashMap.load(buffer, hash_function_1, path=copy) as m:
+        print(m.get_size(), m.get_capacity(), m.get('str1'), m.get('list'))
+
+    os.remove(path)
+    os.remove(copy)
+    os.rmdir(directory)
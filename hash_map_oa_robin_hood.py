@@ -0,0 +1,266 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Open addressing hash map that uses Robin Hood linear probing
+#              with backward shift deletion. Keys stay close to their home
+#              bucket and removals leave no tombstones, so the table can
+#              safely run at a load of 0.9 instead of 0.5.
+
+import hash_map_oa_flat
+from a6_include import hash_function_1, hash_function_2
+from hash_functions import finalized
+from hash_map_oa_flat import EMPTY, LIVE
+from load_policy import LoadPolicy
+
+
+class HashMap(hash_map_oa_flat.HashMap):
+    """
+    Robin Hood hash map with struct of arrays storage.
+
+    Buckets are probed linearly from a key's home bucket. The distance
+    of an entry is how far it sits past its home bucket, worked out from
+    its stored hash. An insert that meets an entry closer to home than
+    itself takes that bucket and carries the displaced entry onward.
+    This keeps the distances of all entries about equal, and a lookup
+    can stop as soon as it meets an entry closer to home than the key
+    would be.
+
+    Every hash is passed through mix64 before its home bucket is taken,
+    whatever the capacity, as linear probing has no quadratic jumps to
+    break up the runs that weak hash functions produce.
+
+    A removal moves the following entries back by one bucket until it
+    reaches an empty bucket or an entry already at home, so no
+    tombstones are ever written and tombstone_load() is always 0.
+    """
+
+    def __init__(self, capacity: int, function,
+                 power_of_two: bool = False,
+                 policy: LoadPolicy = None) -> None:
+        """
+        Initialize new HashMap that uses
+        Robin Hood linear probing for collision resolution
+
+        The default policy grows at load 0.9 and never shrinks.
+        """
+        super().__init__(capacity, function, power_of_two,
+                         LoadPolicy(0.9) if policy == None else policy)
+        # linear probing turns the runs of raw hashes from weak functions
+        # into long clusters, so hashes are scrambled for prime tables too
+        self._hash_function = finalized(function)
+
+    def _home_of(self, hash: int) -> int:
+        """
+        Reduces a hash to the index of its home bucket.
+
+        :param self: the hash map being passed
+        :param hash: the full hash of a key
+
+        :return:     index of the home bucket
+        """
+        return hash & self._mask if self._mask else hash % self._capacity
+
+    def _find_bucket(self, key: str, hash: int) -> tuple[int, int]:
+        """
+        Linearly probes for a key, stopping early when it cannot be there.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the full hash of the key
+
+        :return:     index of the key's bucket (-1 if absent) and, when the
+                     key is absent, the bucket it would be inserted into
+        """
+        capacity = self._capacity
+        states, hashes, keys = self._states, self._hashes, self._keys
+        bucket = self._home_of(hash)
+        distance = 0
+        while states[bucket] == LIVE:
+            stored = hashes[bucket]
+            if stored == hash and keys[bucket] == key:
+                return bucket, -1
+            # an entry closer to home would have been passed by the key
+            if (bucket - stored) % capacity < distance:
+                return -1, bucket
+            distance += 1
+            bucket += 1
+            if bucket == capacity:
+                bucket = 0
+        return -1, bucket
+
+    def _find_buckets(self, keys):
+        """
+        Yields the bucket of every key; see hash_map_oa.HashMap._find_buckets.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        if type(self)._find_bucket is HashMap._find_bucket:
+            return self._probe_buckets(keys)
+        return super()._find_buckets(keys)
+
+    def _probe_buckets(self, keys):
+        """
+        Yields the bucket of every key, probing linearly inline.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        hash_key = self._hash_key
+        capacity, mask = self._capacity, self._mask
+        states, hashes, stored = self._states, self._hashes, self._keys
+        for key in keys:
+            hash = hash_key(key)
+            bucket = hash & mask if mask else hash % capacity
+            distance = 0
+            found = -1
+            while states[bucket] == LIVE:
+                home = hashes[bucket]
+                if home == hash and stored[bucket] == key:
+                    found = bucket
+                    break
+                # an entry closer to home would have been passed by the key
+                if (bucket - home) % capacity < distance:
+                    break
+                distance += 1
+                bucket += 1
+                if bucket == capacity:
+                    bucket = 0
+            yield found
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:  the hash map being passed
+        :param key:   the key to add
+        :param value: the value that should be added to the hash map
+        :param hash:  the signed 64-bit hash of the key
+
+        :return:      None
+        """
+        # a full table has no bucket to end the displacement in
+        if self._size >= self._capacity:
+            self.resize_table(self._policy.grown(self._capacity))
+        bucket, available = self._find_bucket(key, hash)
+        # replaces existing value if the key is already in the hash map
+        if bucket != -1:
+            self._values[bucket] = value
+            return
+        self._displace(available, key, value, hash)
+        self._size += 1
+        self._modifications += 1
+
+    def _displace(self, bucket: int, key: str, value: object, hash: int) -> None:
+        """
+        Stores an absent key at a bucket, pushing later entries onward.
+
+        Every entry the carried entry is further from home than swaps
+        places with it, until the carried entry reaches an empty bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the first bucket the key may take
+        :param key:    the key to store
+        :param value:  the value to store
+        :param hash:   the full hash of the key
+
+        :return:       None
+        """
+        capacity = self._capacity
+        states, hashes = self._states, self._hashes
+        keys, values = self._keys, self._values
+        distance = (bucket - self._home_of(hash)) % capacity
+        while states[bucket] == LIVE:
+            stored = hashes[bucket]
+            stored_distance = (bucket - stored) % capacity
+            if stored_distance < distance:
+                # the richer entry gives its bucket to the poorer one
+                hashes[bucket], hash = hash, stored
+                keys[bucket], key = key, keys[bucket]
+                values[bucket], value = value, values[bucket]
+                distance = stored_distance
+            distance += 1
+            bucket += 1
+            if bucket == capacity:
+                bucket = 0
+        self._store(bucket, key, value, hash)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every live entry into new arrays of the given capacity.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new arrays
+
+        :return:             None
+        """
+        old_states, old_hashes = self._states, self._hashes
+        old_keys, old_values = self._keys, self._values
+        self._capacity = new_capacity
+        self.clear()
+        home_of, displace = self._home_of, self._displace
+        # keys are already unique, so no lookup is needed
+        for i in range(len(old_states)):
+            if old_states[i] == LIVE:
+                hash = old_hashes[i]
+                displace(home_of(hash), old_keys[i], old_values[i], hash)
+                self._size += 1
+
+    def _remove_at(self, bucket: int) -> None:
+        """
+        Empties a live bucket and shifts the entries after it back by one.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       None
+        """
+        capacity = self._capacity
+        states, hashes = self._states, self._hashes
+        keys, values = self._keys, self._values
+        following = bucket + 1 if bucket + 1 < capacity else 0
+        # stop at an empty bucket or at an entry already in its home bucket
+        while (states[following] == LIVE
+               and (following - hashes[following]) % capacity != 0):
+            hashes[bucket] = hashes[following]
+            keys[bucket] = keys[following]
+            values[bucket] = values[following]
+            bucket = following
+            following = bucket + 1 if bucket + 1 < capacity else 0
+        states[bucket] = EMPTY
+        keys[bucket] = None
+        values[bucket] = None
+        self._size -= 1
+        self._modifications += 1
+        self._check_shrink()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nRobin Hood - put / get / remove")
+    print("-------------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get('str1'), m.get('str2'), m.contains_key('str3'),
+          m.tombstone_load())
+
+    print("\nRobin Hood - iteration")
+    print("----------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
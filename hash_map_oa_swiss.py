@@ -0,0 +1,395 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Open addressing hash map modeled on SwissTable. Every bucket
+#              has one control byte holding 7 bits of its key's hash, and
+#              buckets are probed a group of 16 at a time: the control
+#              bytes of a group are searched for the key's tag in C, so a
+#              full key comparison only happens for buckets whose tag
+#              already matches.
+
+import re
+from array import array
+
+import hash_map_oa_flat
+import snapshot
+from a6_include import HashEntry, hash_function_1, hash_function_2
+from hash_functions import MASK_64, PRIME_1
+from load_policy import LoadPolicy
+
+# buckets probed together; the capacity is always a multiple of this
+GROUP_WIDTH = 16
+
+# control bytes of buckets without a key; full buckets hold 0 .. 0x7F
+EMPTY = 0x80
+DELETED = 0xFE
+
+# matches the control byte of a full bucket
+_FULL = re.compile(b'[\x00-\x7f]')
+
+# matches the control byte of a full or deleted bucket
+_USED = re.compile(b'[\x00-\x7f\xfe]')
+
+
+class HashMap(hash_map_oa_flat.HashMap):
+    """
+    SwissTable style hash map with struct of arrays storage.
+
+    Hashes are multiplied by an odd 64-bit constant, which carries every
+    input bit into the top bits (Fibonacci hashing). _control[i] is
+    EMPTY, DELETED or, for a full bucket, the top 7 bits of the hash
+    (the tag). The bits just below the tag pick a group of GROUP_WIDTH
+    buckets, and groups are probed in triangular order. In
+    each group, bytearray.find looks for the tag and the stored hash
+    and key are only compared at the buckets it returns. A probe ends at
+    the first group that still has an EMPTY bucket.
+
+    A removal writes EMPTY when the bucket's group already has an empty
+    bucket, since no probe can have passed through that group, and a
+    DELETED tombstone otherwise.
+
+    The capacity is always a power of two and at least GROUP_WIDTH. The
+    multiplication replaces the mix64 finalizer other power of two maps
+    use, which costs more than the rest of a lookup.
+    """
+
+    def __init__(self, capacity: int, function,
+                 policy: LoadPolicy = None) -> None:
+        """
+        Initialize new HashMap that uses
+        SwissTable group probing for collision resolution
+
+        The default policy grows at load 0.875 and never shrinks.
+        """
+        super().__init__(max(capacity, GROUP_WIDTH), function, True,
+                         LoadPolicy(0.875) if policy == None else policy)
+        # _hash_key scrambles the hash itself, so skip the finalizer
+        self._hash_function = function
+
+    @classmethod
+    def _for_snapshot(cls, capacity: int, function, power_of_two: bool,
+                      policy: LoadPolicy, seed: int) -> "HashMap":
+        """
+        Creates an empty hash map of exactly the given capacity for load.
+
+        :param cls:          the class of the hash map
+        :param capacity:     the capacity of the dumped map
+        :param function:     the hash function of the dumped map
+        :param power_of_two: always True for this map
+        :param policy:       the load policy of the new map
+        :param seed:         unused, this map has no seed
+
+        :return:             the empty hash map
+        """
+        return cls(capacity, function, policy)
+
+    def _hash_key(self, key: str) -> int:
+        """
+        Returns the hash of a key multiplied by an odd 64-bit constant.
+
+        :param self: the hash map being passed
+        :param key:  the key to hash
+
+        :return:     the unsigned 64-bit hash of the key
+        """
+        return (self._hash_function(key) * PRIME_1) & MASK_64
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Rounds a capacity up to a power of two of at least one group.
+
+        :param self:     the hash map being passed
+        :param capacity: the requested capacity
+
+        :return:         the capacity to use
+        """
+        return self._next_power_of_two(max(capacity, GROUP_WIDTH))
+
+    def _entry(self, bucket: int) -> HashEntry:
+        """
+        Builds a HashEntry describing a bucket, or None if it is empty.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       entry holding the bucket's contents
+        """
+        control = self._control[bucket]
+        if control == EMPTY:
+            return None
+        entry = HashEntry(self._keys[bucket], self._values[bucket],
+                          self._hashes[bucket])
+        entry.is_tombstone = control == DELETED
+        return entry
+
+    def _find_bucket(self, key: str, hash: int) -> tuple[int, int]:
+        """
+        Probes group by group for a key, shared by every lookup method.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the unsigned 64-bit hash of the key
+
+        :return:     index of the key's bucket (-1 if absent) and index
+                     of the first empty or deleted bucket on the probe
+                     sequence (-1 if none was seen)
+        """
+        control, hashes, keys = self._control, self._hashes, self._keys
+        group_mask = self._group_mask
+        tombstones = self._tombstones
+        tag = hash >> 57
+        group = (hash >> self._group_shift) & group_mask
+        available = -1
+        for probe in range(1, group_mask + 2):
+            start = group * GROUP_WIDTH
+            end = start + GROUP_WIDTH
+            # only buckets whose tag matches can hold the key
+            bucket = control.find(tag, start, end)
+            while bucket != -1:
+                if hashes[bucket] == hash and keys[bucket] == key:
+                    return bucket, available
+                bucket = control.find(tag, bucket + 1, end)
+            empty = control.find(EMPTY, start, end)
+            # remember the first tombstone so put can reuse it
+            if available == -1 and tombstones:
+                deleted = control.find(DELETED, start, end)
+                if deleted != -1 and (empty == -1 or deleted < empty):
+                    available = deleted
+            # a group with an empty bucket ends the probe sequence
+            if empty != -1:
+                return -1, empty if available == -1 else available
+            group = (group + probe) & group_mask
+        return -1, available
+
+    def _find_buckets(self, keys):
+        """
+        Yields the bucket of every key; see hash_map_oa.HashMap._find_buckets.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        if type(self)._find_bucket is HashMap._find_bucket:
+            return self._probe_buckets(keys)
+        return super()._find_buckets(keys)
+
+    def _probe_buckets(self, keys):
+        """
+        Yields the bucket of every key, probing group by group inline.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing key
+        """
+        hash_key = self._hash_key
+        control, hashes, stored = self._control, self._hashes, self._keys
+        group_mask, group_shift = self._group_mask, self._group_shift
+        for key in keys:
+            hash = hash_key(key)
+            tag = hash >> 57
+            group = (hash >> group_shift) & group_mask
+            found = -1
+            for probe in range(1, group_mask + 2):
+                start = group * GROUP_WIDTH
+                end = start + GROUP_WIDTH
+                # only buckets whose tag matches can hold the key
+                bucket = control.find(tag, start, end)
+                while bucket != -1:
+                    if hashes[bucket] == hash and stored[bucket] == key:
+                        found = bucket
+                        break
+                    bucket = control.find(tag, bucket + 1, end)
+                # a group with an empty bucket ends the probe sequence
+                if found != -1 or control.find(EMPTY, start, end) != -1:
+                    break
+                group = (group + probe) & group_mask
+            yield found
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:  the hash map being passed
+        :param key:   the key to add
+        :param value: the value that should be added to the hash map
+        :param hash:  the unsigned 64-bit hash of the key
+
+        :return:      None
+        """
+        bucket, available = self._find_bucket(key, hash)
+        # replaces existing value if the key is already in the hash map
+        if bucket != -1:
+            self._values[bucket] = value
+            return
+        # grow until the probe sequence reaches a free bucket
+        while available == -1:
+            self.resize_table(self._policy.grown(self._capacity))
+            bucket, available = self._find_bucket(key, hash)
+        if self._control[available] == DELETED:
+            self._tombstones -= 1
+        self._store(available, key, value, hash)
+        self._size += 1
+        self._modifications += 1
+
+    def _snapshot_records(self):
+        """
+        Generates the contents of every full and deleted bucket for dump.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (bucket, hash, key, value) tuples, with
+                     snapshot.TOMBSTONE as the value of a deleted bucket
+        """
+        control, hashes = self._control, self._hashes
+        keys, values = self._keys, self._values
+        for match in _USED.finditer(control):
+            bucket = match.start()
+            if control[bucket] == DELETED:
+                yield bucket, hashes[bucket], None, snapshot.TOMBSTONE
+            else:
+                yield bucket, hashes[bucket], keys[bucket], values[bucket]
+
+    def _restore_tombstone(self, bucket: int, hash: int) -> None:
+        """
+        Puts a deleted bucket read by load into the table.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param hash:   the stored hash of the removed entry
+
+        :return:       None
+        """
+        self._control[bucket] = DELETED
+        self._hashes[bucket] = hash
+
+    def _store(self, bucket: int, key: str, value: object, hash: int) -> None:
+        """
+        Writes a full entry into every array for the given bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param key:    the key to store
+        :param value:  the value to store
+        :param hash:   the full hash of the key
+
+        :return:       None
+        """
+        self._control[bucket] = hash >> 57
+        self._hashes[bucket] = hash
+        self._keys[bucket] = key
+        self._values[bucket] = value
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every full entry into new arrays of the given capacity.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new arrays
+
+        :return:             None
+        """
+        old_control, old_hashes = self._control, self._hashes
+        old_keys, old_values = self._keys, self._values
+        self._capacity = new_capacity
+        self.clear()
+        control = self._control
+        group_mask, group_shift = self._group_mask, self._group_shift
+        # keys are already unique, so only an empty bucket has to be found
+        for match in _FULL.finditer(old_control):
+            i = match.start()
+            hash = old_hashes[i]
+            group = (hash >> group_shift) & group_mask
+            probe = 0
+            while True:
+                start = group * GROUP_WIDTH
+                bucket = control.find(EMPTY, start, start + GROUP_WIDTH)
+                if bucket != -1:
+                    break
+                probe += 1
+                group = (group + probe) & group_mask
+            self._store(bucket, old_keys[i], old_values[i], hash)
+            self._size += 1
+
+    def _remove_at(self, bucket: int) -> None:
+        """
+        Empties a full bucket, leaving a tombstone only where needed.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       None
+        """
+        control = self._control
+        start = bucket - bucket % GROUP_WIDTH
+        # probes only pass through groups without an empty bucket
+        if control.find(EMPTY, start, start + GROUP_WIDTH) != -1:
+            control[bucket] = EMPTY
+        else:
+            control[bucket] = DELETED
+            self._tombstones += 1
+        # drop the references so the key and value can be freed
+        self._keys[bucket] = None
+        self._values[bucket] = None
+        self._size -= 1
+        self._modifications += 1
+        self._check_shrink()
+
+    def clear(self) -> None:
+        """
+        Empties the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        capacity = self._capacity
+        self._control = bytearray([EMPTY]) * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._size = 0
+        self._tombstones = 0
+        self._mask = capacity - 1
+        self._group_mask = capacity // GROUP_WIDTH - 1
+        # the group index is taken from the bits just below the tag
+        self._group_shift = 57 - self._group_mask.bit_length()
+        self._modifications += 1
+
+    def _next_live(self, bucket: int) -> int:
+        """
+        Finds the first full bucket at or after the given index.
+
+        :param self:   the hash map being passed
+        :param bucket: the index to start looking from
+
+        :return:       index of the full bucket, or the capacity if none
+        """
+        found = _FULL.search(self._control, bucket)
+        return self._capacity if found == None else found.start()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nSwiss table - put / get / remove")
+    print("--------------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    for i in range(0, 150, 2):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get('str1'), m.get('str2'), m.contains_key('str3'))
+
+    print("\nSwiss table - iteration")
+    print("-----------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
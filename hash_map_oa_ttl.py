@@ -0,0 +1,566 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Open addressing hash map whose keys can expire. put takes a
+#              time to live, an expired key is absent to every lookup and
+#              becomes a tombstone as soon as one finds it, and a min-heap
+#              of expiry times lets every put reap a small, bounded batch
+#              of the keys that expired without being looked up.
+
+import heapq
+import math
+import struct
+import time
+from itertools import count
+
+import hash_map_oa
+import snapshot
+from a6_include import HashEntry, hash_function_1, hash_function_2
+from load_policy import LoadPolicy
+
+# most expired entries one put tombstones, so expiry never stalls a put
+REAP_BATCH = 16
+
+# the heap is rebuilt without stale expiry times once it holds more than
+# this many per live entry
+HEAP_SLACK = 2
+
+# seconds a dumped key had left to live, NaN if it never expires; written
+# in front of the encoded value
+REMAINING = struct.Struct('<d')
+
+
+class ExpiringEntry(HashEntry):
+    """
+    Hash entry with the clock time it expires at, or None if it never does.
+    """
+
+    __slots__ = ('expires',)
+
+    def __init__(self, key: str, value: object, hash: int,
+                 expires: float = None) -> None:
+        """Initialize an entry that expires at the given clock time."""
+        super().__init__(key, value, hash)
+        self.expires = expires
+
+
+class HashMap(hash_map_oa.HashMap):
+    """
+    Open addressing hash map with a time to live per key.
+
+    A key put with a ttl expires ttl seconds of clock time later; without
+    one it falls back to default_ttl, and a default_ttl of None never
+    expires. Putting a key again sets its expiry anew.
+
+    Expiry is lazy: get, contains_key and every other lookup treat an
+    expired key as absent and turn it into a tombstone on the spot, and
+    iteration skips expired keys without changing the table. Keys that
+    are never looked up again are reaped by put, which takes at most
+    REAP_BATCH of the earliest expiry times off a min-heap, so the work
+    is spread over the puts instead of landing on one of them. Until an
+    expired key is reaped it still counts towards get_size() and
+    table_load().
+
+    Neither lookups nor put shrink or compact the table after expiring
+    keys, as that rebuild would land on a single call. reap() clears out
+    every expired key at once and then shrinks or compacts the table
+    like remove() does, and compact() drops the tombstones, for callers
+    that run them on their own schedule, for example once
+    tombstone_load() grows.
+
+    A snapshot records the seconds every key has left to live rather
+    than its expiry time, so load restarts the countdown on the clock of
+    the loaded map. Keys that had expired but were not reaped yet are
+    dumped with no time left and expire as soon as the map is loaded.
+    """
+
+    def __init__(self, capacity: int, function,
+                 power_of_two: bool = False,
+                 policy: LoadPolicy = None,
+                 default_ttl: float = None,
+                 clock: callable = time.monotonic) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+        and expires keys by the seconds of clock
+        """
+        if default_ttl != None and default_ttl < 0:
+            raise ValueError("default_ttl must not be negative")
+        self._default_ttl = default_ttl
+        self._clock = clock
+        self._rehashing = False
+        # heap of (expiry time, insertion number, entry); the number keeps
+        # equal times from comparing entries
+        self._expiries = []
+        self._pushes = count()
+        super().__init__(capacity, function, power_of_two, policy)
+
+    def clear(self) -> None:
+        """
+        Empties the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        super().clear()
+        # _rehash empties the table with clear() as well, but keeps every entry
+        if not self._rehashing:
+            self._expiries = []
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every live entry into a new table, keeping their expiry times.
+
+        Entries that have expired are dropped like tombstones, so one
+        rebuild reaps every expired key instead of copying them only for
+        the reaper to tombstone them again.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        expiries = self._expiries
+        now = self._clock()
+        if expiries and expiries[0][0] <= now:
+            buckets = self._buckets
+            for i in range(self._capacity):
+                entry = buckets[i]
+                if (entry != None and entry.expires != None
+                        and entry.expires <= now):
+                    entry.is_tombstone = True
+        self._rehashing = True
+        super()._rehash(new_capacity)
+        self._rehashing = False
+
+    # ------------------------------------------------------------------ #
+
+    def _expires_at(self, ttl: float) -> float:
+        """
+        Returns the clock time a key put now with a time to live expires at.
+
+        :param self: the hash map being passed
+        :param ttl:  seconds the key lives, or None for default_ttl
+
+        :return:     the expiry time, or None if the key never expires
+        """
+        if ttl == None:
+            ttl = self._default_ttl
+            if ttl == None:
+                return None
+        elif ttl < 0:
+            raise ValueError("ttl must not be negative")
+        return self._clock() + ttl
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        Adds an element to the hash map, then reaps a batch of expired keys.
+
+        :param self:  the hash map being passed
+        :param key:   the key that determines the initial bucket
+        :param value: the value that should be added to the hash map
+        :param ttl:   seconds until the key expires, or None for default_ttl
+
+        :return:      None
+        """
+        expires = self._expires_at(ttl)
+        # resizes the hash map if necessary
+        policy = self._policy
+        if policy.should_grow(self._size, self._capacity):
+            self.resize_table(policy.grown(self._capacity))
+        self._put_hashed(key, value, self._hash_key(key), expires)
+        self._reap_due()
+
+    def put_many(self, pairs, ttl: float = None) -> None:
+        """
+        Adds every key/value pair from an iterable to the hash map, all
+        with the same time to live, then reaps a batch of expired keys.
+
+        :param self:  the hash map being passed
+        :param pairs: iterable of (key, value) tuples
+        :param ttl:   seconds until the keys expire, or None for default_ttl
+
+        :return:      None
+        """
+        expires = self._expires_at(ttl)
+        pairs = list(pairs)
+        hash_key = self._hash_key
+        hashes = [hash_key(key) for key, _ in pairs]
+        self._reserve(self._size + len(pairs))
+        put_hashed = self._put_hashed
+        for (key, value), hash in zip(pairs, hashes):
+            put_hashed(key, value, hash, expires)
+        self._reap_due()
+
+    def _put_hashed(self, key: str, value: object, hash: int,
+                    expires: float = None) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:    the hash map being passed
+        :param key:     the key to add
+        :param value:   the value that should be added to the hash map
+        :param hash:    the full hash of the key
+        :param expires: the clock time the key expires at, or None
+
+        :return:        None
+        """
+        bucket, available = self._find_bucket(key, hash)
+        # replaces existing value and expiry if the key is already present
+        if bucket != -1:
+            entry = self._buckets[bucket]
+            entry.value = value
+        else:
+            # grow until the probe sequence reaches a free bucket
+            while available == -1:
+                self.resize_table(self._policy.grown(self._capacity))
+                bucket, available = self._find_bucket(key, hash)
+            # inserts new hash entry into the first empty or tombstone bucket
+            if self._buckets[available] != None:
+                self._tombstones -= 1
+            entry = ExpiringEntry(key, value, hash)
+            self._buckets[available] = entry
+            self._size += 1
+            self._modifications += 1
+        entry.expires = expires
+        if expires != None:
+            self._schedule(entry)
+
+    def _schedule(self, entry: ExpiringEntry) -> None:
+        """
+        Pushes the expiry time of an entry onto the heap.
+
+        Times an entry no longer has stay on the heap and are skipped when
+        popped; the heap is rebuilt without them once they pile up.
+
+        :param self:  the hash map being passed
+        :param entry: the entry with its new expiry time
+
+        :return:      None
+        """
+        expiries = self._expiries
+        heapq.heappush(expiries, (entry.expires, next(self._pushes), entry))
+        if len(expiries) > HEAP_SLACK * self._size + REAP_BATCH:
+            expiries[:] = [item for item in expiries
+                           if item[0] == item[2].expires
+                           and not item[2].is_tombstone]
+            heapq.heapify(expiries)
+
+    def _find_bucket(self, key: str, hash: int) -> tuple[int, int]:
+        """
+        Probes for a key, turning it into a tombstone if it has expired.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the full hash of the key
+
+        :return:     index of the key's bucket (-1 if absent or expired)
+                     and index of the first empty or tombstone bucket on
+                     the probe sequence (-1 if none was seen)
+        """
+        bucket, available = super()._find_bucket(key, hash)
+        if bucket != -1:
+            expires = self._buckets[bucket].expires
+            if expires != None and expires <= self._clock():
+                self._expire(bucket)
+                # keys are unique, so the new tombstone ends the search
+                return -1, bucket if available == -1 else available
+        return bucket, available
+
+    def _find_buckets(self, keys):
+        """
+        Yields the bucket of every key, turning expired keys into tombstones.
+
+        The clock is read once, so a key counts as expired if it had
+        expired when the batch started.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of bucket indices, -1 for every missing or
+                     expired key
+        """
+        buckets, expire = self._buckets, self._expire
+        now = self._clock()
+        for bucket in self._probe_buckets(keys):
+            if bucket != -1:
+                expires = buckets[bucket].expires
+                if expires != None and expires <= now:
+                    expire(bucket)
+                    bucket = -1
+            yield bucket
+
+    def _expire(self, bucket: int) -> None:
+        """
+        Turns the live bucket of an expired key into a tombstone.
+
+        Unlike _remove_at, the table is never shrunk or compacted.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       None
+        """
+        self._buckets[bucket].is_tombstone = True
+        self._size -= 1
+        self._tombstones += 1
+        self._modifications += 1
+
+    def _next_live(self, bucket: int) -> int:
+        """
+        Finds the first live, unexpired bucket at or after the given index.
+
+        :param self:   the hash map being passed
+        :param bucket: the index to start looking from
+
+        :return:       index of the live bucket, or the capacity if none
+        """
+        buckets = self._buckets
+        now = self._clock()
+        while bucket < self._capacity:
+            entry = buckets[bucket]
+            if (entry != None and not entry.is_tombstone
+                    and (entry.expires == None or entry.expires > now)):
+                return bucket
+            bucket += 1
+        return bucket
+
+    def _reap_due(self) -> None:
+        """
+        Reaps up to REAP_BATCH expired keys if the earliest one has expired.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        expiries = self._expiries
+        if expiries and expiries[0][0] <= self._clock():
+            self._reap(REAP_BATCH)
+
+    def _reap(self, limit: int) -> int:
+        """
+        Tombstones expired keys, earliest first.
+
+        :param self:  the hash map being passed
+        :param limit: the most expiry times to pop off the heap, or None
+
+        :return:      number of keys tombstoned
+        """
+        expiries = self._expiries
+        now = self._clock()
+        reaped = popped = 0
+        find_bucket = super()._find_bucket
+        while expiries and expiries[0][0] <= now and popped != limit:
+            expires, _, entry = heapq.heappop(expiries)
+            popped += 1
+            # skip times of entries that were removed or put again since
+            if entry.is_tombstone or entry.expires != expires:
+                continue
+            bucket, _ = find_bucket(entry.key, entry.hash)
+            if bucket != -1 and self._buckets[bucket] is entry:
+                self._expire(bucket)
+                reaped += 1
+        return reaped
+
+    def reap(self) -> int:
+        """
+        Tombstones every expired key, then shrinks or compacts the table
+        if the policy or the tombstones call for it.
+
+        :param self: the hash map being passed
+
+        :return:     number of keys tombstoned
+        """
+        reaped = self._reap(None)
+        if reaped:
+            self._check_shrink()
+        return reaped
+
+    def get_ttl(self, key: str) -> float:
+        """
+        Returns the seconds a key has left to live.
+
+        :param self: the hash map being passed
+        :param key:  the key to look up
+
+        :return:     seconds until the key expires, or None if the key is
+                     absent or never expires
+        """
+        if self._size > 0:
+            bucket, _ = self._find_bucket(key, self._hash_key(key))
+            if bucket != -1:
+                expires = self._buckets[bucket].expires
+                if expires != None:
+                    return expires - self._clock()
+        return None
+
+    def dump(self, fileobj, codec: snapshot.Codec = snapshot.PICKLE) -> None:
+        """
+        Writes a binary snapshot of the hash map to a file object.
+
+        Every value is written after the seconds its key has left to live;
+        see hash_map_oa.HashMap.dump.
+
+        :param self:    the hash map being passed
+        :param fileobj: binary file object to write to
+        :param codec:   codec that turns values into bytes
+
+        :return:        None
+        """
+        snapshot.write(fileobj, self, self._hash_key(snapshot.CHECK_KEY),
+                       self._remaining_records(self._clock()),
+                       self._size + self._tombstones, _with_remaining(codec),
+                       self._snapshot_seed())
+
+    @classmethod
+    def load(cls, fileobj, function, codec: snapshot.Codec = snapshot.PICKLE,
+             policy: LoadPolicy = None, default_ttl: float = None,
+             clock: callable = time.monotonic) -> "HashMap":
+        """
+        Reads a hash map written by dump from a file object.
+
+        Every key expires after the seconds it had left when it was
+        dumped, counted from now on clock.
+
+        :param cls:         the class of the dumped hash map
+        :param fileobj:     binary file object to read from
+        :param function:    the hash function the dumped map was built with
+        :param codec:       the codec the values were dumped with
+        :param policy:      the load policy of the new map
+        :param default_ttl: the default_ttl of the new map
+        :param clock:       the clock of the new map
+
+        :return:            the loaded hash map; raises ValueError if the
+                            snapshot does not match cls, codec or function
+        """
+        if default_ttl != None and default_ttl < 0:
+            raise ValueError("default_ttl must not be negative")
+        hash_map = super().load(fileobj, function, _with_remaining(codec), policy)
+        hash_map._default_ttl = default_ttl
+        hash_map._clock = clock
+        # _restore left the seconds remaining in expires
+        now = clock()
+        expiries, pushes = hash_map._expiries, hash_map._pushes
+        buckets = hash_map._buckets
+        for bucket in range(hash_map._capacity):
+            entry = buckets[bucket]
+            if (entry != None and not entry.is_tombstone
+                    and entry.expires != None):
+                entry.expires += now
+                expiries.append((entry.expires, next(pushes), entry))
+        heapq.heapify(expiries)
+        return hash_map
+
+    def _remaining_records(self, now: float):
+        """
+        Generates the contents of every used bucket for dump.
+
+        :param self: the hash map being passed
+        :param now:  the clock time the seconds remaining count from
+
+        :return:     generator of (bucket, hash, key, value) tuples, with
+                     (value, seconds remaining) as the value of a live
+                     entry and snapshot.TOMBSTONE as that of a tombstone
+        """
+        for bucket, hash, key, value in self._snapshot_records():
+            if value is not snapshot.TOMBSTONE:
+                expires = self._buckets[bucket].expires
+                value = (value, math.nan if expires == None
+                         else max(expires - now, 0.0))
+            yield bucket, hash, key, value
+
+    def _restore(self, bucket: int, key: str, value: tuple, hash: int) -> None:
+        """
+        Puts a live entry read by load into its bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param key:    the key of the entry
+        :param value:  the value of the entry and its seconds remaining
+        :param hash:   the stored hash of the entry
+
+        :return:       None
+        """
+        value, remaining = value
+        # load adds the time of the clock once the whole table is read
+        self._buckets[bucket] = ExpiringEntry(
+            key, value, hash, None if math.isnan(remaining) else remaining)
+
+    def _restore_tombstone(self, bucket: int, hash: int) -> None:
+        """
+        Puts a tombstone read by load into its bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param hash:   the stored hash of the removed entry
+
+        :return:       None
+        """
+        entry = ExpiringEntry(None, None, hash)
+        entry.is_tombstone = True
+        self._buckets[bucket] = entry
+
+
+def _with_remaining(codec: snapshot.Codec) -> snapshot.Codec:
+    """
+    Returns a codec of the same name for (value, seconds remaining) pairs.
+
+    :param codec: the codec of the values themselves
+
+    :return:      codec writing REMAINING in front of the encoded value
+    """
+    encode, decode = codec.encode, codec.decode
+    pack, unpack_from, size = REMAINING.pack, REMAINING.unpack_from, REMAINING.size
+    return snapshot.Codec(
+        codec.name,
+        lambda pair: pack(pair[1]) + encode(pair[0]),
+        lambda data: (decode(data[size:]), unpack_from(data)[0]))
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    class Clock:
+        """Clock that only moves when told to."""
+
+        def __init__(self) -> None:
+            self.now = 0.0
+
+        def __call__(self) -> float:
+            return self.now
+
+    print("\nTTL - put / get with expiry")
+    print("---------------------------")
+    clock = Clock()
+    m = HashMap(53, hash_function_1, clock=clock)
+    for i in range(150):
+        m.put('str' + str(i), i * 100, ttl=10 if i % 2 else None)
+    print(m.get_size(), m.get('str1'), m.get_ttl('str1'), m.get_ttl('str2'))
+    clock.now = 10
+    print(m.get('str1'), m.contains_key('str3'), m.get('str2'),
+          m.get_size(), round(m.tombstone_load(), 2))
+    print(len(list(m.keys())), m.empty_buckets())
+
+    print("\nTTL - puts reap expired keys in batches")
+    print("---------------------------------------")
+    m = HashMap(11, hash_function_2, default_ttl=5, clock=clock)
+    m.put_many(('key' + str(i), i) for i in range(100))
+    clock.now = 20
+    for i in range(3):
+        m.put('new' + str(i), i, ttl=60)
+        print(m.get_size())
+    print(m.reap(), m.get_size(), m.get_ttl('new0'))
+
+    print("\nTTL - dump and load keep the time left")
+    print("--------------------------------------")
+    import io
+    buffer = io.BytesIO()
+    m.dump(buffer)
+    buffer.seek(0)
+    later = Clock()
+    later.now = 1000
+    loaded = HashMap.load(buffer, hash_function_2, clock=later)
+    print(loaded.get_size(), loaded.get_ttl('new0'), loaded.get('new1'))
+    later.now = 1060
+    print(loaded.get('new1'), loaded.get_size())
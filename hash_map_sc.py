@@ -7,27 +7,59 @@
 #              operations, which demonstrate my ability to implement
 #              hash maps with singly chaining in my Python programs.
 
-from a6_include import (DynamicArray, LinkedList,
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from operator import itemgetter
+from queue import Empty, Full
+
+import snapshot
+from a6_include import (DynamicArray, LinkedList, SLNode, SortedChain,
                         hash_function_1, hash_function_2)
+from hash_functions import builtin_hash, bulk_hash, finalized
+from load_policy import LoadPolicy
+
+# a chain of string keys longer than this becomes a SortedChain
+TREEIFY_THRESHOLD = 8
+
+# a SortedChain this short or shorter becomes a LinkedList again
+UNTREEIFY_THRESHOLD = 6
+
+# seconds find_mode_parallel waits on a queue before it checks that the
+# merging processes are still running
+MERGER_POLL = 0.5
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 power_of_two: bool = False,
+                 policy: LoadPolicy = None,
+                 move_to_front: bool = False) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        self._buckets = DynamicArray()
-
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
 
-        self._hash_function = function
-        self._size = 0
+        With power_of_two the capacity is a power of two, buckets are
+        found by masking and every hash is passed through a finalizer.
+        policy decides when the table grows and shrinks; by default it
+        grows at load 1.0 and never shrinks. With move_to_front every
+        lookup that finds a key moves it to the front of its chain, so
+        lookups made while iterating may skip or repeat keys.
+        """
+        self._power_of_two = power_of_two
+        self._move_to_front = move_to_front
+        self._policy = LoadPolicy(1.0) if policy == None else policy
+        if power_of_two:
+            self._capacity = self._next_power_of_two(capacity)
+            self._hash_function = finalized(function)
+        else:
+            # capacity must be a prime number
+            self._capacity = self._next_prime(capacity)
+            self._hash_function = function
+        self.clear()
 
     def __str__(self) -> str:
         """
@@ -36,7 +68,8 @@ class HashMap:
         """
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            # buckets that were never used print as empty lists
+            out += str(i) + ': ' + str(self._buckets[i] or LinkedList()) + '\n'
         return out
 
     def _next_prime(self, capacity: int) -> int:
@@ -72,6 +105,46 @@ class HashMap:
 
         return True
 
+    @staticmethod
+    def _next_power_of_two(capacity: int) -> int:
+        """
+        Find the smallest power of two greater than or equal to capacity.
+
+        :param capacity: the requested capacity
+
+        :return:         the power of two capacity, at least 2
+        """
+        return 1 << max(capacity - 1, 1).bit_length()
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Rounds a requested capacity up to one the capacity policy allows.
+
+        :param self:     the hash map being passed
+        :param capacity: the requested capacity
+
+        :return:         a power of two or a prime capacity
+        """
+        if self._power_of_two:
+            return self._next_power_of_two(capacity)
+        # find next prime if new capacity isn't a prime number
+        if not(self._is_prime(capacity)):
+            return self._next_prime(capacity)
+        return capacity
+
+    def _bucket_of(self, hash: int) -> int:
+        """
+        Reduces a hash to a bucket index.
+
+        :param self: the hash map being passed
+        :param hash: the full hash of a key
+
+        :return:     index of the bucket for the hash
+        """
+        if self._mask:
+            return hash & self._mask
+        return hash % self._capacity
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -98,20 +171,77 @@ class HashMap:
 
         :return:      None
         """
-        # resize hash map if load deems necessary
-        if self.table_load() >= 1.0:
-            self.resize_table(self._capacity * 2)
-        # determine which bucket to put in
-        bucket = self._hash_function(key) % self._capacity
-        node = self._buckets[bucket].contains(key)
+        self._check_load()
+        self._put_hashed(key, value, self._hash_function(key))
+
+    def _check_load(self) -> None:
+        """
+        Grows the hash map before an insert if the load deems necessary.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        policy = self._policy
+        if policy.should_grow(self._size, self._capacity):
+            self.resize_table(policy.grown(self._capacity))
+
+    def _check_shrink(self) -> None:
+        """
+        Shrinks the hash map after a removal if the policy deems necessary.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        new_capacity = self._policy.shrunk(self._size, self._capacity)
+        if new_capacity < self._capacity:
+            new_capacity = self._round_capacity(new_capacity)
+            # rounding up can land back on the current capacity
+            if new_capacity < self._capacity:
+                self._rehash(new_capacity)
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds an element whose hash is already known, without load checks.
+
+        :param self:  the hash map being passed
+        :param key:   the key to add
+        :param value: the value that should be added to the hash map
+        :param hash:  the full hash of the key
+
+        :return:      None
+        """
+        node = self._find_hashed(key, hash)
         # if key doesn't already exist, insert node with key/value pair
         if node == None:
-            self._buckets[bucket].insert(key, value)
+            self._link(SLNode(key, value, None, hash))
             self._size += 1
         # if key exists, simply update value
         else:
             node.value = value
 
+    def increment(self, key: str, amount: int = 1) -> int:
+        """
+        Adds an amount to the value of a key, starting absent keys at 0.
+
+        :param self:   the hash map being passed
+        :param key:    the key whose count is increased
+        :param amount: the amount to add
+
+        :return:       the new value held by the key
+        """
+        self._check_load()
+        hash = self._hash_function(key)
+        node = self._find_hashed(key, hash)
+        # if key doesn't already exist, insert node with the amount
+        if node == None:
+            self._link(SLNode(key, amount, None, hash))
+            self._size += 1
+            return amount
+        node.value += amount
+        return node.value
+
     def empty_buckets(self) -> int:
         """
         Returns the amount of empty buckets.
@@ -120,12 +250,107 @@ class HashMap:
 
         :return:     amount of empty buckets
         """
-        count = 0
-        # iterate through hash map and count empty buckets
-        for i in range(self._capacity):
-            if self._buckets[i].length() <= 0:
-                count += 1
-        return count
+        return self._capacity - self._used_buckets
+
+    def _find_hashed(self, key: str, hash: int):
+        """
+        Returns the node holding a key whose hash is already known.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the full hash of the key
+
+        :return:     node with the key, or None if there is no match
+        """
+        return self._find_node(self._bucket_of(hash), key, hash)
+
+    def _find_node(self, bucket: int, key: str, hash: int):
+        """
+        Returns the node holding a key in the given bucket.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket to search
+        :param key:    the key to find
+        :param hash:   the full hash of the key
+
+        :return:       node with the key, or None if there is no match
+        """
+        chain = self._buckets[bucket]
+        if chain == None:
+            return None
+        return chain.contains(key, hash, self._move_to_front)
+
+    def _chain_for_insert(self, bucket: int) -> LinkedList:
+        """
+        Returns the list of a bucket, allocating it on first use.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket to insert into
+
+        :return:       linked list of the bucket
+        """
+        chain = self._buckets[bucket]
+        if chain == None:
+            chain = LinkedList()
+            self._buckets[bucket] = chain
+            self._used_buckets += 1
+        return chain
+
+    def _link(self, node: SLNode) -> None:
+        """
+        Links a node into the bucket of its stored hash.
+
+        A linked list that grows past TREEIFY_THRESHOLD nodes is turned
+        into a SortedChain, so a bucket that many keys collide in is
+        searched in O(log n) instead of O(n).
+
+        :param self: the hash map being passed
+        :param node: the node to link; its key must not be in the map
+
+        :return:     None
+        """
+        bucket = self._bucket_of(node.hash)
+        chain = self._chain_for_insert(bucket)
+        if type(chain) is LinkedList:
+            chain.insert_node(node)
+            if chain._size > TREEIFY_THRESHOLD:
+                self._treeify(bucket)
+        elif type(node.key) is str:
+            chain.insert_node(node)
+        else:
+            # keys that are not strings may not order against the others
+            self._untreeify(bucket).insert_node(node)
+
+    def _treeify(self, bucket: int) -> None:
+        """
+        Turns the linked list of a bucket into a SortedChain.
+
+        Only chains of string keys are converted, since other keys with
+        equal hashes may not be orderable against each other.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       None
+        """
+        chain = self._buckets[bucket]
+        if all(type(node.key) is str for node in chain):
+            self._buckets[bucket] = SortedChain(chain)
+
+    def _untreeify(self, bucket: int) -> LinkedList:
+        """
+        Turns the SortedChain of a bucket back into a linked list.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+
+        :return:       the new linked list of the bucket
+        """
+        chain = LinkedList()
+        for node in self._buckets[bucket]:
+            chain.insert_node(node)
+        self._buckets[bucket] = chain
+        return chain
 
     def table_load(self) -> float:
         """
@@ -145,12 +370,13 @@ class HashMap:
 
         :return:     None
         """
-        self._buckets = DynamicArray()
-        # iterate through hash map and empty the buckets
-        for i in range(self._capacity):
-            self._buckets.append(LinkedList())
+        # buckets stay None until a key is first inserted into them
+        self._buckets = DynamicArray([None] * self._capacity)
         # update the size of hash map
         self._size = 0
+        self._used_buckets = 0
+        # power of two tables find buckets with this mask, others use 0
+        self._mask = self._capacity - 1 if self._power_of_two else 0
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -163,16 +389,47 @@ class HashMap:
         """
         # only resize hash map if new capacity is at least 1
         if new_capacity >= 1:
-            # find next prime if new capacity isn't a prime number
-            if not(self._is_prime(new_capacity)):
-                new_capacity = self._next_prime(new_capacity)
-            # get list of key/value pairs, update capacity, and clear hash map
-            data = self.get_keys_and_values()
-            self._capacity = new_capacity
-            self.clear()
-            # using list of key/value pairs, rehash them into hash map
-            for i in range(data.length()):
-                self.put(data[i][0], data[i][1])
+            new_capacity = self._round_capacity(new_capacity)
+            # keep growing while re-adding every node would exceed the load
+            policy = self._policy
+            while policy.needs_growth(self._size, new_capacity):
+                new_capacity = self._round_capacity(policy.grown(new_capacity))
+            self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every node into a new table of the given capacity.
+
+        Nodes are relinked using the hash stored on them, so the hash
+        function is never called and no node is reallocated.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        old_buckets = self._buckets
+        old_capacity = self._capacity
+        self._capacity = new_capacity
+        self.clear()
+        long_chains = []
+        for i in range(old_capacity):
+            chain = old_buckets[i]
+            if chain == None:
+                continue
+            node = chain._head if type(chain) is LinkedList else chain.thread()
+            while node:
+                # save the successor before the node is relinked
+                following = node.next
+                bucket = self._bucket_of(node.hash)
+                new_chain = self._chain_for_insert(bucket)
+                new_chain.insert_node(node)
+                if new_chain._size == TREEIFY_THRESHOLD + 1:
+                    long_chains.append(bucket)
+                node = following
+            self._size += chain.length()
+        for bucket in long_chains:
+            self._treeify(bucket)
 
     def get(self, key: str):
         """
@@ -183,9 +440,8 @@ class HashMap:
 
         :return:     the value held by the key
         """
-        # determine bucket to look in and find node with key
-        bucket = self._hash_function(key) % self._capacity
-        node = self._buckets[bucket].contains(key)
+        # find node with key
+        node = self._find_hashed(key, self._hash_function(key))
         # return value associated with key if key exists
         if node == None:
             return None
@@ -203,9 +459,8 @@ class HashMap:
         """
         # only look for key if hash map not empty
         if self._size > 0:
-            # determine bucket to look in and find node with key
-            bucket = self._hash_function(key) % self._capacity
-            node = self._buckets[bucket].contains(key)
+            # find node with key
+            node = self._find_hashed(key, self._hash_function(key))
             # return true if key exists in hash map and false if not
             if node == None:
                 return False
@@ -223,11 +478,126 @@ class HashMap:
 
         :return:     None
         """
+        if self._remove_hashed(key, self._hash_function(key)):
+            self._check_shrink()
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Removes a key whose hash is already known.
+
+        :param self: the hash map being passed
+        :param key:  the key to remove
+        :param hash: the full hash of the key
+
+        :return:     True if the key was found and removed
+        """
         # determine bucket to remove from
-        bucket = self._hash_function(key) % self._capacity
+        bucket = self._bucket_of(hash)
+        chain = self._buckets[bucket]
         # remove node with key and update size if key exists
-        if self._buckets[bucket].remove(key):
+        if chain != None and chain.remove(key, hash):
             self._size -= 1
+            # free the list once its last node is gone
+            if chain.length() == 0:
+                self._buckets[bucket] = None
+                self._used_buckets -= 1
+            elif (type(chain) is SortedChain
+                  and chain.length() <= UNTREEIFY_THRESHOLD):
+                self._untreeify(bucket)
+            return True
+        return False
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds every key/value pair from an iterable to the hash map.
+
+        The table is grown once for the final count and all keys are
+        hashed before any of them is inserted, so no resize happens part
+        way through the batch.
+
+        :param self:  the hash map being passed
+        :param pairs: iterable of (key, value) tuples
+
+        :return:      None
+        """
+        pairs = list(pairs)
+        hash_function = self._hash_function
+        hashes = [hash_function(key) for key, _ in pairs]
+        self._reserve(self._size + len(pairs))
+        put_hashed = self._put_hashed
+        for (key, value), hash in zip(pairs, hashes):
+            put_hashed(key, value, hash)
+
+    def get_many(self, keys) -> list:
+        """
+        Returns the values held by every key from an iterable.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to get
+
+        :return:     list of values, None for every missing key
+        """
+        return [None if node == None else node.value
+                for node in self._find_nodes(keys)]
+
+    def contains_many(self, keys) -> list:
+        """
+        Determines for every key from an iterable whether it is held.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     list of booleans, one per key
+        """
+        return [node != None for node in self._find_nodes(keys)]
+
+    def _find_nodes(self, keys):
+        """
+        Yields the node holding each key, with bucket lookups inlined.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of nodes, None for every missing key
+        """
+        hash_function = self._hash_function
+        mask, capacity, buckets = self._mask, self._capacity, self._buckets
+        move_to_front = self._move_to_front
+        for key in keys:
+            hash = hash_function(key)
+            chain = buckets[hash & mask if mask else hash % capacity]
+            yield (None if chain == None
+                   else chain.contains(key, hash, move_to_front))
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key from an iterable from the hash map.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to remove
+
+        :return:     None
+        """
+        hash_function, remove_hashed = self._hash_function, self._remove_hashed
+        for key in keys:
+            remove_hashed(key, hash_function(key))
+        # shrink once for the whole batch
+        self._check_shrink()
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grows the table once so that count entries fit under the load limit.
+
+        :param self:  the hash map being passed
+        :param count: the number of entries the table must hold
+
+        :return:      None
+        """
+        capacity, policy = self._capacity, self._policy
+        while policy.needs_growth(count, capacity):
+            capacity = self._round_capacity(policy.grown(capacity))
+        if capacity != self._capacity:
+            self._rehash(capacity)
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -238,66 +608,396 @@ class HashMap:
         :return:     list of key and value pairs
         """
         da = DynamicArray()
+        for pair in self.items():
+            da.append(pair)
+        return da
+
+    def dump(self, fileobj, codec: snapshot.Codec = snapshot.PICKLE) -> None:
+        """
+        Writes a binary snapshot of the hash map to a file object.
+
+        Every node is written with its bucket index and stored hash, one
+        chunk at a time and in chain order, so load can rebuild the
+        exact same chains; see snapshot.write for the format.
+
+        :param self:    the hash map being passed
+        :param fileobj: binary file object to write to
+        :param codec:   codec that turns values into bytes
+
+        :return:        None
+        """
+        snapshot.write(fileobj, self, self._hash_function(snapshot.CHECK_KEY),
+                       self._snapshot_records(), self._size, codec)
+
+    @classmethod
+    def load(cls, fileobj, function: callable = hash_function_1,
+             codec: snapshot.Codec = snapshot.PICKLE,
+             policy: LoadPolicy = None) -> "HashMap":
+        """
+        Reads a hash map written by dump from a file object.
+
+        Every node goes back into the bucket it was dumped from with its
+        stored hash, so no key is hashed.
+
+        :param cls:      the class of the dumped hash map
+        :param fileobj:  binary file object to read from
+        :param function: the hash function the dumped map was built with
+        :param codec:    the codec the values were dumped with
+        :param policy:   the load policy of the new map
+
+        :return:         the loaded hash map; raises ValueError if the
+                         snapshot does not match cls, codec or function
+        """
+        power_of_two, check, _, capacity, size, count = \
+            snapshot.read_header(fileobj, cls, codec)
+        hash_map = cls(capacity, function, power_of_two, policy)
+        # the constructor rounds a capacity of 2 up to the next odd prime
+        if hash_map._capacity != capacity:
+            hash_map._capacity = capacity
+            hash_map.clear()
+        snapshot.check_hash(check, hash_map._hash_function(snapshot.CHECK_KEY))
+        nodes, last = [], -1
+        for bucket, hash, key, value in snapshot.read_records(fileobj, count, codec):
+            if bucket != last and nodes:
+                hash_map._restore_chain(last, nodes)
+                nodes = []
+            nodes.append(SLNode(key, value, None, hash))
+            last = bucket
+        if nodes:
+            hash_map._restore_chain(last, nodes)
+        hash_map._size = size
+        return hash_map
+
+    def _snapshot_records(self):
+        """
+        Generates every node for dump, bucket by bucket in chain order.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (bucket, hash, key, value) tuples
+        """
+        buckets = self._buckets
+        for bucket in range(self._capacity):
+            chain = buckets[bucket]
+            if chain != None:
+                for node in chain:
+                    yield bucket, node.hash, node.key, node.value
+
+    def _restore_chain(self, bucket: int, nodes: list) -> None:
+        """
+        Links the nodes read by load into a bucket in the order given.
+
+        :param self:   the hash map being passed
+        :param bucket: the index of the bucket
+        :param nodes:  the nodes of the bucket, head first
+
+        :return:       None
+        """
+        chain = self._chain_for_insert(bucket)
+        # inserting at the front, so the head has to go in last
+        for node in reversed(nodes):
+            chain.insert_node(node)
+        # a SortedChain was dumped in (hash, key) order and sorts the same
+        if chain._size > TREEIFY_THRESHOLD:
+            self._treeify(bucket)
+
+    def items(self):
+        """
+        Generates every key/value pair in the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (key, value) tuples
+        """
         # iterate through every bucket and linked list in hash map
         for i in range(self._capacity):
-            for node in self._buckets[i]:
-                # add key/value pairs to a dynamic array
-                da.append((node.key, node.value))
-        return da
+            chain = self._buckets[i]
+            if chain == None:
+                continue
+            for node in chain:
+                yield node.key, node.value
+
+
+class ModeCounter:
+    """
+    Counts keys from a stream in a single pass.
+
+    The highest frequency and the keys that reach it are kept up to date
+    on every add, so the mode never needs a scan of the hash map. Keys
+    are counted as given and may be any hashable object.
+    """
+
+    def __init__(self, capacity: int = 11,
+                 function: callable = builtin_hash) -> None:
+        """Initialize an empty counter backed by a separate chaining HashMap."""
+        self._counts = HashMap(capacity, function)
+        self._modes = []
+        self._max_frequency = 0
+
+    def add(self, key, amount: int = 1) -> int:
+        """
+        Counts one occurrence (or amount occurrences) of a key.
+
+        :param self:   the counter being passed
+        :param key:    the key to count
+        :param amount: how many occurrences to add, at least 1
+
+        :return:       the new frequency of the key
+        """
+        frequency = self._counts.increment(key, amount)
+        # counts only grow, so a key can only join or replace the modes
+        if frequency > self._max_frequency:
+            self._max_frequency = frequency
+            self._modes = [key]
+        elif frequency == self._max_frequency:
+            self._modes.append(key)
+        return frequency
+
+    def update(self, iterable) -> None:
+        """
+        Counts every key produced by an iterable or generator.
+
+        :param self:     the counter being passed
+        :param iterable: keys to count
+
+        :return:         None
+        """
+        add = self.add
+        for key in iterable:
+            add(key)
+
+    def frequency(self, key) -> int:
+        """Return how many times a key has been counted."""
+        return self._counts.get(key) or 0
+
+    def mode(self) -> tuple[DynamicArray, int]:
+        """
+        Returns every key with the highest frequency and that frequency.
+
+        :param self: the counter being passed
+
+        :return:     modes in the order they reached the highest frequency
+                     and the highest frequency
+        """
+        return DynamicArray(self._modes), self._max_frequency
+
+    def in_table_order(self, keys) -> list:
+        """
+        Sorts counted keys by where they sit in the table: by bucket, then
+        by position in the bucket's chain.
+
+        :param self: the counter being passed
+        :param keys: counted keys, such as the modes
+
+        :return:     list of the keys in table order
+        """
+        counts = self._counts
+        hash_function = counts._hash_function
+
+        def position(key) -> tuple[int, int]:
+            bucket = counts._bucket_of(hash_function(key))
+            for index, node in enumerate(counts._buckets[bucket]):
+                if node.key == key:
+                    return bucket, index
+
+        return sorted(keys, key=position)
+
+    def top_k(self, n: int) -> list:
+        """
+        Returns the n most frequent keys using a bounded heap.
+
+        :param self: the counter being passed
+        :param n:    how many keys to return
+
+        :return:     list of (key, frequency) tuples, most frequent first
+        """
+        return heapq.nlargest(n, self._counts.items(), key=itemgetter(1))
+
+    def get_size(self) -> int:
+        """Return the number of distinct keys counted."""
+        return self._counts.get_size()
+
 
 def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     """
     Returns a list of all modes and their frequency.
 
+    Modes are listed in the order a scan of the counting table's
+    buckets meets them, as they always have been.
+
     :param da: dynamic array of values
 
     :return:   list of key and value pairs and the max frequency
     """
-    # use a hash map to organize values and their frequencies
-    map = HashMap(11, hash_function_2)
-    modes = DynamicArray()
-    maxFrequency = 0
-    # add keys from dynamic array and update values of hash map
+    # values are compared by their string form, as they always have been
+    counter = ModeCounter(11, hash_function_2)
     for i in range(da.length()):
-        _mode_add(map, str(da[i]))
-    # iterate through hash map buckets
-    for i in range(map._capacity):
-        # this for loop runs ONCE for each bucket
-        for node in map._buckets[i]:
-            # reset list of modes and update max frequency if value
-            # is greater than max frequency.
-            if node.value > maxFrequency:
-                maxFrequency = node.value
-                modes = DynamicArray()
-                modes.append(node.key)
-            # add mode to list of modes if value is equal to max
-            # frequency.
-            elif node.value == maxFrequency:
-                modes.append(node.key)
+        counter.add(str(da[i]))
+    modes, maxFrequency = counter.mode()
+    modes = [modes[i] for i in range(modes.length())]
+    return DynamicArray(counter.in_table_order(modes)), maxFrequency
+
+def find_mode_parallel(values, workers: int = None,
+                       chunk_size: int = 50000) -> tuple[DynamicArray, int]:
+    """
+    Returns all modes and their frequency, counting in a process pool.
+
+    Workers count chunks of the input into local HashMaps and split the
+    counts into one shard per worker by a hash that is stable across
+    processes. Every shard is owned by a merging process that adds the
+    counts sent to it into its own ModeCounter as they arrive, so no
+    process holds more than one shard's counts. Since a key only ever
+    lands in one shard, the global mode is the union of the shard modes
+    that reach the highest frequency. Values are converted with str() so
+    the result matches find_mode, although modes may be listed in a
+    different order. If a merging process dies, RuntimeError is raised
+    instead of waiting for its counts forever.
+
+    :param values:     dynamic array, iterable or generator of values
+    :param workers:    number of processes, defaults to the CPU count
+    :param chunk_size: number of values sent to a worker at a time
+
+    :return:           list of modes and the max frequency
+    """
+    if isinstance(values, DynamicArray):
+        da = values
+        values = (da[i] for i in range(da.length()))
+    values = iter(values)
+    shards = workers or os.cpu_count() or 1
+    # bounded queues make the counting workers wait for slow mergers
+    queues = [multiprocessing.Queue(2) for _ in range(shards)]
+    results = multiprocessing.Queue()
+    # tells counting workers to stop waiting for a full shard queue
+    abort = multiprocessing.Event()
+    mergers = [multiprocessing.Process(target=_merge_shard,
+                                       args=(queue, results), daemon=True)
+               for queue in queues]
+    for merger in mergers:
+        merger.start()
+    shard_modes = None
+    try:
+        with ProcessPoolExecutor(shards, initializer=_use_shard_queues,
+                                 initargs=(queues, abort)) as pool:
+            try:
+                pending = set()
+                while True:
+                    chunk = [str(value) for value in islice(values, chunk_size)]
+                    if chunk:
+                        pending.add(pool.submit(_count_chunk, chunk))
+                    # bound the chunks in flight so a stream never sits in memory
+                    while pending and (not chunk or len(pending) >= 2 * shards):
+                        done, pending = wait(pending, MERGER_POLL, FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                        _check_mergers(mergers)
+                    if not chunk:
+                        break
+            except BaseException:
+                # leaving the with statement waits for the running chunks
+                abort.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        for queue in queues:
+            while True:
+                try:
+                    queue.put(None, timeout=MERGER_POLL)
+                    break
+                except Full:
+                    _check_mergers(mergers)
+        # results are read before joining, as a process only exits once
+        # everything it put on a queue has been read
+        received = []
+        while len(received) < len(mergers):
+            try:
+                received.append(results.get(timeout=MERGER_POLL))
+            except Empty:
+                _check_mergers(mergers)
+        shard_modes = received
+    finally:
+        for merger in mergers:
+            if shard_modes == None:
+                merger.terminate()
+            merger.join()
+
+    maxFrequency = max(frequency for _, frequency in shard_modes)
+    modes = DynamicArray()
+    for keys, frequency in shard_modes:
+        if frequency == maxFrequency and frequency > 0:
+            for key in keys:
+                modes.append(key)
     return (modes, maxFrequency)
 
-def _mode_add(map: HashMap, key: str) -> None:
+def _check_mergers(mergers: list) -> None:
+    """
+    Raises RuntimeError if a merging process of find_mode_parallel died.
+
+    :param mergers: the merging processes
+
+    :return:        None
+    """
+    for merger in mergers:
+        if merger.exitcode not in (None, 0):
+            raise RuntimeError("a find_mode_parallel merger exited with code "
+                               + str(merger.exitcode))
+
+# queues of the merging processes and the abort event, set in every
+# counting worker
+_shard_queues = None
+_abort = None
+
+def _use_shard_queues(queues: list, abort) -> None:
     """
-    Adds a key to hashmap and increases the value by 1 if key found.
+    Hands a counting worker the queues of the merging processes.
 
-    :param map: hash map to add key to
-    :param key: the key to add
+    :param queues: one queue per shard
+    :param abort:  event set when find_mode_parallel gives up
 
-    :return:    None
+    :return:       None
     """
-    # resize hash map if load deems necessary
-    if map.table_load() >= 1.0:
-        map.resize_table(map._capacity * 2)
-    # determine which bucket to put in
-    bucket = map._hash_function(key) % map._capacity
-    node = map._buckets[bucket].contains(key)
-    # if key doesn't already exist, insert node with key and value of one
-    if node == None:
-        map._buckets[bucket].insert(key, 1)
-        map._size += 1
-    # if key exists, simply add one to value
-    else:
-        node.value += 1
+    global _shard_queues, _abort
+    _shard_queues = queues
+    _abort = abort
+
+def _count_chunk(chunk: list) -> None:
+    """
+    Counts one chunk of values and sends each shard its counts.
+
+    :param chunk: list of keys to count
+
+    :return:      None
+    """
+    counts = HashMap(11, builtin_hash)
+    for key in chunk:
+        counts.increment(key)
+    shards = len(_shard_queues)
+    parts = [[] for _ in range(shards)]
+    # bulk_hash is the same in every process, unlike the built-in hash
+    for key, count in counts.items():
+        parts[bulk_hash(key) % shards].append((key, count))
+    for queue, part in zip(_shard_queues, parts):
+        while part:
+            try:
+                queue.put(part, timeout=MERGER_POLL)
+                break
+            except Full:
+                if _abort.is_set():
+                    raise RuntimeError("find_mode_parallel gave up")
+
+def _merge_shard(parts, results) -> None:
+    """
+    Merges the counts of one shard until None arrives, then sends its modes.
+
+    :param parts:   queue of lists of (key, count) tuples for the shard
+    :param results: queue the shard's modes and their frequency go to
+
+    :return:        None
+    """
+    counter = ModeCounter()
+    for part in iter(parts.get, None):
+        for key, count in part:
+            counter.add(key, count)
+    modes, frequency = counter.mode()
+    results.put(([modes[i] for i in range(modes.length())], frequency))
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -498,4 +1198,28 @@ if __name__ == "__main__":
     for case in test_cases:
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
-        print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
\ No newline at end of file
+        print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+    print("\nModeCounter example 1")
+    print("-----------------------------")
+    counter = ModeCounter()
+    counter.update(word for word in "the cat and the hat and the bat".split())
+    counter.update([1, 2, 2])
+    mode, frequency = counter.mode()
+    print(f"Mode : {mode}, Frequency: {frequency}", counter.frequency('and'), counter.frequency(2))
+    print(counter.top_k(3))
+
+    print("\nfind_mode_parallel example 1")
+    print("-----------------------------")
+    da = DynamicArray(["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2"])
+    mode, frequency = find_mode_parallel(da, workers=2, chunk_size=4)
+    print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}")
+
+    print("\nLoadPolicy - shrink on remove example 1")
+    print("-----------------------------")
+    m = HashMap(11, hash_function_1, policy=LoadPolicy(1.0, 0.25))
+    for i in range(400):
+        m.put('str' + str(i), i)
+    print(m.get_size(), m.get_capacity())
+    for i in range(390):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
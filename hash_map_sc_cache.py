@@ -0,0 +1,973 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Bounded caches built on the separate chaining HashMap. Each
+#              cache holds at most max_entries entries or max_bytes bytes
+#              and evicts by its own policy: LRUCache the least recently
+#              used entry, LFUCache the least frequently used one, and
+#              TinyLFUCache lets an entry into its main region only if a
+#              frequency sketch says it is used more often than the entry
+#              it would replace (W-TinyLFU). The eviction order is threaded
+#              through the chain nodes themselves, so every operation is
+#              O(1) on top of the hash map lookup.
+
+import sys
+
+import hash_map_sc
+import snapshot
+from a6_include import SLNode, hash_function_1
+from hash_functions import MASK_64, PRIME_1
+from load_policy import LoadPolicy
+
+# rows of the frequency sketch, each indexed by its own hash of the key
+SKETCH_DEPTH = 4
+
+# counters of the frequency sketch stop at this value
+SKETCH_MAX = 15
+
+# every counter is halved once this many increments per counter of a
+# row have been recorded, so old popularity fades
+SKETCH_SAMPLE = 10
+
+# byte value -> half of it, for halving a whole row in one translate
+HALVED = bytes(value >> 1 for value in range(256))
+
+# share of the budget given to the window of a TinyLFUCache, in percent
+WINDOW_PERCENT = 1
+
+# share of the main region kept for entries used more than once, in percent
+PROTECTED_PERCENT = 80
+
+
+def entry_size(key, value) -> int:
+    """Return the bytes a key and its value take, not counting their contents."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class CacheNode(SLNode):
+    """
+    Chain node that is also linked into the eviction order of a cache.
+    """
+
+    __slots__ = ('before', 'after', 'weight', 'group')
+
+    def __init__(self, key, value: object, hash: int, weight: int) -> None:
+        """Initialize a node of the given weight, not yet in any order."""
+        super().__init__(key, value, None, hash)
+        self.before = None
+        self.after = None
+        self.weight = weight
+        self.group = None
+
+
+class OrderList:
+    """
+    Circular doubly linked list of CacheNodes, oldest first.
+
+    The list is its own sentinel: after points to the oldest node and
+    before to the newest. The total weight of its nodes is kept up to
+    date. An LFUCache links lists of equal frequency into a list of
+    their own through lower and higher.
+    """
+
+    __slots__ = ('before', 'after', 'weight', 'count',
+                 'frequency', 'lower', 'higher')
+
+    def __init__(self, frequency: int = 0) -> None:
+        """Initialize an empty list."""
+        self.before = self.after = self
+        self.weight = 0
+        self.count = 0
+        self.frequency = frequency
+        self.lower = self.higher = self
+
+    def append(self, node: CacheNode) -> None:
+        """Link a node in as the newest of the list."""
+        newest = self.before
+        node.before, node.after = newest, self
+        newest.after = self.before = node
+        node.group = self
+        self.weight += node.weight
+        self.count += 1
+
+    def unlink(self, node: CacheNode) -> None:
+        """Unlink a node of this list."""
+        node.before.after = node.after
+        node.after.before = node.before
+        self.weight -= node.weight
+        self.count -= 1
+
+    def first(self) -> CacheNode:
+        """Return the oldest node, or None if the list is empty."""
+        node = self.after
+        return None if node is self else node
+
+    def __iter__(self):
+        """Yield the nodes of the list, oldest first."""
+        node = self.after
+        while node is not self:
+            yield node
+            node = node.after
+
+
+class LRUCache(hash_map_sc.HashMap):
+    """
+    Separate chaining HashMap that evicts the least recently used entry.
+
+    The cache is bounded by exactly one of max_entries and max_bytes.
+    With max_bytes every entry weighs sizeof(key, value) bytes, by
+    default the shallow size of the key and value objects, and an entry
+    heavier than the whole budget is not cached at all.
+
+    get and increment count as uses of a key; contains_key, items and
+    the other methods do not. Hits, misses and evictions are counted
+    for stats(), and removals and clear() are not evictions.
+
+    dump writes the entries in eviction order, the next victim first,
+    with the group each one is in where the bucket index would be, so
+    load rebuilds the same order in a table of its own. The hit, miss
+    and eviction counts are not kept.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None,
+                 sizeof: callable = entry_size, capacity: int = 11,
+                 function: callable = hash_function_1,
+                 power_of_two: bool = False,
+                 policy: LoadPolicy = None) -> None:
+        """
+        Initialize an empty cache. capacity, function, power_of_two and
+        policy are passed on to the HashMap.
+        """
+        if (max_entries == None) == (max_bytes == None):
+            raise ValueError("give exactly one of max_entries and max_bytes")
+        limit = max_bytes if max_entries == None else max_entries
+        if limit < 1:
+            raise ValueError("the cache must hold at least 1 entry or byte")
+        self._limit = limit
+        self._sizeof = None if max_entries != None else sizeof
+        self._rehashing = False
+        self.reset_stats()
+        super().__init__(capacity, function, power_of_two, policy)
+
+    def clear(self) -> None:
+        """
+        Empties the cache.
+
+        :param self: the cache being passed
+
+        :return:     None
+        """
+        super().clear()
+        # _rehash empties the table with clear() as well, but keeps every node
+        if not self._rehashing:
+            self._weight = 0
+            self._reset_order()
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Moves every node into a new table, keeping the eviction order.
+
+        :param self:         the cache being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        self._rehashing = True
+        super()._rehash(new_capacity)
+        self._rehashing = False
+
+    # ------------------------------------------------------------------ #
+
+    def _reset_order(self) -> None:
+        """
+        Starts an empty eviction order.
+
+        :param self: the cache being passed
+
+        :return:     None
+        """
+        self._order = OrderList()
+
+    def _admit(self, node: CacheNode) -> None:
+        """
+        Adds a new node to the eviction order.
+
+        :param self: the cache being passed
+        :param node: the node just linked into the table
+
+        :return:     None
+        """
+        self._order.append(node)
+
+    def _touch(self, node: CacheNode) -> None:
+        """
+        Records a use of a node by making it the newest.
+
+        :param self: the cache being passed
+        :param node: the node that was used
+
+        :return:     None
+        """
+        order = self._order
+        order.unlink(node)
+        order.append(node)
+
+    def _forget(self, node: CacheNode) -> None:
+        """
+        Takes a node out of the eviction order for good.
+
+        :param self: the cache being passed
+        :param node: the node to take out
+
+        :return:     None
+        """
+        node.group.unlink(node)
+        self._weight -= node.weight
+
+    def _victim(self) -> CacheNode:
+        """
+        Returns the node to evict next.
+
+        :param self: the cache being passed
+
+        :return:     the least recently used node
+        """
+        return self._order.first()
+
+    def _evict(self) -> None:
+        """
+        Evicts nodes until the cache is within its budget again.
+
+        :param self: the cache being passed
+
+        :return:     None
+        """
+        while self._weight > self._limit:
+            self._discard(self._victim())
+            self._evictions += 1
+
+    def _discard(self, node: CacheNode) -> None:
+        """
+        Removes a node from both the eviction order and the table.
+
+        :param self: the cache being passed
+        :param node: the node to remove
+
+        :return:     None
+        """
+        self._forget(node)
+        super()._remove_hashed(node.key, node.hash)
+
+    # ------------------------------------------------------------------ #
+
+    def _put_hashed(self, key, value: object, hash: int) -> None:
+        """
+        Adds or updates an entry whose hash is already known, then evicts
+        until the cache is within its budget.
+
+        :param self:  the cache being passed
+        :param key:   the key to add
+        :param value: the value of the key
+        :param hash:  the full hash of the key
+
+        :return:      None
+        """
+        weight = 1 if self._sizeof == None else self._sizeof(key, value)
+        node = self._find_hashed(key, hash)
+        if weight > self._limit:
+            # an entry that can never fit drops the value it replaces
+            if node != None:
+                self._discard(node)
+            return
+        if node == None:
+            # room is made first, so a new key is never its own victim
+            self._weight += weight
+            self._evict()
+            node = CacheNode(key, value, hash, weight)
+            self._link(node)
+            self._size += 1
+            self._admit(node)
+        else:
+            node.value = value
+            node.group.weight += weight - node.weight
+            self._weight += weight - node.weight
+            node.weight = weight
+            self._touch(node)
+        self._evict()
+
+    def _remove_hashed(self, key, hash: int) -> bool:
+        """
+        Removes a key whose hash is already known.
+
+        :param self: the cache being passed
+        :param key:  the key to remove
+        :param hash: the full hash of the key
+
+        :return:     True if the key was found and removed
+        """
+        node = self._find_hashed(key, hash)
+        if node == None:
+            return False
+        self._discard(node)
+        return True
+
+    def _get_hashed(self, key, hash: int):
+        """
+        Returns the value of a key whose hash is already known, counting
+        the lookup as a hit or a miss.
+
+        :param self: the cache being passed
+        :param key:  the key to find
+        :param hash: the full hash of the key
+
+        :return:     the value of the key, or None on a miss
+        """
+        node = self._find_hashed(key, hash)
+        if node == None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._touch(node)
+        return node.value
+
+    def get(self, key):
+        """
+        Returns the value of a key and records the use.
+
+        :param self: the cache being passed
+        :param key:  the key to find
+
+        :return:     the value of the key, or None on a miss
+        """
+        return self._get_hashed(key, self._hash_function(key))
+
+    def get_many(self, keys) -> list:
+        """
+        Returns the values of every key from an iterable, in order,
+        recording each use.
+
+        :param self: the cache being passed
+        :param keys: iterable of keys to get
+
+        :return:     list of values, None for every miss
+        """
+        get = self.get
+        return [get(key) for key in keys]
+
+    def increment(self, key, amount: int = 1) -> int:
+        """
+        Adds an amount to the value of a key, starting absent keys at 0.
+
+        :param self:   the cache being passed
+        :param key:    the key whose count is increased
+        :param amount: the amount to add
+
+        :return:       the new value of the key
+        """
+        self._check_load()
+        hash = self._hash_function(key)
+        node = self._find_hashed(key, hash)
+        value = amount if node == None else node.value + amount
+        self._put_hashed(key, value, hash)
+        return value
+
+    def get_weight(self) -> int:
+        """
+        Returns the number of entries, or bytes with max_bytes, in use.
+
+        :param self: the cache being passed
+
+        :return:     the total weight of the entries
+        """
+        return self._weight
+
+    def stats(self) -> dict:
+        """
+        Returns the hit, miss and eviction counts since the last reset.
+
+        :param self: the cache being passed
+
+        :return:     dictionary of the counts and the hit ratio
+        """
+        lookups = self._hits + self._misses
+        return {'hits': self._hits, 'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_ratio': self._hits / lookups if lookups else 0.0}
+
+    def reset_stats(self) -> None:
+        """
+        Sets the hit, miss and eviction counts back to 0.
+
+        :param self: the cache being passed
+
+        :return:     None
+        """
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def load(cls, fileobj, max_entries: int = None, max_bytes: int = None,
+             sizeof: callable = entry_size,
+             function: callable = hash_function_1,
+             codec: snapshot.Codec = snapshot.PICKLE,
+             policy: LoadPolicy = None) -> "LRUCache":
+        """
+        Reads a cache written by dump from a file object.
+
+        The budget is given again as for a new cache. Entries are put
+        back in the order they were dumped, so with a smaller budget the
+        ones that would have been evicted first are evicted.
+
+        :param cls:         the class of the dumped cache
+        :param fileobj:     binary file object to read from
+        :param max_entries: the most entries the cache may hold
+        :param max_bytes:   the most bytes the cache may hold
+        :param sizeof:      the weight of an entry with max_bytes
+        :param function:    the hash function the dumped cache was built with
+        :param codec:       the codec the values were dumped with
+        :param policy:      the load policy of the new cache
+
+        :return:            the loaded cache; raises ValueError if the
+                            snapshot does not match cls, codec or function
+        """
+        power_of_two, check, _, capacity, _, count = \
+            snapshot.read_header(fileobj, cls, codec)
+        cache = cls(max_entries, max_bytes, sizeof, capacity, function,
+                    power_of_two, policy)
+        snapshot.check_hash(check, cache._hash_function(snapshot.CHECK_KEY))
+        restore = cache._restore
+        for group, hash, key, value in snapshot.read_records(fileobj, count, codec):
+            restore(key, value, hash, group)
+        return cache
+
+    def _eviction_groups(self):
+        """
+        Generates the lists of the eviction order, the next victims first.
+
+        :param self: the cache being passed
+
+        :return:     generator of (group number, OrderList) tuples
+        """
+        yield 0, self._order
+
+    def _snapshot_records(self):
+        """
+        Generates every node for dump, in eviction order.
+
+        :param self: the cache being passed
+
+        :return:     generator of (group number, hash, key, value) tuples
+        """
+        for number, group in self._eviction_groups():
+            for node in group:
+                yield number, node.hash, node.key, node.value
+
+    def _restore(self, key, value: object, hash: int, number: int) -> None:
+        """
+        Puts an entry read by load back as the newest node of its group,
+        then evicts until the cache is within its budget.
+
+        :param self:   the cache being passed
+        :param key:    the key of the entry
+        :param value:  the value of the entry
+        :param hash:   the stored hash of the entry
+        :param number: the group number the entry was dumped with
+
+        :return:       None
+        """
+        self._check_load()
+        weight = 1 if self._sizeof == None else self._sizeof(key, value)
+        if weight > self._limit:
+            return
+        self._weight += weight
+        node = CacheNode(key, value, hash, weight)
+        self._link(node)
+        self._size += 1
+        self._place(node, number)
+        self._evict()
+
+    def _place(self, node: CacheNode, number: int) -> None:
+        """
+        Adds a node read by load to the eviction order.
+
+        :param self:   the cache being passed
+        :param node:   the node just linked into the table
+        :param number: the group number the node was dumped with
+
+        :return:       None
+        """
+        self._order.append(node)
+
+
+class LFUCache(LRUCache):
+    """
+    Bounded cache that evicts the least frequently used entry, and the
+    least recently used of those on a tie.
+
+    Nodes of equal frequency share an OrderList, and the lists are
+    linked in order of frequency, so a use moves a node into the next
+    list and the victim is the oldest node of the first list, both in
+    O(1). Frequencies never decay, so entries that were popular once
+    stay cached after they go cold.
+    """
+
+    def _reset_order(self) -> None:
+        """
+        Starts an empty eviction order.
+
+        :param self: the cache being passed
+
+        :return:     None
+        """
+        # sentinel of the lists, which it links in rising order of frequency
+        self._groups = OrderList(0)
+
+    def _group_after(self, group: OrderList, frequency: int) -> OrderList:
+        """
+        Returns the list of a frequency, creating it after group if needed.
+
+        :param self:      the cache being passed
+        :param group:     the list with the next lower frequency
+        :param frequency: the frequency of the list
+
+        :return:          the list of the frequency
+        """
+        higher = group.higher
+        if higher.frequency == frequency:
+            return higher
+        new_group = OrderList(frequency)
+        new_group.lower, new_group.higher = group, higher
+        group.higher = higher.lower = new_group
+        return new_group
+
+    def _unlink_from_group(self, node: CacheNode) -> None:
+        """
+        Unlinks a node from its list, dropping the list once it is empty.
+
+        :param self: the cache being passed
+        :param node: the node to unlink
+
+        :return:     None
+        """
+        group = node.group
+        group.unlink(node)
+        if group.count == 0:
+            group.lower.higher = group.higher
+            group.higher.lower = group.lower
+
+    def _admit(self, node: CacheNode) -> None:
+        """
+        Adds a new node with a frequency of 1.
+
+        :param self: the cache being passed
+        :param node: the node just linked into the table
+
+        :return:     None
+        """
+        self._group_after(self._groups, 1).append(node)
+
+    def _touch(self, node: CacheNode) -> None:
+        """
+        Records a use of a node by moving it to the next frequency.
+
+        :param self: the cache being passed
+        :param node: the node that was used
+
+        :return:     None
+        """
+        group = node.group
+        # the next list has to exist before an emptied group is dropped
+        higher = self._group_after(group, group.frequency + 1)
+        self._unlink_from_group(node)
+        higher.append(node)
+
+    def _forget(self, node: CacheNode) -> None:
+        """
+        Takes a node out of the eviction order for good.
+
+        :param self: the cache being passed
+        :param node: the node to take out
+
+        :return:     None
+        """
+        self._unlink_from_group(node)
+        self._weight -= node.weight
+
+    def _victim(self) -> CacheNode:
+        """
+        Returns the node to evict next.
+
+        :param self: the cache being passed
+
+        :return:     the oldest node of the lowest frequency
+        """
+        return self._groups.higher.first()
+
+    def _eviction_groups(self):
+        """
+        Generates the lists of the eviction order, the next victims first.
+
+        :param self: the cache being passed
+
+        :return:     generator of (frequency, OrderList) tuples
+        """
+        group = self._groups.higher
+        while group is not self._groups:
+            yield group.frequency, group
+            group = group.higher
+
+    def _place(self, node: CacheNode, number: int) -> None:
+        """
+        Adds a node read by load to the list of its frequency.
+
+        :param self:   the cache being passed
+        :param node:   the node just linked into the table
+        :param number: the frequency the node was dumped with
+
+        :return:       None
+        """
+        # dump goes through the frequencies in rising order, so the list
+        # of the node is the last one or a new one after it
+        group = self._groups.lower
+        if group.frequency != number:
+            group = self._group_after(group, number)
+        group.append(node)
+
+
+class FrequencySketch:
+    """
+    Count-min sketch estimating how often each hash was seen recently.
+
+    Each of SKETCH_DEPTH rows holds a counter per slot, capped at
+    SKETCH_MAX, and a hash is counted in one slot per row. The estimate
+    is the smallest of its counters, which other hashes can only raise.
+    Once SKETCH_SAMPLE increments per slot have been recorded, every
+    counter is halved, so the estimate follows the recent past.
+    """
+
+    __slots__ = ('_rows', '_mask', '_additions', '_sample_size')
+
+    def __init__(self, width: int) -> None:
+        """Initialize a sketch of at least width slots per row."""
+        width = 1 << max(width - 1, 15).bit_length()
+        self._rows = [bytearray(width) for _ in range(SKETCH_DEPTH)]
+        self._mask = width - 1
+        self._additions = 0
+        self._sample_size = SKETCH_SAMPLE * width
+
+    def _spread(self, hash: int) -> tuple:
+        """
+        Returns the slot of a hash in the first row and the step to the
+        slot in each next row.
+
+        :param self: the sketch being passed
+        :param hash: the full hash of a key
+
+        :return:     (first slot, step), both still to be masked
+        """
+        # one multiply spreads weak hashes over the high bits, and the two
+        # halves of the product give every row its own slot
+        spread = (hash * PRIME_1) & MASK_64
+        return spread >> 32, (spread >> 16) | 1
+
+    def increment(self, hash: int) -> None:
+        """
+        Counts one occurrence of a hash.
+
+        :param self: the sketch being passed
+        :param hash: the full hash of a key
+
+        :return:     None
+        """
+        slot, step = self._spread(hash)
+        mask = self._mask
+        for row in self._rows:
+            if row[slot & mask] < SKETCH_MAX:
+                row[slot & mask] += 1
+            slot += step
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._additions = 0
+            self._rows = [row.translate(HALVED) for row in self._rows]
+
+    def frequency(self, hash: int) -> int:
+        """
+        Estimates how often a hash was seen recently.
+
+        :param self: the sketch being passed
+        :param hash: the full hash of a key
+
+        :return:     the smallest of its counters
+        """
+        slot, step = self._spread(hash)
+        mask = self._mask
+        least = SKETCH_MAX
+        for row in self._rows:
+            if row[slot & mask] < least:
+                least = row[slot & mask]
+            slot += step
+        return least
+
+
+class TinyLFUCache(LRUCache):
+    """
+    Bounded cache with a W-TinyLFU admission filter.
+
+    New entries go into a small LRU window, WINDOW_PERCENT of the
+    budget. An entry pushed out of the window only enters the main
+    region if a FrequencySketch of recent gets and puts rates it above
+    the entry the main region would evict for it; otherwise it is the
+    one evicted. The main region is a segmented LRU: entries start on
+    probation, and a hit there moves them to the protected segment,
+    PROTECTED_PERCENT of the region, whose oldest entries fall back to
+    probation. One-off keys, as in a scan, so never push out the keys
+    that are used all the time.
+
+    The sketch counts hashes, so keys with equal hashes share a count;
+    a finalized or strong hash function keeps that rare. A snapshot
+    keeps the segment of every entry but not the sketch; load counts
+    each entry in it once, as if it had just been put.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None,
+                 sizeof: callable = entry_size, capacity: int = 11,
+                 function: callable = hash_function_1,
+                 power_of_two: bool = False,
+                 policy: LoadPolicy = None) -> None:
+        """
+        Initialize an empty cache. capacity, function, power_of_two and
+        policy are passed on to the HashMap.
+        """
+        super().__init__(max_entries, max_bytes, sizeof, capacity,
+                         function, power_of_two, policy)
+        limit = self._limit
+        self._window_limit = max(1, limit * WINDOW_PERCENT // 100)
+        self._main_limit = limit - self._window_limit
+        self._protected_limit = self._main_limit * PROTECTED_PERCENT // 100
+        # with a byte budget, assume an entry of 64 bytes to size the sketch
+        self._sketch = FrequencySketch(limit if max_entries != None
+                                       else max(1, limit // 64))
+
+    def _reset_order(self) -> None:
+        """
+        Starts an empty eviction order.
+
+        :param self: the cache being passed
+
+        :return:     None
+        """
+        self._window = OrderList()
+        self._probation = OrderList()
+        self._protected = OrderList()
+
+    def _eviction_groups(self):
+        """
+        Generates the window and the segments of the main region.
+
+        :param self: the cache being passed
+
+        :return:     generator of (group number, OrderList) tuples
+        """
+        yield 0, self._window
+        yield 1, self._probation
+        yield 2, self._protected
+
+    def _restore(self, key, value: object, hash: int, number: int) -> None:
+        """
+        Counts the key in the sketch, then puts the entry read by load back.
+
+        :param self:   the cache being passed
+        :param key:    the key of the entry
+        :param value:  the value of the entry
+        :param hash:   the stored hash of the entry
+        :param number: the group number the entry was dumped with
+
+        :return:       None
+        """
+        self._sketch.increment(hash)
+        super()._restore(key, value, hash, number)
+
+    def _place(self, node: CacheNode, number: int) -> None:
+        """
+        Adds a node read by load to the window or segment it was in.
+
+        :param self:   the cache being passed
+        :param node:   the node just linked into the table
+        :param number: the group number the node was dumped with
+
+        :return:       None
+        """
+        (self._window, self._probation, self._protected)[number].append(node)
+
+    def _admit(self, node: CacheNode) -> None:
+        """
+        Adds a new node to the window.
+
+        :param self: the cache being passed
+        :param node: the node just linked into the table
+
+        :return:     None
+        """
+        self._window.append(node)
+
+    def _touch(self, node: CacheNode) -> None:
+        """
+        Records a use of a node, promoting it out of probation.
+
+        :param self: the cache being passed
+        :param node: the node that was used
+
+        :return:     None
+        """
+        group = node.group
+        group.unlink(node)
+        if group is not self._probation:
+            group.append(node)
+            return
+        protected, probation = self._protected, self._probation
+        protected.append(node)
+        while protected.weight > self._protected_limit and protected.count > 1:
+            demoted = protected.first()
+            protected.unlink(demoted)
+            probation.append(demoted)
+
+    def _evict(self) -> None:
+        """
+        Moves nodes pushed out of the window into the main region, each
+        one evicting the main region's victims or itself.
+
+        :param self: the cache being passed
+
+        :return:     None
+        """
+        window, probation = self._window, self._probation
+        while window.weight > self._window_limit:
+            candidate = window.first()
+            window.unlink(candidate)
+            probation.append(candidate)
+            self._make_room(candidate)
+        # an update can make a node of the main region heavier as well
+        if self._probation.weight + self._protected.weight > self._main_limit:
+            self._make_room(None)
+
+    def _make_room(self, candidate: CacheNode) -> None:
+        """
+        Evicts from the main region until it is within its budget, as long
+        as the candidate is more popular than every victim.
+
+        :param self:      the cache being passed
+        :param candidate: the newest node on probation, or None to evict
+                          without comparing
+
+        :return:          None
+        """
+        probation, protected = self._probation, self._protected
+        frequency = self._sketch.frequency
+        candidate_frequency = None
+        while probation.weight + protected.weight > self._main_limit:
+            victim = probation.first()
+            if victim is candidate:
+                victim = protected.first()
+            if candidate != None:
+                if candidate_frequency == None:
+                    candidate_frequency = frequency(candidate.hash)
+                # ties go to the node already cached
+                if (victim == None or candidate.weight > self._main_limit
+                        or candidate_frequency <= frequency(victim.hash)):
+                    victim = candidate
+            self._discard(victim)
+            self._evictions += 1
+            if victim is candidate:
+                return
+
+    def _put_hashed(self, key, value: object, hash: int) -> None:
+        """
+        Counts the key in the sketch, then adds or updates the entry.
+
+        :param self:  the cache being passed
+        :param key:   the key to add
+        :param value: the value of the key
+        :param hash:  the full hash of the key
+
+        :return:      None
+        """
+        self._sketch.increment(hash)
+        super()._put_hashed(key, value, hash)
+
+    def get(self, key):
+        """
+        Returns the value of a key and records the use, counting the key
+        in the sketch on a miss as well.
+
+        :param self: the cache being passed
+        :param key:  the key to find
+
+        :return:     the value of the key, or None on a miss
+        """
+        hash = self._hash_function(key)
+        self._sketch.increment(hash)
+        return self._get_hashed(key, hash)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import io
+
+    print("\nLRU cache - the least recently used key is evicted")
+    print("--------------------------------------------------")
+    m = LRUCache(3)
+    for key in ('a', 'b', 'c'):
+        m.put(key, key.upper())
+    m.get('a')
+    m.put('d', 'D')
+    print(m.get_size(), m.contains_key('a'), m.contains_key('b'), m.stats())
+
+    print("\nLFU cache - the least frequently used key is evicted")
+    print("----------------------------------------------------")
+    m = LFUCache(3)
+    for key in ('a', 'b', 'c'):
+        m.put(key, key.upper())
+    for key in ('a', 'a', 'b', 'c', 'c'):
+        m.get(key)
+    m.put('d', 'D')
+    print(m.get_size(), m.contains_key('b'), m.contains_key('d'), m.stats())
+
+    print("\nTinyLFU cache - a scan does not flush popular keys")
+    print("--------------------------------------------------")
+    for cls in (LRUCache, TinyLFUCache):
+        m = cls(100)
+        for i in range(3000):
+            key = 'hot' + str(i % 60)
+            if m.get(key) == None:
+                m.put(key, i)
+            m.put('scan' + str(2 * i), i)
+            m.put('scan' + str(2 * i + 1), i)
+        m.reset_stats()
+        for i in range(60):
+            m.get('hot' + str(i))
+        print(cls.__name__, m.get_size(), m.stats()['hit_ratio'])
+
+    print("\nLRU cache - byte budget")
+    print("-----------------------")
+    m = LRUCache(max_bytes=1000)
+    for i in range(20):
+        m.put('key' + str(i), 'x' * 100)
+    print(m.get_size(), m.get_weight(), m.stats()['evictions'])
+    m.put('huge', 'x' * 2000)
+    print(m.contains_key('huge'), m.get_size())
+
+    print("\nLFU cache - dump and load keep the eviction order")
+    print("--------------------------------------------------")
+    m = LFUCache(3)
+    for key in ('a', 'b', 'c'):
+        m.put(key, key.upper())
+    for key in ('a', 'a', 'c'):
+        m.get(key)
+    buffer = io.BytesIO()
+    m.dump(buffer)
+    buffer.seek(0)
+    m = LFUCache.load(buffer, 3)
+    m.put('d', 'D')
+    print(m.get_size(), m.contains_key('b'), m.contains_key('a'), m.stats())
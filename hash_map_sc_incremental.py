@@ -0,0 +1,335 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Separate chaining hash map that resizes incrementally, the
+#              way Redis's dict does. When the load policy asks for a new
+#              capacity a second table is allocated, and every later
+#              operation moves a few buckets from the old table into it,
+#              so no single put or remove ever rehashes the whole map.
+
+import hash_map_sc
+import snapshot
+from a6_include import (DynamicArray, LinkedList,
+                        hash_function_1, hash_function_2)
+
+# non-empty old buckets moved per operation while a rehash is running
+REHASH_STEP = 4
+
+# empty old buckets skipped per operation, as a multiple of REHASH_STEP
+EMPTY_VISITS = 10
+
+
+class HashMap(hash_map_sc.HashMap):
+    """
+    Separate chaining hash map with incremental (amortized) resizing.
+
+    While a rehash is running, _buckets is the new table and every insert
+    goes into it, _old_buckets is the table being drained and
+    _rehash_index is the next old bucket to move. A key lives in exactly
+    one of the two tables, so lookups and removals check the new table
+    first and then the old one. get_size() and table_load() count both
+    tables; get_capacity() reports the new one.
+
+    resize_table(), put_many(), empty_buckets() and get_keys_and_values()
+    finish a running rehash first, because they need a single table.
+    """
+
+    def clear(self) -> None:
+        """
+        Empties the hash map and drops any running rehash.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        super().clear()
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._old_mask = 0
+        self._rehash_index = 0
+
+    def is_rehashing(self) -> bool:
+        """Return True while buckets are still being moved to the new table."""
+        return self._old_buckets != None
+
+    def _check_load(self) -> None:
+        """
+        Moves a few buckets, and starts a rehash once the policy says grow.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        self._rehash_step()
+        policy = self._policy
+        if (self._old_buckets == None
+                and policy.should_grow(self._size, self._capacity)):
+            self._start_rehash(self._round_capacity(policy.grown(self._capacity)))
+
+    def _check_shrink(self) -> None:
+        """
+        Starts rehashing into a smaller table if the policy deems necessary.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        if self._old_buckets != None:
+            return
+        new_capacity = self._policy.shrunk(self._size, self._capacity)
+        if new_capacity < self._capacity:
+            new_capacity = self._round_capacity(new_capacity)
+            if new_capacity < self._capacity:
+                self._start_rehash(new_capacity)
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Makes the current table the old one and allocates an empty new one.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._old_mask = self._mask
+        self._rehash_index = 0
+        self._capacity = new_capacity
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._used_buckets = 0
+        self._mask = new_capacity - 1 if self._power_of_two else 0
+
+    def _rehash_step(self, buckets: int = REHASH_STEP) -> None:
+        """
+        Moves up to the given number of non-empty old buckets.
+
+        At most buckets * EMPTY_VISITS old buckets are looked at, so a
+        sparse old table cannot make one operation slow either.
+
+        :param self:    the hash map being passed
+        :param buckets: how many non-empty buckets to move
+
+        :return:        None
+        """
+        old_buckets = self._old_buckets
+        if old_buckets == None:
+            return
+        index = self._rehash_index
+        visits = buckets * EMPTY_VISITS
+        while buckets > 0 and visits > 0 and index < self._old_capacity:
+            chain = old_buckets[index]
+            if chain != None:
+                node = chain._head if type(chain) is LinkedList else chain.thread()
+                while node:
+                    # save the successor before the node is relinked
+                    following = node.next
+                    self._link(node)
+                    node = following
+                old_buckets[index] = None
+                buckets -= 1
+            index += 1
+            visits -= 1
+        self._rehash_index = index
+        if index >= self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_rehash(self) -> None:
+        """
+        Moves every remaining old bucket into the new table.
+
+        :param self: the hash map being passed
+
+        :return:     None
+        """
+        while self._old_buckets != None:
+            self._rehash_step(self._old_capacity)
+
+    def _old_bucket_of(self, hash: int) -> int:
+        """
+        Reduces a hash to a bucket index of the old table.
+
+        :param self: the hash map being passed
+        :param hash: the full hash of a key
+
+        :return:     index of the old bucket for the hash
+        """
+        if self._old_mask:
+            return hash & self._old_mask
+        return hash % self._old_capacity
+
+    def _find_hashed(self, key: str, hash: int):
+        """
+        Returns the node holding a key from either table.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+        :param hash: the full hash of the key
+
+        :return:     node with the key, or None if there is no match
+        """
+        node = self._find_node(self._bucket_of(hash), key, hash)
+        if node == None and self._old_buckets != None:
+            chain = self._old_buckets[self._old_bucket_of(hash)]
+            if chain != None:
+                node = chain.contains(key, hash)
+        return node
+
+    def _find_nodes(self, keys):
+        """
+        Yields the node holding each key from either table.
+
+        :param self: the hash map being passed
+        :param keys: iterable of keys to find
+
+        :return:     generator of nodes, None for every missing key
+        """
+        hash_function, find_hashed = self._hash_function, self._find_hashed
+        for key in keys:
+            yield find_hashed(key, hash_function(key))
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Removes a key whose hash is already known from either table.
+
+        :param self: the hash map being passed
+        :param key:  the key to remove
+        :param hash: the full hash of the key
+
+        :return:     True if the key was found and removed
+        """
+        if super()._remove_hashed(key, hash):
+            return True
+        if self._old_buckets == None:
+            return False
+        bucket = self._old_bucket_of(hash)
+        chain = self._old_buckets[bucket]
+        if chain != None and chain.remove(key, hash):
+            self._size -= 1
+            if chain.length() == 0:
+                self._old_buckets[bucket] = None
+            return True
+        return False
+
+    def get(self, key: str):
+        """
+        Returns the value being held by the passed key.
+
+        :param self: the hash map being passed
+        :param key:  the key to get
+
+        :return:     the value held by the key
+        """
+        self._rehash_step()
+        return super().get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Determines whether the hashmap holds the passed key.
+
+        :param self: the hash map being passed
+        :param key:  the key to find
+
+        :return:     boolean representing if key was found
+        """
+        self._rehash_step()
+        return super().contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the passed key from the hash map.
+
+        :param self: the hash map being passed
+        :param key:  the key to remove
+
+        :return:     None
+        """
+        self._rehash_step()
+        super().remove(key)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Finishes any running rehash, then rebuilds at the given capacity.
+
+        :param self:         the hash map being passed
+        :param new_capacity: the capacity of the new table
+
+        :return:             None
+        """
+        self._finish_rehash()
+        super()._rehash(new_capacity)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the amount of empty buckets.
+
+        :param self: the hash map being passed
+
+        :return:     amount of empty buckets
+        """
+        self._finish_rehash()
+        return super().empty_buckets()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns list of key and value pairs in the hash map.
+
+        :param self: the hash map being passed
+
+        :return:     list of key and value pairs
+        """
+        self._finish_rehash()
+        return super().get_keys_and_values()
+
+    def dump(self, fileobj, codec: snapshot.Codec = snapshot.PICKLE) -> None:
+        """
+        Writes a binary snapshot of the hash map to a file object.
+
+        :param self:    the hash map being passed
+        :param fileobj: binary file object to write to
+        :param codec:   codec that turns values into bytes
+
+        :return:        None
+        """
+        self._finish_rehash()
+        super().dump(fileobj, codec)
+
+    def items(self):
+        """
+        Generates every key/value pair in both tables.
+
+        :param self: the hash map being passed
+
+        :return:     generator of (key, value) tuples
+        """
+        yield from super().items()
+        old_buckets = self._old_buckets
+        if old_buckets != None:
+            for i in range(self._old_capacity):
+                chain = old_buckets[i]
+                if chain == None:
+                    continue
+                for node in chain:
+                    yield node.key, node.value
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nIncremental - put example 1")
+    print("---------------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.is_rehashing(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    print(m.empty_buckets(), m.is_rehashing())
+
+    print("\nIncremental - lookups during a rehash")
+    print("-------------------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(12):
+        m.put(str(i), i)
+    print(m.is_rehashing(), m.get('3'), m.contains_key('11'), m.get('12'))
+    m.remove('3')
+    print(m.get('3'), m.get_size())
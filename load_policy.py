@@ -0,0 +1,101 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Load factor policy shared by both HashMaps. A policy decides
+#              when a table grows, by how much, and whether it shrinks
+#              again once enough keys have been removed.
+
+
+class LoadPolicy:
+    """
+    When and how a hash map changes its capacity.
+
+    The map grows by growth_factor before an insert once its load has
+    reached grow_at. With shrink_at set, the map shrinks after a removal
+    leaves its load below shrink_at, but never below min_capacity.
+
+    A shrink picks the capacity that puts the load back at
+    grow_at / growth_factor, the same load the map has right after
+    growing. shrink_at must lie below that load, so the band between the
+    two thresholds keeps a map that is growing and shrinking around one
+    size from resizing on every operation.
+    """
+
+    __slots__ = ('grow_at', 'shrink_at', 'growth_factor', 'min_capacity')
+
+    def __init__(self, grow_at: float = 1.0, shrink_at: float = None,
+                 growth_factor: float = 2, min_capacity: int = 11) -> None:
+        """
+        Initialize a new policy. shrink_at of None never shrinks.
+        """
+        if grow_at <= 0:
+            raise ValueError("grow_at must be greater than 0")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if min_capacity < 1:
+            raise ValueError("min_capacity must be at least 1")
+        if shrink_at != None and not 0 < shrink_at < grow_at / growth_factor:
+            raise ValueError("shrink_at must lie between 0 and "
+                             "grow_at / growth_factor")
+        self.grow_at = grow_at
+        self.shrink_at = shrink_at
+        self.growth_factor = growth_factor
+        self.min_capacity = min_capacity
+
+    def __repr__(self) -> str:
+        """Return the policy as a constructor call."""
+        return (f"LoadPolicy(grow_at={self.grow_at}, shrink_at={self.shrink_at}, "
+                f"growth_factor={self.growth_factor}, "
+                f"min_capacity={self.min_capacity})")
+
+    def should_grow(self, size: int, capacity: int) -> bool:
+        """
+        Determines whether a table must grow before the next insert.
+
+        :param self:     the policy being passed
+        :param size:     the number of entries in the table
+        :param capacity: the capacity of the table
+
+        :return:         True once the load has reached grow_at
+        """
+        return size / capacity >= self.grow_at
+
+    def needs_growth(self, count: int, capacity: int) -> bool:
+        """
+        Determines whether inserting count entries one at a time into an
+        empty table of the given capacity would make it grow.
+
+        :param self:     the policy being passed
+        :param count:    the number of entries to insert
+        :param capacity: the capacity of the table
+
+        :return:         True if the last insert would find the table full
+        """
+        return count > 0 and (count - 1) / capacity >= self.grow_at
+
+    def grown(self, capacity: int) -> int:
+        """
+        Returns the capacity a table grows to, before any rounding.
+
+        :param self:     the policy being passed
+        :param capacity: the current capacity of the table
+
+        :return:         the larger capacity
+        """
+        return max(capacity + 1, int(capacity * self.growth_factor))
+
+    def shrunk(self, size: int, capacity: int) -> int:
+        """
+        Returns the capacity a table should shrink to, before any rounding.
+
+        :param self:     the policy being passed
+        :param size:     the number of entries in the table
+        :param capacity: the current capacity of the table
+
+        :return:         the smaller capacity, or capacity if the table
+                         should keep its size
+        """
+        if (self.shrink_at == None or capacity <= self.min_capacity
+                or size / capacity >= self.shrink_at):
+            return capacity
+        target = int(size * self.growth_factor / self.grow_at) + 1
+        return max(self.min_capacity, min(capacity, target))
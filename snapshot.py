@@ -0,0 +1,272 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Binary snapshot format shared by the dump and load methods of
+#              the HashMaps. A snapshot records the table capacity and, for
+#              every used bucket, the bucket index, the stored hash, the key
+#              and the value, so a map is loaded back into the exact same
+#              layout without hashing a single key.
+
+import json
+import pickle
+import struct
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# magic bytes, format version, flags, hash check, layout seed, capacity,
+# size, number of records, length of the map kind and of the codec name
+HEADER = struct.Struct('<8sHHQQQQQHH')
+MAGIC = b'A6SNAP\x00\x00'
+VERSION = 1
+
+# header flags
+POWER_OF_TWO = 1
+
+# bucket index, stored hash as an unsigned 64-bit integer, key length and
+# value length; the key and value bytes follow
+RECORD = struct.Struct('<QQII')
+
+# key length bit marking a negative hash, stored plus 2 ** 64
+NEGATIVE = 1 << 31
+
+# value length of a tombstone record, which has no key or value bytes
+TOMBSTONE_LENGTH = 0xFFFFFFFF
+
+# records are collected in a buffer and written out in chunks of this size
+CHUNK = 1 << 16
+
+# hashed by both dump and load, so a snapshot is never loaded with a hash
+# function that places keys differently
+CHECK_KEY = 'snapshot'
+
+
+class _Tombstone:
+    """Stands in for the value of a tombstone bucket in a record."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        """Return the name of the marker."""
+        return 'TOMBSTONE'
+
+
+TOMBSTONE = _Tombstone()
+
+
+class Codec:
+    """
+    A named pair of functions turning values into bytes and back.
+
+    The name is stored in the snapshot, and loading with a codec of
+    another name raises ValueError.
+    """
+
+    __slots__ = ('name', 'encode', 'decode')
+
+    def __init__(self, name: str, encode, decode) -> None:
+        """Initialize a codec from its name, encoder and decoder."""
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+    def __repr__(self) -> str:
+        """Return the codec as a constructor call."""
+        return f"Codec({self.name!r})"
+
+
+# any picklable value
+PICKLE = Codec('pickle',
+               lambda value: pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+               pickle.loads)
+
+# values JSON can represent; tuples come back as lists
+JSON = Codec('json', lambda value: json.dumps(value).encode(), json.loads)
+
+# str values only, stored as UTF-8
+STR = Codec('str', str.encode, bytes.decode)
+
+
+def _kind(cls) -> bytes:
+    """Return the name a map class is recorded under."""
+    return (cls.__module__ + '.' + cls.__qualname__).encode()
+
+
+def write(fileobj, hash_map, check: int, records, count: int,
+          codec: Codec = PICKLE, seed: int = 0) -> None:
+    """
+    Write a snapshot of a map to a binary file object.
+
+    records yields (bucket, hash, key, value) for every used bucket, in
+    the order load should restore them, with TOMBSTONE as the value of
+    a tombstone; count is how many it yields. Keys must be strings and
+    hashes must fit in a signed or unsigned 64-bit integer. Records are
+    encoded as they are generated, so only one chunk is held at a time.
+    """
+    kind = _kind(type(hash_map))
+    name = codec.name.encode()
+    flags = POWER_OF_TWO if hash_map._power_of_two else 0
+    fileobj.write(HEADER.pack(MAGIC, VERSION, flags, check & MASK_64,
+                              seed, hash_map._capacity, hash_map._size,
+                              count, len(kind), len(name)) + kind + name)
+    pack, encode_key, encode = RECORD.pack, str.encode, codec.encode
+    buffer = bytearray()
+    written = 0
+    for bucket, hash, key, value in records:
+        if not -0x8000000000000000 <= hash <= MASK_64:
+            raise ValueError("hash of " + repr(key) + " does not fit in 64 bits")
+        sign = NEGATIVE if hash < 0 else 0
+        if value is TOMBSTONE:
+            buffer += pack(bucket, hash & MASK_64, sign, TOMBSTONE_LENGTH)
+        else:
+            data = encode_key(key)
+            payload = encode(value)
+            buffer += pack(bucket, hash & MASK_64, len(data) | sign, len(payload))
+            buffer += data
+            buffer += payload
+        written += 1
+        if len(buffer) >= CHUNK:
+            fileobj.write(buffer)
+            buffer.clear()
+    fileobj.write(buffer)
+    if written != count:
+        raise RuntimeError("hash map changed while it was being dumped")
+
+
+def _read_exactly(fileobj, size: int) -> bytes:
+    """Read size bytes from a file object, raising ValueError if it ends."""
+    data = fileobj.read(size)
+    if len(data) != size:
+        raise ValueError("snapshot ends early")
+    return data
+
+
+def read_header(fileobj, cls, codec: Codec = PICKLE) -> tuple:
+    """
+    Read and check the header of a snapshot written by write.
+
+    :return: (power_of_two, check, seed, capacity, size, count); raises
+             ValueError if the snapshot is not one of a cls map written
+             with the given codec
+    """
+    (magic, version, flags, check, seed, capacity, size, count,
+     kind_length, name_length) = HEADER.unpack(_read_exactly(fileobj, HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a version " + str(VERSION) + " hash map snapshot")
+    kind = _read_exactly(fileobj, kind_length)
+    name = _read_exactly(fileobj, name_length)
+    if kind != _kind(cls):
+        raise ValueError("snapshot of a " + kind.decode() + ", not of a "
+                         + _kind(cls).decode())
+    if name != codec.name.encode():
+        raise ValueError("snapshot values use the " + name.decode() + " codec")
+    return bool(flags & POWER_OF_TWO), check, seed, capacity, size, count
+
+
+def read_records(fileobj, count: int, codec: Codec = PICKLE):
+    """
+    Generate the (bucket, hash, key, value) of count records, in the order
+    they were written, with TOMBSTONE as the value of a tombstone.
+    """
+    unpack, size, decode = RECORD.unpack, RECORD.size, codec.decode
+    read = fileobj.read
+    for _ in range(count):
+        record = read(size)
+        if len(record) != size:
+            raise ValueError("snapshot ends early")
+        bucket, hash, key_length, value_length = unpack(record)
+        if key_length & NEGATIVE:
+            hash -= 1 << 64
+            key_length ^= NEGATIVE
+        if value_length == TOMBSTONE_LENGTH:
+            yield bucket, hash, None, TOMBSTONE
+            continue
+        data = read(key_length + value_length)
+        if len(data) != key_length + value_length:
+            raise ValueError("snapshot ends early")
+        yield bucket, hash, data[:key_length].decode(), decode(data[key_length:])
+
+
+def check_hash(check: int, expected: int) -> None:
+    """Raise ValueError unless a snapshot's hash check matches the map's."""
+    if check != expected & MASK_64:
+        raise ValueError("snapshot was dumped with another hash function")
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import io
+
+    import hash_map_oa
+    import hash_map_sc
+    from a6_include import hash_function_1, hash_function_2
+
+    print("\nSnapshot - dump and load a separate chaining map")
+    print("------------------------------------------------")
+    m = hash_map_sc.HashMap(11, hash_function_1)
+    for i in range(20):
+        m.put('str' + str(i), i * 100)
+    buffer = io.BytesIO()
+    m.dump(buffer)
+    loaded = hash_map_sc.HashMap.load(io.BytesIO(buffer.getvalue()), hash_function_1)
+    print(len(buffer.getvalue()), loaded.get_size(), loaded.get_capacity(),
+          str(loaded) == str(m))
+
+    print("\nSnapshot - open addressing map with tombstones and the str codec")
+    print("----------------------------------------------------------------")
+    m = hash_map_oa.HashMap(23, hash_function_2)
+    for i in range(10):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    buffer = io.BytesIO()
+    m.dump(buffer, STR)
+    loaded = hash_map_oa.HashMap.load(io.BytesIO(buffer.getvalue()), hash_function_2, STR)
+    print(loaded.get_size(), round(loaded.tombstone_load(), 2), loaded.get('5'))
+    try:
+        hash_map_oa.HashMap.load(io.BytesIO(buffer.getvalue()), hash_function_1, STR)
+    except ValueError as error:
+        print(error)
+
+    print("\nSnapshot - dump and load in processes with different hash seeds")
+    print("----------------------------------------------------------------")
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    # each engine is dumped by one process and loaded by another, with the
+    # built-in hash randomized differently in each
+    child = """
+import sys
+import importlib
+from a6_include import hash_function_2
+module, path, mode = sys.argv[1:]
+cls = importlib.import_module(module).HashMap
+keys = ['key' + str(i) for i in range(2000)]
+if mode == 'dump':
+    m = cls(11, hash_function_2)
+    for key in keys:
+        m.put(key, key)
+    with open(path, 'wb') as file:
+        m.dump(file)
+else:
+    with open(path, 'rb') as file:
+        m = cls.load(file, hash_function_2)
+    print(sum(m.get(key) == key for key in keys))
+"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(tempfile.mkdtemp(), 'snapshot')
+    for module in ('hash_map_sc', 'hash_map_oa', 'hash_map_oa_flat',
+                   'hash_map_oa_robin_hood', 'hash_map_oa_swiss',
+                   'hash_map_cuckoo'):
+        found = []
+        for seed, mode in (('1', 'dump'), ('2', 'load')):
+            result = subprocess.run([sys.executable, '-c', child, module, path, mode],
+                                    cwd=directory, capture_output=True, text=True,
+                                    env=dict(os.environ, PYTHONHASHSEED=seed),
+                                    check=True)
+            found.append(result.stdout.strip())
+        print(module, found[1], 'of 2000 keys found')
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
@@ -0,0 +1,612 @@
+# Course:      CS261 - Data Structures
+# Assignment:  6
+# Description: Durability layer for the separate chaining HashMap. Every
+#              put and remove is appended to a write-ahead log that is
+#              synced to disk in batches (group commit), the log is replayed
+#              on startup, and it is compacted in the background into a
+#              snapshot written with HashMap.dump.
+
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import traceback
+import zlib
+
+import hash_map_sc
+import snapshot
+from a6_include import hash_function_1
+from load_policy import LoadPolicy
+
+# operations a record can hold
+PUT = 1
+REMOVE = 2
+CLEAR = 3
+
+# CRC-32 of the rest of the record, which is the operation, the key length
+# and the value length followed by the UTF-8 key and the encoded value
+CHECKSUM = struct.Struct('<I')
+RECORD = struct.Struct('<BII')
+
+# file names are a prefix followed by the sequence number of the segment
+LOG_PREFIX = 'log.'
+SNAPSHOT_PREFIX = 'snapshot.'
+
+
+def _sync_directory(directory: str) -> None:
+    """Sync a directory so that files renamed into it survive a crash."""
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class WriteAheadLog:
+    """
+    Append-only log of map changes, split into numbered segment files.
+
+    Records are collected in a buffer. The buffer is written out and
+    fsynced as one batch once sync_every records are pending, and, with
+    sync_interval set, by a background thread every sync_interval
+    seconds. A crash loses at most the records still in the buffer.
+    With sync_every left at 1 every record is synced before append
+    returns.
+    """
+
+    def __init__(self, directory: str, sequence: int,
+                 codec: snapshot.Codec = snapshot.PICKLE,
+                 sync_every: int = 1, sync_interval: float = None) -> None:
+        """
+        Initialize a log that starts a new segment with the given sequence
+        number. sync_every of None only syncs on the timer, sync() and
+        close().
+        """
+        if sync_every != None and sync_every < 1:
+            raise ValueError("sync_every must be at least 1")
+        if sync_interval != None and sync_interval <= 0:
+            raise ValueError("sync_interval must be greater than 0")
+        self._directory = directory
+        self._codec = codec
+        self._sync_every = sync_every
+        self._buffer = bytearray()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._open_segment(sequence)
+        self._stop = threading.Event()
+        self._thread = None
+        if sync_interval != None:
+            self._thread = threading.Thread(target=self._sync_periodically,
+                                             args=(sync_interval,), daemon=True)
+            self._thread.start()
+
+    def _open_segment(self, sequence: int) -> None:
+        """
+        Creates the segment file for a sequence number and appends to it.
+
+        :param self:     the log being passed
+        :param sequence: the sequence number of the segment
+
+        :return:         None
+        """
+        path = os.path.join(self._directory, LOG_PREFIX + str(sequence))
+        # unbuffered, since records are already collected in _buffer
+        self._file = open(path, 'ab', buffering=0)
+        _sync_directory(self._directory)
+        self._sequence = sequence
+        self._size = 0
+
+    def encode(self, operation: int, key: str = '', value: object = None) -> bytes:
+        """
+        Encodes a change as a record, without appending it.
+
+        :param self:      the log being passed
+        :param operation: PUT, REMOVE or CLEAR
+        :param key:       the key that changed
+        :param value:     the new value of a PUT
+
+        :return:          the record
+        """
+        data = key.encode()
+        payload = self._codec.encode(value) if operation == PUT else b''
+        body = RECORD.pack(operation, len(data), len(payload))
+        checksum = zlib.crc32(payload, zlib.crc32(data, zlib.crc32(body)))
+        return CHECKSUM.pack(checksum) + body + data + payload
+
+    def append(self, record: bytes) -> None:
+        """
+        Appends an encoded record, syncing the batch once it is full.
+
+        :param self:   the log being passed
+        :param record: a record returned by encode
+
+        :return:       None
+        """
+        with self._lock:
+            self._buffer += record
+            self._size += len(record)
+            self._pending += 1
+            if self._sync_every != None and self._pending >= self._sync_every:
+                self._flush()
+
+    def _flush(self) -> None:
+        """
+        Writes out and fsyncs the buffer; the lock must be held.
+
+        :param self: the log being passed
+
+        :return:     None
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def sync(self) -> None:
+        """
+        Writes out and fsyncs every pending record.
+
+        :param self: the log being passed
+
+        :return:     None
+        """
+        with self._lock:
+            self._flush()
+
+    def _sync_periodically(self, interval: float) -> None:
+        """
+        Syncs every interval seconds until the log is closed.
+
+        :param self:     the log being passed
+        :param interval: seconds between syncs
+
+        :return:         None
+        """
+        while not self._stop.wait(interval):
+            self.sync()
+
+    def rotate(self) -> int:
+        """
+        Syncs the current segment and starts the next one.
+
+        :param self: the log being passed
+
+        :return:     the sequence number of the new segment
+        """
+        with self._lock:
+            self._flush()
+            self._file.close()
+            self._open_segment(self._sequence + 1)
+            return self._sequence
+
+    def segment_size(self) -> int:
+        """
+        Returns the bytes appended to the current segment so far.
+
+        :param self: the log being passed
+
+        :return:     size of the segment, including pending records
+        """
+        return self._size
+
+    def close(self) -> None:
+        """
+        Stops the sync thread, syncs every pending record and closes the
+        file, deleting it if nothing was appended.
+
+        :param self: the log being passed
+
+        :return:     None
+        """
+        if self._thread != None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if not self._file.closed:
+                self._flush()
+                self._file.close()
+                # an unused segment would only be replayed as empty
+                if self._size == 0:
+                    os.remove(self._file.name)
+
+
+def read_segment(path: str, codec: snapshot.Codec = snapshot.PICKLE,
+                 repair: bool = False):
+    """
+    Generate the (operation, key, value) of every record in a segment.
+
+    A record that is cut short or fails its checksum ends the segment.
+    With repair the file is truncated to the records before it, which
+    is what a crash while writing the last segment leaves behind;
+    otherwise ValueError is raised.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    offset = 0
+    header = CHECKSUM.size + RECORD.size
+    while offset < len(data):
+        end = offset + header
+        if end <= len(data):
+            checksum, = CHECKSUM.unpack_from(data, offset)
+            operation, key_length, value_length = RECORD.unpack_from(
+                data, offset + CHECKSUM.size)
+            end += key_length + value_length
+        if end > len(data) or zlib.crc32(
+                data[offset + CHECKSUM.size:end]) != checksum:
+            if not repair:
+                raise ValueError(path + " is damaged at byte " + str(offset))
+            os.truncate(path, offset)
+            return
+        start = offset + header
+        key = data[start:start + key_length].decode()
+        value = (codec.decode(data[start + key_length:end])
+                 if operation == PUT else None)
+        yield operation, key, value
+        offset = end
+
+
+class DurableHashMap:
+    """
+    Separate chaining HashMap whose changes survive a crash.
+
+    The map lives in memory, and every change is also appended to a
+    WriteAheadLog in directory once the map has accepted it. On startup
+    the newest snapshot in directory is loaded and every log segment
+    written after it is replayed. A record cut short by a crash ends the
+    replay of the last segment.
+
+    compact() starts a new log segment and writes a snapshot of the map
+    as it is at that moment. Where os.fork is available a child process
+    writes it from its copy-on-write view of the map, so the parent goes
+    on serving operations. Once the snapshot is complete, the segments
+    and snapshots it replaces are deleted. compact() runs by itself
+    whenever the current segment grows past compact_at bytes.
+
+    Keys must be strings and values must suit the codec. Changing a
+    value in place, as opposed to putting it again, is not logged.
+    """
+
+    def __init__(self, directory: str, function: callable = hash_function_1,
+                 capacity: int = 11, power_of_two: bool = False,
+                 policy: LoadPolicy = None,
+                 codec: snapshot.Codec = snapshot.PICKLE,
+                 sync_every: int = 1, sync_interval: float = None,
+                 compact_at: int = 64 << 20) -> None:
+        """
+        Initialize a durable map from the files in directory, which is
+        created if needed. capacity and power_of_two only apply when
+        there is no snapshot yet; see WriteAheadLog for sync_every and
+        sync_interval. compact_at of None never compacts on its own.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._codec = codec
+        self._compact_at = compact_at
+        self._child = None
+        snapshots = self._sequences(SNAPSHOT_PREFIX)
+        segments = self._sequences(LOG_PREFIX)
+        start = snapshots[-1] if snapshots else 0
+        if snapshots:
+            with open(self._path(SNAPSHOT_PREFIX, start), 'rb') as file:
+                self._map = hash_map_sc.HashMap.load(file, function, codec, policy)
+        else:
+            self._map = hash_map_sc.HashMap(capacity, function, power_of_two, policy)
+        # a snapshot holds every change logged before its sequence number
+        later = [sequence for sequence in segments if sequence >= start]
+        for sequence in later:
+            self._replay(self._path(LOG_PREFIX, sequence), sequence == later[-1])
+        self._remove_before(start)
+        self._log = WriteAheadLog(directory, max(segments + snapshots + [0]) + 1,
+                                  codec, sync_every, sync_interval)
+
+    def __enter__(self) -> "DurableHashMap":
+        """Return the map for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the map at the end of a with statement."""
+        self.close()
+
+    # ------------------------------------------------------------------ #
+
+    def _path(self, prefix: str, sequence: int) -> str:
+        """
+        Returns the path of the log segment or snapshot of a sequence number.
+
+        :param self:     the map being passed
+        :param prefix:   LOG_PREFIX or SNAPSHOT_PREFIX
+        :param sequence: the sequence number
+
+        :return:         path of the file in the map's directory
+        """
+        return os.path.join(self._directory, prefix + str(sequence))
+
+    def _sequences(self, prefix: str) -> list:
+        """
+        Returns the sequence numbers of the files with a prefix, in order.
+
+        :param self:   the map being passed
+        :param prefix: LOG_PREFIX or SNAPSHOT_PREFIX
+
+        :return:       sorted list of sequence numbers
+        """
+        sequences = []
+        for name in os.listdir(self._directory):
+            suffix = name[len(prefix):]
+            if name.startswith(prefix) and suffix.isdigit():
+                sequences.append(int(suffix))
+        return sorted(sequences)
+
+    def _replay(self, path: str, last: bool) -> None:
+        """
+        Applies every record of a log segment to the map.
+
+        :param self: the map being passed
+        :param path: the path of the segment
+        :param last: whether this is the newest segment, the only one a
+                     crash can have left cut short
+
+        :return:     None
+        """
+        hash_map = self._map
+        for operation, key, value in read_segment(path, self._codec, last):
+            if operation == PUT:
+                hash_map.put(key, value)
+            elif operation == REMOVE:
+                hash_map.remove(key)
+            else:
+                hash_map.clear()
+
+    def _remove_before(self, sequence: int) -> None:
+        """
+        Deletes the segments, snapshots and unfinished snapshots that the
+        snapshot with the given sequence number replaces.
+
+        :param self:     the map being passed
+        :param sequence: the sequence number of the newest snapshot
+
+        :return:         None
+        """
+        for name in os.listdir(self._directory):
+            if name.endswith('.tmp'):
+                if self._child == None:
+                    os.remove(os.path.join(self._directory, name))
+                continue
+            for prefix in (LOG_PREFIX, SNAPSHOT_PREFIX):
+                suffix = name[len(prefix):]
+                if (name.startswith(prefix) and suffix.isdigit()
+                        and int(suffix) < sequence):
+                    os.remove(os.path.join(self._directory, name))
+
+    def _write_snapshot(self, sequence: int) -> None:
+        """
+        Dumps the map into the snapshot of a sequence number.
+
+        The snapshot is written under a temporary name and renamed once it
+        is synced, so a snapshot file is always complete.
+
+        :param self:     the map being passed
+        :param sequence: the sequence number of the snapshot
+
+        :return:         None
+        """
+        path = self._path(SNAPSHOT_PREFIX, sequence)
+        with open(path + '.tmp', 'wb') as file:
+            self._map.dump(file, self._codec)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + '.tmp', path)
+        _sync_directory(self._directory)
+
+    def compact(self) -> None:
+        """
+        Replaces the log so far with a snapshot written in the background.
+
+        Nothing happens while an earlier snapshot is still being written.
+
+        :param self: the map being passed
+
+        :return:     None
+        """
+        self._reap()
+        if self._child != None:
+            return
+        sequence = self._log.rotate()
+        if not hasattr(os, 'fork'):
+            self._write_snapshot(sequence)
+            self._remove_before(sequence)
+            return
+        pid = os.fork()
+        if pid == 0:
+            # the child owns a frozen copy of the map and only writes it out
+            status = 1
+            try:
+                self._write_snapshot(sequence)
+                status = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        self._child = (pid, sequence)
+
+    def _reap(self, wait: bool = False) -> None:
+        """
+        Collects a finished snapshot process and deletes the files its
+        snapshot replaces.
+
+        :param self: the map being passed
+        :param wait: whether to wait for a running process to finish
+
+        :return:     None
+        """
+        if self._child == None:
+            return
+        pid, sequence = self._child
+        finished, status = os.waitpid(pid, 0 if wait else os.WNOHANG)
+        if finished == 0:
+            return
+        self._child = None
+        # a failed snapshot leaves the log in place, so nothing is lost
+        if os.waitstatus_to_exitcode(status) == 0:
+            self._remove_before(sequence)
+
+    def _logged(self, record: bytes) -> None:
+        """
+        Appends a record for a change the map has accepted.
+
+        :param self:   the map being passed
+        :param record: the encoded change
+
+        :return:       None
+        """
+        self._log.append(record)
+        if (self._compact_at != None
+                and self._log.segment_size() >= self._compact_at):
+            self.compact()
+
+    def sync(self) -> None:
+        """
+        Makes every change so far durable.
+
+        :param self: the map being passed
+
+        :return:     None
+        """
+        self._log.sync()
+
+    def close(self) -> None:
+        """
+        Syncs the log, waits for a running snapshot and closes the log.
+
+        :param self: the map being passed
+
+        :return:     None
+        """
+        self._log.close()
+        self._reap(wait=True)
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """Adds or updates a key and logs the change."""
+        record = self._log.encode(PUT, key, value)
+        self._map.put(key, value)
+        self._logged(record)
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """Adds an amount to the value of a key and logs the new value."""
+        value = self._map.increment(key, amount)
+        self._logged(self._log.encode(PUT, key, value))
+        return value
+
+    def remove(self, key: str) -> None:
+        """Removes a key and logs the change."""
+        record = self._log.encode(REMOVE, key)
+        self._map.remove(key)
+        self._logged(record)
+
+    def clear(self) -> None:
+        """Empties the map and logs the change."""
+        self._map.clear()
+        self._logged(self._log.encode(CLEAR))
+
+    def put_many(self, pairs) -> None:
+        """Adds every key/value pair from an iterable and logs each one."""
+        pairs = list(pairs)
+        encode = self._log.encode
+        records = [encode(PUT, key, value) for key, value in pairs]
+        self._map.put_many(pairs)
+        for record in records:
+            self._logged(record)
+
+    def remove_many(self, keys) -> None:
+        """Removes every key from an iterable and logs each one."""
+        keys = list(keys)
+        encode = self._log.encode
+        records = [encode(REMOVE, key) for key in keys]
+        self._map.remove_many(keys)
+        for record in records:
+            self._logged(record)
+
+    def get(self, key: str):
+        """Return the value held by a key, or None."""
+        return self._map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """Return whether the map holds a key."""
+        return self._map.contains_key(key)
+
+    def get_many(self, keys) -> list:
+        """Return the values held by every key from an iterable."""
+        return self._map.get_many(keys)
+
+    def contains_many(self, keys) -> list:
+        """Return whether the map holds each key from an iterable."""
+        return self._map.contains_many(keys)
+
+    def get_size(self) -> int:
+        """Return the number of keys in the map."""
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """Return the capacity of the map."""
+        return self._map.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """Return the number of empty buckets in the map."""
+        return self._map.empty_buckets()
+
+    def table_load(self) -> float:
+        """Return the load factor of the map."""
+        return self._map.table_load()
+
+    def get_keys_and_values(self):
+        """Return a DynamicArray of every key/value pair in the map."""
+        return self._map.get_keys_and_values()
+
+    def items(self):
+        """Generate every key/value pair in the map."""
+        return self._map.items()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    directory = tempfile.mkdtemp()
+
+    print("\nWrite-ahead log - replay after close")
+    print("------------------------------------")
+    with DurableHashMap(directory, sync_every=100) as m:
+        for i in range(150):
+            m.put('str' + str(i), i * 100)
+        for i in range(0, 150, 2):
+            m.remove('str' + str(i))
+    with DurableHashMap(directory) as m:
+        print(m.get_size(), m.get('str1'), m.get('str2'), m.contains_key('str3'))
+
+    print("\nWrite-ahead log - torn last record")
+    print("----------------------------------")
+    m = DurableHashMap(directory)
+    m.put('last', 'kept')
+    m.put('torn', 'lost')
+    m.close()
+    segment = m._path(LOG_PREFIX, m._log._sequence)
+    os.truncate(segment, os.path.getsize(segment) - 3)
+    with DurableHashMap(directory) as m:
+        print(m.get_size(), m.get('last'), m.get('torn'))
+
+    print("\nWrite-ahead log - background compaction")
+    print("---------------------------------------")
+    with DurableHashMap(directory, compact_at=None) as m:
+        m.put_many(('key' + str(i), i) for i in range(1000))
+        m.compact()
+        m.put('after', 'compaction')
+    with DurableHashMap(directory) as m:
+        print(m.get_size(), m.get('key999'), m.get('after'))
+    print(sorted(name.split('.')[0] for name in os.listdir(directory)))
+
+    shutil.rmtree(directory)